@@ -0,0 +1,133 @@
+"""Synthetic Earth Engine scripts shared by the translator benchmarks.
+
+The scripts are built from templates of top-level units (nested functions, map
+callbacks, chained methods starting with ".", strings split with "+", loops, string
+methods, dictionaries and conditionals) filled in at random from a fixed seed, so a
+given size and seed always give the same script. The templates only use constructs
+that the translator turns into valid Python.
+"""
+
+import random
+
+COLLECTIONS = [
+    "COPERNICUS/S2_SR",
+    "LANDSAT/LC08/C02/T1_L2",
+    "MODIS/006/MOD13Q1",
+    "COPERNICUS/S1_GRD",
+]
+BANDS = ["B2", "B3", "B4", "B8", "B11", "QA60", "SR_B4", "SR_B5", "NDVI", "VV"]
+NAMES = ["image", "img", "scene", "tile", "composite"]
+
+# Templates of top-level units. {i} makes the names of each unit unique and the
+# other fields are filled in at random.
+TEMPLATES = [
+    # nested functions
+    """
+var scale{i} = function({name}) {{
+  var addOffset = function(value) {{
+    return value.multiply({factor}).add({offset});
+  }};
+  var bands = {name}.select('{band}');
+  return {name}.addBands(addOffset(bands), null, true);
+}};
+""",
+    # chained methods continued on the next line
+    """
+// Cloud mask {i}
+var maskClouds{i} = function({name}) {{
+  var qa = {name}.select('QA60');
+  var mask = qa.bitwiseAnd(1 << 10).eq(0)
+      .and(qa.bitwiseAnd(1 << {bit}).eq(0));
+  return {name}.updateMask(mask).divide({factor});
+}};
+""",
+    # map callbacks over a collection
+    """
+var collection{i} = ee.ImageCollection('{collection}')
+    .filterDate('20{year}-01-01', '20{year}-12-31')
+    .map(function({name}) {{
+      var mask = {name}.select('{band}').bitwiseAnd(1 << {bit}).eq(0);
+      return {name}.updateMask(mask).divide({factor});
+    }});
+""",
+    # map callbacks over a list
+    """
+var values{i} = ee.List.sequence(1, {count}).map(function(n) {{
+  return ee.Number(n).multiply({factor}).add({offset});
+}});
+""",
+    # for loops
+    """
+var total{i} = 0;
+for (var k{i} = 0; k{i} < {count}; k{i}++) {{
+  if (k{i} % 2 == 0) {{
+    total{i} = total{i} + k{i};
+  }} else {{
+    total{i} = total{i} - 1;
+  }}
+}}
+""",
+    # while loops
+    """
+var counter{i} = {count};
+while (counter{i} > 0) {{
+  counter{i}--;
+}}
+""",
+    # string methods
+    """
+var name{i} = '  {collection}  ';
+var label{i} = name{i}.trim();
+var parts{i} = label{i}.split('/');
+var position{i} = label{i}.indexOf('{band}');
+var title{i} = 'Band ' +
+    parts{i}[0];
+var upper{i} = title{i}.toUpperCase();
+""",
+    # dictionaries and conditionals
+    """
+var params{i} = {{bands: ['{band}', 'B3', 'B2'], min: 0, max: {offset}, gamma: 1.4}};
+if (params{i}.max > 0.5) {{
+  print(params{i}.bands.length);
+}}
+var high{i} = 'red';
+var palette{i} = (params{i}.max > 1) ? high{i} : 'green';
+""",
+    # exported functions
+    """
+// Computes an index of a {name}
+exports.index{i} = function({name}, first, second) {{
+  return {name}.normalizedDifference([first, second]).rename('index{i}');
+}};
+""",
+]
+
+
+def synthetic_script(lines: int, seed: int = 0) -> str:
+    """A synthetic Earth Engine script of (at least) the given number of lines.
+
+    Args:
+        lines (int): Minimum number of lines of the script.
+        seed (int): Seed of the random choices. The same seed gives the same script.
+
+    Returns:
+        str: JavaScript code.
+    """
+    rng = random.Random(seed)
+    units = []
+    total = 0
+    while total < lines:
+        unit = rng.choice(TEMPLATES).format(
+            i=len(units),
+            name=rng.choice(NAMES),
+            band=rng.choice(BANDS),
+            collection=rng.choice(COLLECTIONS),
+            year=rng.randint(13, 23),
+            bit=rng.randint(1, 11),
+            count=rng.randint(2, 50),
+            factor=rng.choice(["0.0001", "0.0000275", "10000", "0.5"]),
+            offset=rng.choice([-0.2, 0, 0.3, 1]),
+        )
+        units.append(unit)
+        total += unit.count("\n")
+    return "".join(units)
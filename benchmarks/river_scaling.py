@@ -0,0 +1,57 @@
+"""Scaling efficiency of the tiled local river-width engine.
+
+Runs ee_extra.Algorithms.riverLocal.riverWidths on a synthetic meandering river with
+1 to N worker processes and reports the wall time, speedup and parallel efficiency
+(speedup / processes) of each run.
+
+Usage:
+    python -m benchmarks.river_scaling [--size 4000] [--tile 1024] [--halo 128] [--max-processes N]
+"""
+
+import argparse
+import os
+import time
+
+import numpy as np
+
+from ee_extra.Algorithms.riverLocal import riverWidths
+
+
+def synthetic_mask(size: int) -> np.ndarray:
+    """A meandering river of varying width crossing a size x size mask."""
+    rows, cols = np.mgrid[:size, :size]
+    center = size / 2 + size / 7 * np.sin(cols / (size / 10))
+    halfWidth = 20 + 10 * np.sin(cols / 50)
+    return (np.abs(rows - center) < halfWidth).astype(np.uint8)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--size", type=int, default=4000)
+    parser.add_argument("--tile", type=int, default=1024)
+    parser.add_argument("--halo", type=int, default=128)
+    parser.add_argument("--max-processes", type=int, default=os.cpu_count())
+    args = parser.parse_args()
+
+    mask = synthetic_mask(args.size)
+    processes = sorted(
+        {
+            1,
+            *[2**i for i in range(1, 8) if 2**i < args.max_processes],
+            args.max_processes,
+        }
+    )
+
+    print(f"{'processes':>9} {'seconds':>9} {'speedup':>9} {'efficiency':>10}")
+    baseline = None
+    for n in processes:
+        start = time.perf_counter()
+        riverWidths(mask, tileSize=args.tile, halo=args.halo, processes=n)
+        seconds = time.perf_counter() - start
+        baseline = baseline or seconds
+        speedup = baseline / seconds
+        print(f"{n:>9} {seconds:>9.2f} {speedup:>9.2f} {speedup / n:>10.0%}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,254 @@
+"""Throughput and memory regression suite of the JavaScript translator.
+
+Generates synthetic Earth Engine scripts (see benchmarks/corpus.py) of 100 to 100k
+lines, translates each one and reports the lines translated per second and the peak
+memory of the translation. The corpus is generated from a fixed seed, so every run
+translates the same scripts and no network or Earth Engine account is needed.
+
+Two checks flag a regression, and the command then exits with 1:
+
+- Scaling: each size is compared with the smallest one. A size whose throughput
+  drops, or whose peak memory per line grows, by more than the tolerance scales
+  superlinearly with the length of the script.
+- Baselines: each size is compared with the results stored in
+  translate_baselines.json. A size whose throughput drops, or whose peak memory
+  grows, by more than the tolerance is slower than it used to be, even when every
+  size got slower by the same amount. To compare runs on different machines, the
+  throughput is divided by the speed of a fixed calibration loop that does not use
+  the translator. Baselines are stored by architecture and Python version, since
+  the relative speed of the translator changes between Python versions; a platform
+  without baselines only checks the scaling. Record them with --update.
+
+Usage:
+    python -m benchmarks.translate_regression [--lines 100 1000 10000 100000]
+        [--repeat 3] [--tolerance 0.25] [--baselines FILE] [--update]
+"""
+
+import argparse
+import json
+import os
+import platform
+import re
+import sys
+import time
+import tracemalloc
+from typing import Dict, List, Optional
+
+from benchmarks.corpus import synthetic_script
+from ee_extra import translate
+
+BASELINES = os.path.join(os.path.dirname(__file__), "translate_baselines.json")
+
+
+def machine() -> str:
+    """Key of the baselines of this platform: architecture and Python version."""
+    python = ".".join(platform.python_version_tuple()[:2])
+    return f"{platform.machine()}-py{python}"
+
+
+def calibrate(repeat: int = 5) -> float:
+    """Speed of this machine: runs per second (best of repeat) of a fixed loop.
+
+    The loop does the kind of work the translator does, string methods and regex
+    substitutions over a script, without calling the translator, so it gets faster
+    or slower with the machine but not with changes of the translator.
+    """
+    source = synthetic_script(1000, seed=0)
+    seconds = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        lines = [line.strip().replace("var ", "") for line in source.splitlines()]
+        text = re.sub(r"\b(\w+)\s*=\s*function\b", r"def \1", "\n".join(lines))
+        re.findall(r"[\w.]+\(", text)
+        seconds = min(seconds, time.perf_counter() - start)
+    return 1 / seconds
+
+
+def measure(
+    source: str, repeat: int = 3, speed: Optional[float] = None
+) -> Dict[str, float]:
+    """Throughput (best of repeat runs) and peak memory of the translation.
+
+    Args:
+        source (str): JavaScript script.
+        repeat (int): Number of timed translations.
+        speed (float): Result of calibrate(). Defaults to a new calibration.
+
+    Returns:
+        dict: Lines, seconds, lines per second, lines per calibration run (the
+        throughput on a machine that runs the calibration loop once per second)
+        and peak memory in MB.
+    """
+    speed = speed or calibrate()
+    lines = source.count("\n") + 1
+    seconds = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        translate(source)
+        seconds = min(seconds, time.perf_counter() - start)
+
+    # tracemalloc slows the translation down, so memory is measured in its own run
+    tracemalloc.start()
+    try:
+        translate(source)
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "lines": lines,
+        "seconds": seconds,
+        "lines_per_second": lines / seconds,
+        "lines_per_calibration": lines / seconds / speed,
+        "peak_mb": peak / 2**20,
+    }
+
+
+def scaling(results: Dict[str, Dict], reference: str) -> Dict[str, Dict[str, float]]:
+    """Throughput and memory per line of each size relative to a reference size.
+
+    Args:
+        results (dict): Measurements by size.
+        reference (str): Size the others are compared with.
+
+    Returns:
+        dict: Ratios by size. A throughput below 1, or a memory above 1, means that
+        the size is translated slower, or with more memory per line, than the
+        reference.
+    """
+    base = results[reference]
+    ratios = {}
+    for size, result in results.items():
+        ratios[size] = {
+            "throughput": result["lines_per_second"] / base["lines_per_second"],
+            "memory": (result["peak_mb"] / result["lines"])
+            / (base["peak_mb"] / base["lines"]),
+        }
+    return ratios
+
+
+def compare(
+    results: Dict[str, Dict], reference: str, tolerance: float = 0.25
+) -> List[str]:
+    """Sizes whose translation scales superlinearly with respect to the reference.
+
+    Args:
+        results (dict): Measurements by size.
+        reference (str): Size the others are compared with.
+        tolerance (float): Allowed relative drop of throughput and growth of memory
+            per line.
+
+    Returns:
+        list: One message per regression.
+    """
+    regressions = []
+    for size, ratio in scaling(results, reference).items():
+        if ratio["throughput"] < 1 - tolerance:
+            regressions.append(
+                f"{size} lines: throughput is {1 - ratio['throughput']:.0%} below "
+                f"the one of {reference} lines"
+            )
+        if ratio["memory"] > 1 + tolerance:
+            regressions.append(
+                f"{size} lines: peak memory per line is {ratio['memory'] - 1:.0%} "
+                f"above the one of {reference} lines"
+            )
+    return regressions
+
+
+def compare_baselines(
+    results: Dict[str, Dict], baselines: Dict[str, Dict], tolerance: float = 0.25
+) -> List[str]:
+    """Regressions of the results with respect to the stored baselines.
+
+    Args:
+        results (dict): Measurements by size.
+        baselines (dict): Stored measurements of this platform by size.
+        tolerance (float): Allowed relative drop of throughput and growth of memory.
+
+    Returns:
+        list: One message per regression. Sizes without a baseline are ignored.
+    """
+    regressions = []
+    for size, result in results.items():
+        baseline = baselines.get(size)
+        if baseline is None:
+            continue
+        speed = result["lines_per_calibration"] / baseline["lines_per_calibration"]
+        if speed < 1 - tolerance:
+            regressions.append(
+                f"{size} lines: throughput {result['lines_per_calibration']:.1f} "
+                f"lines/calibration is {1 - speed:.0%} below the baseline"
+            )
+        memory = result["peak_mb"] / baseline["peak_mb"]
+        if memory > 1 + tolerance:
+            regressions.append(
+                f"{size} lines: peak memory {result['peak_mb']:.1f} MB "
+                f"is {memory - 1:.0%} above the baseline"
+            )
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--lines", type=int, nargs="+", default=[100, 1000, 10000, 100000]
+    )
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--tolerance", type=float, default=0.25)
+    parser.add_argument("--baselines", default=BASELINES)
+    parser.add_argument(
+        "--update",
+        action="store_true",
+        help="store the results as the baselines of this platform",
+    )
+    args = parser.parse_args(argv)
+
+    stored = {}
+    if os.path.exists(args.baselines):
+        with open(args.baselines, "r", encoding="utf-8") as f:
+            stored = json.load(f)
+    baselines = stored.get(machine(), {})
+
+    speed = calibrate()
+    results = {}
+    for size in sorted(args.lines):
+        # small scripts are repeated more to reduce the noise of the timer, large
+        # ones only once
+        repeat = max(1, args.repeat * 1000 // size)
+        results[str(size)] = measure(synthetic_script(size), repeat, speed)
+
+    reference = str(min(args.lines))
+    ratios = scaling(results, reference)
+    print(
+        f"{'lines':>7} {'seconds':>9} {'lines/s':>9} {'peak MB':>8} "
+        f"{'speed':>6} {'memory':>6} {'baseline':>9}"
+    )
+    for size, result in results.items():
+        baseline = baselines.get(size, {}).get("lines_per_calibration")
+        relative = (
+            f"{result['lines_per_calibration'] / baseline:>9.2f}" if baseline else ""
+        )
+        print(
+            f"{result['lines']:>7} {result['seconds']:>9.3f} "
+            f"{result['lines_per_second']:>9.0f} {result['peak_mb']:>8.1f} "
+            f"{ratios[size]['throughput']:>6.2f} {ratios[size]['memory']:>6.2f} "
+            f"{relative}"
+        )
+
+    if args.update:
+        stored[machine()] = {**baselines, **results}
+        with open(args.baselines, "w", encoding="utf-8") as f:
+            json.dump(stored, f, indent=2, sort_keys=True)
+        print(f"baselines of {machine()} written to {args.baselines}")
+        return 0
+
+    regressions = compare(results, reference, args.tolerance)
+    regressions += compare_baselines(results, baselines, args.tolerance)
+    for regression in regressions:
+        print(f"REGRESSION {regression}", file=sys.stderr)
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,72 @@
+"""Scaling of the JavaScript translator with the size of the source.
+
+Translates every tests/onefile/*.js fixture repeated 1 to N times and reports, for
+each size, the total number of lines, the wall time of the tokenizer and of the whole
+translation, and the translation time per line relative to the smallest size (1.00
+means linear scaling). Fixtures that cannot be translated are skipped.
+
+Usage:
+    python -m benchmarks.translate_scaling [--copies 1 2 3] [--fixtures tests/onefile]
+"""
+
+import argparse
+import glob
+import os
+import time
+
+from ee_extra import translate
+from ee_extra.JavaScript.tokenizer import tokenize
+
+
+def load_fixtures(folder: str) -> dict:
+    """Reads the fixtures of a folder that can be translated."""
+    fixtures = {}
+    for path in sorted(glob.glob(os.path.join(folder, "*.js"))):
+        with open(path, "r", encoding="utf-8") as f:
+            source = f.read()
+        if not source.strip():
+            continue
+        try:
+            translate(source)
+        except Exception as e:
+            print(f"skipping {os.path.basename(path)}: {e!r}")
+            continue
+        fixtures[path] = source
+    return fixtures
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--copies", type=int, nargs="+", default=[1, 2, 3])
+    parser.add_argument("--fixtures", default=os.path.join("tests", "onefile"))
+    args = parser.parse_args()
+
+    fixtures = load_fixtures(args.fixtures)
+
+    print(
+        f"{'copies':>6} {'lines':>7} {'tokenize':>9} {'translate':>10} {'per line':>9}"
+    )
+    baseline = None
+    for copies in args.copies:
+        sources = ["\n".join([source] * copies) for source in fixtures.values()]
+        lines = sum(source.count("\n") + 1 for source in sources)
+
+        start = time.perf_counter()
+        for source in sources:
+            tokenize(source)
+        tokenizing = time.perf_counter() - start
+
+        start = time.perf_counter()
+        for source in sources:
+            translate(source)
+        translating = time.perf_counter() - start
+
+        baseline = baseline or translating / lines
+        print(
+            f"{copies:>6} {lines:>7} {tokenizing:>9.3f} {translating:>10.2f} "
+            f"{translating / lines / baseline:>9.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
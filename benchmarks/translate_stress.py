@@ -0,0 +1,37 @@
+"""Stress test of the JavaScript translator on large synthetic modules.
+
+Generates synthetic Earth Engine modules of increasing size (see benchmarks/corpus.py),
+which use the constructs handled by the line-grouping passes (chained methods starting
+with ".", strings split with "+", for loops, functions and map calls), translates them
+and reports the wall time and the lines translated per second.
+
+Usage:
+    python -m benchmarks.translate_stress [--lines 5000 10000 25000 50000]
+"""
+
+import argparse
+import time
+
+from benchmarks.corpus import synthetic_script
+from ee_extra import translate
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument(
+        "--lines", type=int, nargs="+", default=[5000, 10000, 25000, 50000]
+    )
+    args = parser.parse_args()
+
+    print(f"{'lines':>7} {'seconds':>9} {'lines/s':>9}")
+    for lines in args.lines:
+        source = synthetic_script(lines)
+        lines = source.count("\n") + 1
+        start = time.perf_counter()
+        translate(source)
+        seconds = time.perf_counter() - start
+        print(f"{lines:>7} {seconds:>9.2f} {lines / seconds:>9.0f}")
+
+
+if __name__ == "__main__":
+    main()
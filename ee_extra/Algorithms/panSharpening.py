@@ -1,3 +1,4 @@
+import functools
 from abc import ABC, abstractmethod
 from typing import Any, Dict, List, Optional, Sequence, Type, TypeVar, Union
 
@@ -6,7 +7,7 @@ import ee
 from ee_extra.QA.metrics import getMetrics
 from ee_extra.Spectral.core import matchHistogram
 from ee_extra.STAC.utils import _get_platform_STAC
-from ee_extra.utils import _filter_image_bands, _get_case_insensitive_close_matches
+from ee_extra.utils import _filter_image_bands, _TrigramMatcher
 
 ImageLike = TypeVar("ImageLike", ee.Image, ee.ImageCollection)
 
@@ -161,6 +162,12 @@ def listSharpeners() -> Dict[str, Type["Sharpener"]]:
     return {sharpener.__name__: sharpener for sharpener in sharpeners}
 
 
+@functools.lru_cache(maxsize=None)
+def _get_sharpeners_matcher() -> _TrigramMatcher:
+    """Gets the close matcher of the names of the sharpeners, built once."""
+    return _TrigramMatcher(listSharpeners().keys())
+
+
 def getSharpener(name: str) -> Type["Sharpener"]:
     """Return a pan-sharpening algorithm that matches a name.
 
@@ -176,7 +183,7 @@ def getSharpener(name: str) -> Type["Sharpener"]:
     try:
         sharpener = options[name]
     except KeyError:
-        close_matches = _get_case_insensitive_close_matches(name, keys, n=3)
+        close_matches = _get_sharpeners_matcher().get_close_matches(name, n=3)
         hint = " Close matches: {}.".format(close_matches) if close_matches else ""
 
         raise AttributeError(
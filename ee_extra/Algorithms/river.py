@@ -36,8 +36,13 @@
 
 
 import ee
+import functools
 import math
-from typing import Union, Optional
+import time
+import warnings
+from typing import Any, Union, Optional
+
+from ee_extra.Algorithms.tasks import TaskScheduler, count_active_tasks
 
 
 def hitOrMiss(image, se1, se2):
@@ -48,57 +53,127 @@ def hitOrMiss(image, se1, se2):
 
 
 def splitKernel(kernel, value):
-    """recalculate the kernel according to the given foreground value"""
-    kernel_shape = (len(kernel), len(kernel[0]))
-    result = kernel
-    r = 0
-    while r < kernel_shape[0]:
-        c = 0
-        while c < kernel_shape[1]:
-            if kernel[r][c] == value:
-                result[r][c] = 1
-            else:
-                result[r][c] = 0
-            c = c + 1
-        r = r + 1
-    return result
+    """recalculate the kernel according to the given foreground value (the input is not modified)"""
+    return [list(row) for row in _binary_kernel(kernel, value)]
 
 
 def Skeletonize(image, iterations, method):
-    """perform skeletonization"""
+    """perform skeletonization (the passes run inside ee.List.iterate, see Thinning)"""
+    return Thinning(image, iterations, method)
+
+
+def _binary_kernel(kernel, value):
+    """return a new 0/1 kernel with ones where kernel equals value"""
+    return tuple(tuple(int(cell == value) for cell in row) for row in kernel)
+
+
+def _rotate_kernel(kernel):
+    """rotate a kernel 90 degrees clockwise (same as ee.Kernel.rotate(1))"""
+    return tuple(zip(*kernel[::-1]))
+
+
+def _rotated_kernels(sew):
+    """precompute the (hit, miss) kernel pairs of the 4 rotations of a structuring element"""
+    pairs = []
+    for _ in range(4):
+        pairs.append((_binary_kernel(sew, 1), _binary_kernel(sew, 2)))
+        sew = _rotate_kernel(sew)
+    return tuple(pairs)
 
-    se1w = [[2, 2, 2], [0, 1, 0], [1, 1, 1]]
 
-    if method == 2:
-        se1w = [[2, 2, 2], [0, 1, 0], [0, 1, 0]]
+def _thinning_kernels(se1w, se2w):
+    """precompute the (hit, miss) kernel pairs of one thinning pass, in the order used by Skeletonize"""
+    return tuple(
+        pair
+        for pairs in zip(_rotated_kernels(se1w), _rotated_kernels(se2w))
+        for pair in pairs
+    )
+
+
+## pre-rotated (hit, miss) structuring elements of one thinning pass, by method
+THINNING_KERNELS = {
+    1: _thinning_kernels(
+        ((2, 2, 2), (0, 1, 0), (1, 1, 1)), ((2, 2, 0), (2, 1, 1), (0, 1, 0))
+    ),
+    2: _thinning_kernels(
+        ((2, 2, 2), (0, 1, 0), (0, 1, 0)), ((2, 2, 0), (2, 1, 1), (0, 1, 1))
+    ),
+}
+
+## pre-rotated (hit, miss) structuring elements of the centerline end points and corners
+ENDPOINT_KERNELS = _rotated_kernels(((0, 0, 0), (2, 1, 2), (2, 2, 2)))
+CORNER_KERNELS = _rotated_kernels(((2, 2, 0), (2, 1, 1), (0, 1, 0)))
+
+## direction (in degrees) of each pixel of a 9x9 ring around the center pixel
+ANGLE_WEIGHTS = (
+    (135.0, 126.9, 116.6, 104.0, 90.0, 76.0, 63.4, 53.1, 45.0),
+    (143.1, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 36.9),
+    (153.4, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 26.6),
+    (166.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 14.0),
+    (180.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 1e-5),
+    (194.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 346.0),
+    (206.6, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 333.4),
+    (216.9, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 323.1),
+    (225.0, 233.1, 243.4, 256.0, 270.0, 284.0, 296.6, 306.9, 315.0),
+)
+
+
+@functools.lru_cache(maxsize=None)
+def _ee_kernel(kernel):
+    """ee.Kernel.fixed of a precomputed kernel, built once per kernel
+
+    ee.Kernel objects cannot be built at import time (before ee.Initialize), so they
+    are created on first use and shared by every later call.
+    """
+    return ee.Kernel.fixed(len(kernel[0]), len(kernel), [list(row) for row in kernel])
 
-    se11 = ee.Kernel.fixed(3, 3, splitKernel(se1w, 1))
-    se12 = ee.Kernel.fixed(3, 3, splitKernel(se1w, 2))
 
-    se2w = [[2, 2, 0], [2, 1, 1], [0, 1, 0]]
+@functools.lru_cache(maxsize=None)
+def _ee_kernel_pairs(pairs):
+    """ee.Kernel (hit, miss) pairs of precomputed structuring elements, built once"""
+    return tuple((_ee_kernel(hit), _ee_kernel(miss)) for hit, miss in pairs)
 
-    if method == 2:
-        se2w = [[2, 2, 0], [2, 1, 1], [0, 1, 1]]
 
-    se21 = ee.Kernel.fixed(3, 3, splitKernel(se2w, 1))
-    se22 = ee.Kernel.fixed(3, 3, splitKernel(se2w, 2))
+def Thinning(image, maxIterations=10, method=1, region=None, scale=None):
+    """perform skeletonization with a constant-size expression and optional early stopping
 
-    result = image
+    The thinning passes run inside ee.List.iterate, so the serialized expression does not
+    grow with maxIterations. If region and scale are given, each pass also checks whether
+    the previous one changed any pixel in region; once it does not, the remaining passes
+    are skipped.
+    """
+    pairs = _ee_kernel_pairs(THINNING_KERNELS[method])
+
+    def thinOnce(img):
+        for se1, se2 in pairs:
+            img = img.subtract(hitOrMiss(img, se1, se2))
+        return img
+
+    def step(i, state):
+        state = ee.List(state)
+        previous = ee.Image(state.get(0))
+        result = thinOnce(previous)
+
+        if region is None:
+            return ee.List([result, 0])
+
+        changed = (
+            result.neq(previous)
+            .reduceRegion(ee.Reducer.anyNonZero(), region, scale, bestEffort=True)
+            .values()
+            .get(0)
+        )
+        # null when no pixel of region is valid: nothing changed
+        changed = ee.Algorithms.If(changed, changed, 0)
+        return ee.Algorithms.If(
+            state.get(1), state, ee.List([result, ee.Number(changed).Not()])
+        )
 
-    i = 0
-    while i < iterations:
-        j = 0
-        while j < 4:
-            result = result.subtract(hitOrMiss(result, se11, se12))
-            se11 = se11.rotate(1)
-            se12 = se12.rotate(1)
-            result = result.subtract(hitOrMiss(result, se21, se22))
-            se21 = se21.rotate(1)
-            se22 = se22.rotate(1)
-            j = j + 1
-        i = i + 1
+    result = ee.List(
+        ee.List.sequence(1, maxIterations).iterate(step, ee.List([image, 0]))
+    )
 
-    return result.rename(["clRaw"])
+    return ee.Image(result.get(0)).rename(["clRaw"])
 
 
 def CalcDistanceMap(img, neighborhoodSize, scale):
@@ -174,20 +249,11 @@ def CalcOnePixelWidthCenterline(img, GM, hGrad):
 def ExtractEndpoints(CL1px):
     """calculate end points in the one pixel centerline"""
 
-    se1w = [[0, 0, 0], [2, 1, 2], [2, 2, 2]]
-
-    se11 = ee.Kernel.fixed(3, 3, splitKernel(se1w, 1))
-    se12 = ee.Kernel.fixed(3, 3, splitKernel(se1w, 2))
-
     result = CL1px
 
     # // the for loop removes the identified endpoints from the input image
-    i = 0
-    while i < 4:  # rotate kernels
-        result = result.subtract(hitOrMiss(CL1px, se11, se12))
-        se11 = se11.rotate(1)
-        se12 = se12.rotate(1)
-        i = i + 1
+    for se1, se2 in _ee_kernel_pairs(ENDPOINT_KERNELS):  # rotated kernels
+        result = result.subtract(hitOrMiss(CL1px, se1, se2))
     endpoints = CL1px.subtract(result)
     return endpoints
 
@@ -195,23 +261,11 @@ def ExtractEndpoints(CL1px):
 def ExtractCorners(CL1px):
     """calculate corners in the one pixel centerline"""
 
-    se1w = [[2, 2, 0], [2, 1, 1], [0, 1, 0]]
-
-    se11 = ee.Kernel.fixed(3, 3, splitKernel(se1w, 1))
-    se12 = ee.Kernel.fixed(3, 3, splitKernel(se1w, 2))
-
     result = CL1px
     # // the for loop removes the identified corners from the input image
 
-    i = 0
-    while i < 4:  # rotate kernels
-
-        result = result.subtract(hitOrMiss(result, se11, se12))
-
-        se11 = se11.rotate(1)
-        se12 = se12.rotate(1)
-
-        i = i + 1
+    for se1, se2 in _ee_kernel_pairs(CORNER_KERNELS):  # rotated kernels
+        result = result.subtract(hitOrMiss(result, se1, se2))
 
     cornerPoints = CL1px.subtract(result)
     return cornerPoints
@@ -259,21 +313,7 @@ def CleanCenterline(cl1px, maxBranchLengthToRemove, rmCorners):
 def CalculateAngle(clCleaned):
     """calculate the orthogonal direction of each pixel of the centerline"""
 
-    w3 = ee.Kernel.fixed(
-        9,
-        9,
-        [
-            [135.0, 126.9, 116.6, 104.0, 90.0, 76.0, 63.4, 53.1, 45.0],
-            [143.1, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 36.9],
-            [153.4, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 26.6],
-            [166.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 14.0],
-            [180.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 1e-5],
-            [194.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 346.0],
-            [206.6, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 333.4],
-            [216.9, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 0.0, 323.1],
-            [225.0, 233.1, 243.4, 256.0, 270.0, 284.0, 296.6, 306.9, 315.0],
-        ],
-    )
+    w3 = _ee_kernel(ANGLE_WEIGHTS)
 
     combinedReducer = ee.Reducer.sum().combine(ee.Reducer.count(), None, True)
 
@@ -442,30 +482,91 @@ def CalculateWidth(imgIn):
     return widths
 
 
+## standardize band names
+STD_BANDNAMES = ["uBlue", "Blue", "Green", "Red", "Swir1", "BQA", "Nir", "Swir2"]
+SENSOR_BANDNAMES = {
+    "LT05": ["B1", "B1", "B2", "B3", "B5", "pixel_qa", "B4", "B7"],
+    "LE07": ["B1", "B1", "B2", "B3", "B5", "pixel_qa", "B4", "B7"],
+    "LC08": ["B1", "B2", "B3", "B4", "B6", "pixel_qa", "B5", "B7"],
+}
+SENSOR_COLLECTIONS = {
+    "LT05": "LANDSAT/LT05/C01/T1_SR",
+    "LE07": "LANDSAT/LE07/C01/T1_SR",
+    "LC08": "LANDSAT/LC08/C01/T1_SR",
+}
+## only landsat 7 images before the SLC failure are used
+LE07_DATE_RANGE = ("1999-04-15", "2003-05-30")
+## sensor of each value of the SATELLITE property of the SR images
+SATELLITE_SENSORS = {"LANDSAT_5": "LT05", "LANDSAT_7": "LE07", "LANDSAT_8": "LC08"}
+
+
+@functools.lru_cache(maxsize=None)
 def merge_collections_std_bandnames_collection1tier1_sr():
-    """merge landsat 5, 7, 8 collection 1 tier 1 SR imageCollections and standardize band names"""
-    ## standardize band names
-    bn8 = ["B1", "B2", "B3", "B4", "B6", "pixel_qa", "B5", "B7"]
-    bn7 = ["B1", "B1", "B2", "B3", "B5", "pixel_qa", "B4", "B7"]
-    bn5 = ["B1", "B1", "B2", "B3", "B5", "pixel_qa", "B4", "B7"]
-    bns = ["uBlue", "Blue", "Green", "Red", "Swir1", "BQA", "Nir", "Swir2"]
-
+    """merge landsat 5, 7, 8 collection 1 tier 1 SR imageCollections and standardize band names (built once)"""
     # create a merged collection from landsat 5, 7, and 8
-    ls5 = ee.ImageCollection("LANDSAT/LT05/C01/T1_SR").select(bn5, bns)
+    ls5 = ee.ImageCollection(SENSOR_COLLECTIONS["LT05"]).select(
+        SENSOR_BANDNAMES["LT05"], STD_BANDNAMES
+    )
 
     ls7 = (
-        ee.ImageCollection("LANDSAT/LE07/C01/T1_SR")
-        .filterDate("1999-04-15", "2003-05-30")
-        .select(bn7, bns)
+        ee.ImageCollection(SENSOR_COLLECTIONS["LE07"])
+        .filterDate(*LE07_DATE_RANGE)
+        .select(SENSOR_BANDNAMES["LE07"], STD_BANDNAMES)
     )
 
-    ls8 = ee.ImageCollection("LANDSAT/LC08/C01/T1_SR").select(bn8, bns)
+    ls8 = ee.ImageCollection(SENSOR_COLLECTIONS["LC08"]).select(
+        SENSOR_BANDNAMES["LC08"], STD_BANDNAMES
+    )
 
     merged = ls5.merge(ls7).merge(ls8)
 
     return merged
 
 
+def parse_landsat_id(id):
+    """Parse a LANDSAT_ID (e.g. LC08_L1TP_022034_20130422_20170310_01_T1) or a
+    system:id (e.g. LANDSAT/LC08/C01/T1_SR/LC08_022034_20180303) client-side.
+
+    Returns:
+        tuple: The sensor (e.g. LC08) and the system:id of the SR image.
+    """
+    index = id.split("/")[-1]
+    parts = index.split("_")
+
+    if len(parts) == 7:  # LANDSAT_ID
+        index = "_".join([parts[0], parts[2], parts[3]])
+        parts = index.split("_")
+
+    sensor = parts[0]
+    if sensor not in SENSOR_COLLECTIONS or len(parts) != 3:
+        raise Exception(
+            "The image id is not recognized. Only Landsat 5, 7 and 8 SR scenes are supported"
+        )
+
+    date = "{}-{}-{}".format(parts[2][:4], parts[2][4:6], parts[2][6:8])
+    if sensor == "LE07" and not LE07_DATE_RANGE[0] <= date < LE07_DATE_RANGE[1]:
+        raise Exception(
+            "Only Landsat 7 scenes acquired between {} and {} are supported".format(
+                *LE07_DATE_RANGE
+            )
+        )
+
+    return sensor, SENSOR_COLLECTIONS[sensor] + "/" + index
+
+
+def std_bandnames(image):
+    """Select and rename the bands of a Landsat 5, 7 or 8 SR image to STD_BANDNAMES
+    server-side, using its SATELLITE property.
+    """
+    bandnames = ee.Dictionary(
+        {
+            satellite: SENSOR_BANDNAMES[sensor]
+            for satellite, sensor in SATELLITE_SENSORS.items()
+        }
+    )
+    return image.select(ee.List(bandnames.get(image.get("SATELLITE"))), STD_BANDNAMES)
+
+
 def id2Img(id):
     return ee.Image(
         merge_collections_std_bandnames_collection1tier1_sr()
@@ -784,31 +885,22 @@ def rwGenSR(
 
 
 def maximum_no_of_tasks(MaxNActive, waitingPeriod):
-    """maintain a maximum number of active tasks"""
-    import time
-    import ee
-
-    ee.Initialize()
+    """maintain a maximum number of active tasks
 
+    Deprecated: rwc_batch keeps at most max_active tasks in flight by itself (see
+    ee_extra.Algorithms.tasks.TaskScheduler).
+    """
+    warnings.warn(
+        "maximum_no_of_tasks is deprecated, rwc_batch keeps at most max_active "
+        "tasks in flight by itself",
+        DeprecationWarning,
+        stacklevel=2,
+    )
     time.sleep(10)
-    ## initialize submitting jobs
-    ts = list(ee.batch.Task.list())
-
-    NActive = 0
-    for task in ts:
-        if "RUNNING" in str(task) or "READY" in str(task):
-            NActive += 1
     ## wait if the number of current active tasks reach the maximum number
     ## defined in MaxNActive
-    while NActive >= MaxNActive:
-        time.sleep(
-            waitingPeriod
-        )  # if reach or over maximum no. of active tasks, wait for 2min and check again
-        ts = list(ee.batch.Task.list())
-        NActive = 0
-        for task in ts:
-            if "RUNNING" in str(task) or "READY" in str(task):
-                NActive += 1
+    while count_active_tasks() >= MaxNActive:
+        time.sleep(waitingPeriod)
     return ()
 
 
@@ -823,30 +915,19 @@ def str_to_ee(id):
         ee.Image: An ee.Image.
     """
     if isinstance(id, str):
-        if len(id) == 43 and "/" in id:
-            id = ee.Image(id).get("LANDSAT_ID").getInfo()
-            return ee.Image(
-                merge_collections_std_bandnames_collection1tier1_sr()
-                .filterMetadata("LANDSAT_ID", "equals", id)
-                .first()
-            )
-
-        elif len(id) == 40:
-            return ee.Image(
-                merge_collections_std_bandnames_collection1tier1_sr()
-                .filterMetadata("LANDSAT_ID", "equals", id)
-                .first()
-            )
+        if (len(id) == 43 and "/" in id) or len(id) == 40:
+            # the sensor is parsed from the id, so only its image is loaded
+            sensor, image_id = parse_landsat_id(id)
+            return ee.Image(image_id).select(SENSOR_BANDNAMES[sensor], STD_BANDNAMES)
         else:
             raise Exception(
                 "The image id is not recognized. It must be retrieved using either LANDSAT_ID, system:index"
             )
 
     elif isinstance(id, ee.Image):
-        id = id.get("LANDSAT_ID").getInfo()
         return ee.Image(
             merge_collections_std_bandnames_collection1tier1_sr()
-            .filterMetadata("LANDSAT_ID", "equals", id)
+            .filter(ee.Filter.eq("LANDSAT_ID", id.get("LANDSAT_ID")))
             .first()
         )
     else:
@@ -866,6 +947,7 @@ def rwc(
     fill_size: Optional[int] = 333,
     max_dist_branch_removal: Optional[int] = 500,
     return_fc: Optional[bool] = False,
+    start_task: Optional[bool] = True,
 ):
     """Calculate river centerlines and widths for one Landsat SR image.
 
@@ -880,9 +962,10 @@ def rwc(
         fill_size (int, optional): Islands or bars smaller than this value (unit: pixels) will be removed before calculating centerline. Defaults to 333.
         max_dist_branch_removal (int, optional): Length of pruning. Spurious branch of the initial centerline will be removed by this length (unit: pixels). Defaults to 500.
         return_fc (Optional[bool], optional): Whether to return the result as an ee.FeatureColleciton. Defaults to False.
+        start_task (Optional[bool], optional): Whether to start the export task. If False, the unstarted ee.batch.Task is returned. Defaults to True.
 
     Returns:
-        If return_fc is True, return an ee.FeatureCollection. Otherwise, return True.
+        If return_fc is True, return an ee.FeatureCollection. If start_task is False, return the unstarted ee.batch.Task. Otherwise, return True.
 
     Examples:
         >>> import ee
@@ -927,11 +1010,129 @@ def rwc(
         folder=folder,
         fileFormat=file_format,
     )
+    if not start_task:
+        return taskWidth
+
     taskWidth.start()
     print(description, "will be exported to", folder, "as", file_format, "file")
     return True
 
 
+def _split_shards(ids: list, shards: int) -> list:
+    """Split a list of scene IDs into at most `shards` consecutive, non-empty chunks of
+    (almost) equal size.
+    """
+    shards = max(1, min(shards, len(ids)))
+    size = max(1, math.ceil(len(ids) / shards))
+    return [ids[i : i + size] for i in range(0, len(ids), size)]
+
+
+def rwc_collection(
+    images: Union[list, ee.ImageCollection],
+    description: Optional[str] = "rwc",
+    folder: str = "",
+    file_format: str = "shp",
+    aoi: Optional[ee.Geometry.Polygon] = None,
+    water_method: Optional[str] = "Jones2019",
+    max_dist: Optional[int] = 4000,
+    fill_size: Optional[int] = 333,
+    max_dist_branch_removal: Optional[int] = 500,
+    shards: Optional[int] = 1,
+    return_fc: Optional[bool] = False,
+    start_task: Optional[bool] = True,
+):
+    """Calculate river centerlines and widths for multiple Landsat SR images in a few export tasks.
+
+    Unlike rwc_batch, which exports one table per scene, the rwGenSR pipeline is mapped over
+    the scenes and the widths of all of them are flattened into a single table (or into a
+    few tables if shards > 1). The image_id property of each width identifies its scene.
+
+    Args:
+        images (list | ee.ImageCollection): A list of LANDSAT_IDs (e.g., LC08_L1TP_022034_20130422_20170310_01_T1) or a Landsat 5, 7, or 8 ee.ImageCollection.
+        description (str, optional): File name of the output file. If shards > 1, the shard number is appended. Defaults to "rwc".
+        folder (str, optional): Folder name within Google Drive to save the exported files. Defaults to "", which is the root directory.
+        file_format (str, optional): The supported file format include shp, csv, json, kml, kmz, and TFRecord. Defaults to "shp".
+        aoi (ee.Geometry.Polygon, optional): A polygon (or rectangle) geometry define the area of interest. Only widths and centerline from this area will be calculated. Defaults to None.
+        water_method (str, optional): Water classification method ('Jones2019' or 'Zou2018'). Defaults to "Jones2019".
+        max_dist (int, optional): Maximum distance (unit: meters) to check water pixel's connectivity to GRWL centerline. Defaults to 4000.
+        fill_size (int, optional): Islands or bars smaller than this value (unit: pixels) will be removed before calculating centerline. Defaults to 333.
+        max_dist_branch_removal (int, optional): Length of pruning. Spurious branch of the initial centerline will be removed by this length (unit: pixels). Defaults to 500.
+        shards (int, optional): Number of export tasks. A list of scenes is split evenly (in order) among them; an ee.ImageCollection is split at random (with a fixed seed) into shards of about the same size. Defaults to 1.
+        return_fc (Optional[bool], optional): Whether to return the result as a list of ee.FeatureCollection (one per shard). Defaults to False.
+        start_task (Optional[bool], optional): Whether to start the export tasks. Defaults to True.
+
+    Returns:
+        If return_fc is True, return a list of ee.FeatureCollection. Otherwise, return the list of export tasks.
+
+    Examples:
+        >>> import ee
+        >>> from ee_extra.Algorithms import river
+        >>> ee.Initialize()
+        >>> point = ee.Geometry.Point([-88.08, 37.47])
+        >>> ic = ee.ImageCollection("LANDSAT/LC08/C01/T1_SR") \
+        >>>           .filterBounds(point) \
+        >>>           .filterDate("2018-01-01", "2019-01-01")
+        >>> # Extract river widths of all the scenes in two export tasks.
+        >>> river.rwc_collection(ic, "rwc_2018", folder="export", shards=2)
+    """
+    gen = rwGenSR(
+        aoi=aoi,
+        WATER_METHOD=water_method,
+        MAXDISTANCE=max_dist,
+        FILL_SIZE=fill_size,
+        MAXDISTANCE_BRANCH_REMOVAL=max_dist_branch_removal,
+    )
+
+    if isinstance(images, ee.ImageCollection):
+        # the collection is mapped as it is, without listing its scenes client-side
+        images = images.map(std_bandnames)
+        if shards > 1:
+            images = images.randomColumn("rwc_shard", 0)
+            sceneCollections = [
+                images.filter(
+                    ee.Filter.And(
+                        ee.Filter.gte("rwc_shard", i / shards),
+                        ee.Filter.lt("rwc_shard", (i + 1) / shards),
+                    )
+                )
+                for i in range(shards)
+            ]
+        else:
+            sceneCollections = [images]
+    elif isinstance(images, list):
+        # each scene is loaded from its own collection (see str_to_ee), so an
+        # unrecognized id raises an error instead of being dropped
+        sceneCollections = [
+            ee.ImageCollection([str_to_ee(id) for id in shardIDs])
+            for shardIDs in _split_shards(images, shards)
+        ]
+    else:
+        raise Exception("images must be a list of Landsat IDs or an ee.ImageCollection")
+
+    width_fcs = [
+        ee.FeatureCollection(scenes.map(gen)).flatten() for scenes in sceneCollections
+    ]
+
+    if return_fc:
+        return width_fcs
+
+    tasks = []
+    for i, width_fc in enumerate(width_fcs):
+        shardDescription = description if len(width_fcs) == 1 else f"{description}_{i}"
+        task = ee.batch.Export.table.toDrive(
+            collection=width_fc,
+            description=shardDescription,
+            folder=folder,
+            fileFormat=file_format,
+        )
+        if start_task:
+            task.start()
+            print(shardDescription, "will be exported to", folder, "as", file_format, "file")
+        tasks.append(task)
+
+    return tasks
+
+
 def rwc_batch(
     images: Union[str, list, ee.ImageCollection],
     folder: Optional[str] = "",
@@ -941,9 +1142,16 @@ def rwc_batch(
     max_dist: Optional[int] = 4000,
     fill_size: Optional[int] = 333,
     max_dist_branch_remove: Optional[int] = 500,
+    max_active: Optional[int] = 10,
+    max_workers: Optional[int] = 4,
+    checkpoint: Optional[str] = None,
+    backend: Optional[Any] = None,
 ):
     """Calculate river centerlines and widths for multiple Landsat SR images.
 
+    The export tasks are created and submitted concurrently, keeping at most
+    max_active tasks in flight (see ee_extra.Algorithms.tasks.TaskScheduler).
+
     Args:
         images (Union[str, list, ee.ImageCollection]): An input csv file containing a list of Landsat IDs (e.g., LC08_L1TP_022034_20130422_20170310_01_T1).
         folder (Optional[str], optional): Folder name within Google Drive to save the exported file. Defaults to "", which is the root directory.
@@ -953,9 +1161,13 @@ def rwc_batch(
         max_dist (Optional[int], optional): Maximum distance (unit: meters) to check water pixel's connectivity to GRWL centerline. Defaults to 4000.
         fill_size (Optional[int], optional): Islands or bars smaller than this value (unit: pixels) will be removed before calculating centerline. Defaults to 333.
         max_dist_branch_remove (Optional[int], optional): Length of pruning. Spurious branch of the initial centerline will be removed by this length (unit: pixels). Defaults to 500.
+        max_active (Optional[int], optional): Maximum number of export tasks in flight. Defaults to 10.
+        max_workers (Optional[int], optional): Number of threads used to create and submit the export tasks. Defaults to 4.
+        checkpoint (Optional[str], optional): Path to a JSON file used to save the state of the tasks and to resume the batch after a crash. Defaults to None.
+        backend (Optional[Any], optional): Task backend used to submit and track the tasks. Defaults to None, i.e. Earth Engine batch tasks.
 
     Returns:
-        Return True.
+        Dictionary with the final state ("COMPLETED", "FAILED" or "CANCELLED") of the export task of each scene. Earlier versions returned True once every task was started; the dictionary is still truthy when there is at least one scene.
 
     Examples:
         >>> import ee
@@ -968,11 +1180,11 @@ def rwc_batch(
         >>>           .sort("CLOUD_COVER")
         >>> ic = ee.ImageCollection(ic.toList(2))
         >>> # Extract river width iteratively.
-        >>> river.rwc_batch(ic, folder="export2", water_method='Jones2019')
+        >>> river.rwc_batch(ic, folder="export2", water_method='Jones2019', checkpoint="rwc.json")
     """
-    import pandas as pd
-
     if isinstance(images, str):
+        import pandas as pd
+
         imageInfo = pd.read_csv(images, encoding="utf-8")
         sceneIDList = imageInfo["LANDSAT_ID"].values.tolist()
     elif isinstance(images, ee.ImageCollection):
@@ -982,8 +1194,8 @@ def rwc_batch(
     else:
         raise Exception("images must be a list of Landsat IDs or an ee.ImageCollection")
 
-    for scene in sceneIDList:
-        rwc(
+    def make_job(scene):
+        return lambda: rwc(
             scene,
             scene,
             folder,
@@ -993,6 +1205,14 @@ def rwc_batch(
             max_dist,
             fill_size,
             max_dist_branch_remove,
+            start_task=False,
         )
 
-    return True
+    scheduler = TaskScheduler(
+        backend=backend,
+        max_active=max_active,
+        max_workers=max_workers,
+        checkpoint=checkpoint,
+    )
+
+    return scheduler.run({scene: make_job(scene) for scene in sceneIDList})
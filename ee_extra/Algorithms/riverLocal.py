@@ -0,0 +1,734 @@
+"""Local (NumPy) counterparts of the RivWidthCloud routines in ee_extra.Algorithms.river.
+
+These functions work on NumPy arrays instead of ee.Image objects, so river centerlines
+and widths can be extracted from local water masks, and the results of the Earth Engine
+implementation can be validated and benchmarked offline. They use the same structuring
+elements as the Earth Engine implementation. Large masks are processed tile by tile
+(see riverWidths), so memory stays bounded.
+
+Arrays are north-up: rows increase southwards and columns increase eastwards.
+
+Requires numpy and scipy (pip install ee_extra[local]).
+"""
+
+import collections
+import heapq
+import math
+import mmap
+import os
+import warnings
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from ee_extra.Algorithms.river import (
+    ANGLE_WEIGHTS,
+    CORNER_KERNELS,
+    ENDPOINT_KERNELS,
+    THINNING_KERNELS,
+)
+from ee_extra.utils import _check_numpy, _check_scipy
+
+np = _check_numpy()
+
+WIDTH_COLUMNS = [
+    "row",
+    "col",
+    "x",
+    "y",
+    "orthogonalDirection",
+    "toBankDistance",
+    "width",
+    "endsInWater",
+    "endsOverEdge",
+]
+
+
+def erode(image: "np.ndarray", kernel: Sequence[Sequence[int]]) -> "np.ndarray":
+    """Minimum of the neighbors selected by a 3x3 kernel (reduceNeighborhood(min)).
+
+    Pixels outside the array are ignored, as masked pixels are in Earth Engine.
+
+    Args:
+        image : 2D array.
+        kernel : 3x3 kernel with ones in the neighbors to reduce.
+
+    Returns:
+        Eroded array.
+    """
+    padded = np.pad(image, 1, constant_values=1)
+    rows, cols = image.shape
+    result = np.ones_like(image)
+
+    for r, row in enumerate(kernel):
+        for c, weight in enumerate(row):
+            if weight:
+                np.minimum(result, padded[r : r + rows, c : c + cols], out=result)
+
+    return result
+
+
+def hitOrMiss(
+    image: "np.ndarray", se1: Sequence[Sequence[int]], se2: Sequence[Sequence[int]]
+) -> "np.ndarray":
+    """Hit-or-miss transform of a binary array.
+
+    Args:
+        image : 2D binary (0/1) array.
+        se1 : 3x3 kernel of foreground (hit) pixels.
+        se2 : 3x3 kernel of background (miss) pixels.
+
+    Returns:
+        Binary array with ones where the image matches the structuring elements.
+    """
+    return erode(image, se1) & erode(1 - image, se2)
+
+
+def thinning(
+    image: "np.ndarray", maxIterations: Optional[int] = None, method: int = 1
+) -> Tuple["np.ndarray", int]:
+    """Hit-or-miss thinning of a binary array (reference of river.Thinning).
+
+    Each iteration applies the 8 pre-rotated structuring element pairs of
+    river.THINNING_KERNELS. The thinning stops when an iteration does not change
+    any pixel or after maxIterations.
+
+    Args:
+        image : 2D binary (0/1) array.
+        maxIterations : Maximum number of iterations. Defaults to None (until convergence).
+        method : Structuring elements to use (1 or 2, as in river.Skeletonize).
+
+    Returns:
+        The thinned array and the number of iterations that changed the array.
+    """
+    result = (np.asarray(image) > 0).astype(np.uint8)
+    pairs = THINNING_KERNELS[method]
+    iterations = 0
+
+    while maxIterations is None or iterations < maxIterations:
+        previous = result.copy()
+        for se1, se2 in pairs:
+            result -= hitOrMiss(result, se1, se2)
+        if np.array_equal(previous, result):
+            break
+        iterations += 1
+
+    return result, iterations
+
+
+def CalcDistanceMap(
+    img: "np.ndarray", neighborhoodSize: int, scale: float
+) -> "np.ndarray":
+    """Distance (in meters) between each river pixel and the closest non-river pixel.
+
+    Args:
+        img : 2D binary (0/1) river mask.
+        neighborhoodSize : Maximum distance (in pixels) to compute.
+        scale : Pixel size in meters.
+
+    Returns:
+        Distance map (NaN outside the river and its 2 pixel outline).
+    """
+    ndimage = _check_scipy()
+    square = np.ones((3, 3), bool)
+
+    imgD1 = ndimage.binary_dilation(img > 0, square)
+    imgD2 = ndimage.binary_dilation(imgD1, square)
+    outline = imgD2 & ~imgD1
+
+    if outline.any():
+        dpixel = ndimage.distance_transform_edt(~outline)
+    else:
+        dpixel = np.full(img.shape, np.inf)
+
+    return np.where((dpixel <= neighborhoodSize) & imgD2, dpixel * scale, np.nan)
+
+
+def CalcGradientMap(image: "np.ndarray", scale: float) -> "np.ndarray":
+    """Magnitude of the gradient of the distance map (Gena's method).
+
+    Args:
+        image : Distance map (NaN where masked).
+        scale : Pixel size in meters.
+
+    Returns:
+        Gradient map (NaN where any neighbor is masked).
+    """
+    padded = np.pad(image, 1, constant_values=np.nan)
+    rows, cols = image.shape
+
+    def shifted(r, c):
+        return padded[r : r + rows, c : c + cols]
+
+    dx = (
+        shifted(0, 0)
+        + 2 * shifted(1, 0)
+        + shifted(2, 0)
+        - shifted(0, 2)
+        - 2 * shifted(1, 2)
+        - shifted(2, 2)
+    ) / 8
+    dy = (
+        shifted(2, 0)
+        + 2 * shifted(2, 1)
+        + shifted(2, 2)
+        - shifted(0, 0)
+        - 2 * shifted(0, 1)
+        - shifted(0, 2)
+    ) / 8
+
+    return np.sqrt((dx * dx + dy * dy) / (scale * scale))
+
+
+def CalcOnePixelWidthCenterline(
+    img: "np.ndarray", GM: "np.ndarray", hGrad: float, iterations: int = 2
+) -> "np.ndarray":
+    """One pixel wide centerline from the ridges of the distance map.
+
+    Args:
+        img : 2D binary (0/1) river mask.
+        GM : Gradient map.
+        hGrad : Gradient threshold of the ridges.
+        iterations : Number of thinning iterations.
+
+    Returns:
+        Binary (0/1) centerline.
+    """
+    with np.errstate(invalid="ignore"):
+        cl = (GM <= hGrad) & (img > 0)
+    return thinning(cl, maxIterations=iterations)[0]
+
+
+def _neighbors_count(image: "np.ndarray") -> "np.ndarray":
+    """Number of foreground pixels in the 3x3 neighborhood (center included)."""
+    padded = np.pad(image.astype(np.int32), 1)
+    rows, cols = image.shape
+    return sum(padded[r : r + rows, c : c + cols] for r in range(3) for c in range(3))
+
+
+def _cumulative_distance(
+    traversable: "np.ndarray", sources: "np.ndarray", maxDistance: float, scale: float
+) -> "np.ndarray":
+    """Pixels reachable from the sources within maxDistance (in meters) through traversable pixels."""
+    rows, cols = traversable.shape
+    steps = [
+        (dr, dc, scale * math.hypot(dr, dc))
+        for dr in (-1, 0, 1)
+        for dc in (-1, 0, 1)
+        if dr or dc
+    ]
+    cost = {(r, c): 0.0 for r, c in zip(*np.nonzero(sources & traversable))}
+    heap = [(0.0, pixel) for pixel in cost]
+    heapq.heapify(heap)
+
+    while heap:
+        distance, (r, c) = heapq.heappop(heap)
+        if distance > cost[(r, c)]:
+            continue
+        for dr, dc, step in steps:
+            pixel = (r + dr, c + dc)
+            new = distance + step
+            if (
+                0 <= pixel[0] < rows
+                and 0 <= pixel[1] < cols
+                and traversable[pixel]
+                and new <= maxDistance
+                and new < cost.get(pixel, math.inf)
+            ):
+                cost[pixel] = new
+                heapq.heappush(heap, (new, pixel))
+
+    reached = np.zeros(traversable.shape, bool)
+    if cost:
+        reached[tuple(np.array(list(cost.keys())).T)] = True
+    return reached
+
+
+def ExtractEndpoints(CL1px: "np.ndarray") -> "np.ndarray":
+    """End points of a one pixel centerline."""
+    endpoints = np.zeros_like(CL1px)
+    for se1, se2 in ENDPOINT_KERNELS:
+        endpoints |= hitOrMiss(CL1px, se1, se2)
+    return endpoints
+
+
+def ExtractCorners(CL1px: "np.ndarray") -> "np.ndarray":
+    """Corners of a one pixel centerline."""
+    result = CL1px.copy()
+    for se1, se2 in CORNER_KERNELS:
+        result -= hitOrMiss(result, se1, se2)
+    return CL1px - result
+
+
+def CleanCenterline(
+    cl1px: "np.ndarray", maxBranchLengthToRemove: float, rmCorners: bool, scale: float
+) -> "np.ndarray":
+    """Clean a one pixel centerline.
+
+    1. remove branches shorter than maxBranchLengthToRemove (in meters)
+    2. remove end points
+    3. remove corners to insure 1px width (optional)
+
+    Args:
+        cl1px : Binary (0/1) centerline.
+        maxBranchLengthToRemove : Maximum branch length in meters.
+        rmCorners : Whether to remove corners.
+        scale : Pixel size in meters.
+
+    Returns:
+        Binary (0/1) cleaned centerline.
+    """
+    cl1px = cl1px.astype(np.uint8)
+    nearbyPoints = _neighbors_count(cl1px)
+    endsByNeighbors = (cl1px > 0) & (nearbyPoints <= 2)
+    joints = (cl1px > 0) & (nearbyPoints >= 4)
+
+    branchMask = _cumulative_distance(
+        (cl1px > 0) & ~joints, endsByNeighbors, maxBranchLengthToRemove, scale
+    )
+    cl1Cleaned = np.where(branchMask, 0, cl1px).astype(np.uint8)
+    cl1Cleaned -= ExtractEndpoints(cl1Cleaned)
+
+    if rmCorners:
+        cl1Cleaned -= ExtractCorners(cl1Cleaned)
+
+    return cl1Cleaned
+
+
+def CalculateCenterline(
+    riverMask: "np.ndarray",
+    scale: float,
+    neighborhoodSize: int = 256,
+    hGrad: float = 0.9,
+    maxBranchLengthToRemove: float = 300,
+) -> Dict[str, "np.ndarray"]:
+    """Calculate the distance map, gradient map and raw and cleaned centerlines of a river mask.
+
+    Args:
+        riverMask : 2D binary (0/1) river mask.
+        scale : Pixel size in meters.
+        neighborhoodSize : Maximum distance (in pixels) of the distance map.
+        hGrad : Gradient threshold of the centerline.
+        maxBranchLengthToRemove : Maximum length (in meters) of the removed branches.
+
+    Returns:
+        Dictionary with the 'distanceMap', 'gradientMap', 'rawCL' and 'cleanedCL' arrays.
+    """
+    riverMask = (np.asarray(riverMask) > 0).astype(np.uint8)
+    distM = CalcDistanceMap(riverMask, neighborhoodSize, scale)
+    gradM = CalcGradientMap(distM, scale)
+    cl1 = CalcOnePixelWidthCenterline(riverMask, gradM, hGrad)
+    cl1Cleaned1 = CleanCenterline(cl1, maxBranchLengthToRemove, True, scale)
+    cl1px = CleanCenterline(cl1Cleaned1, maxBranchLengthToRemove, False, scale)
+
+    return {
+        "distanceMap": distM,
+        "gradientMap": gradM,
+        "rawCL": cl1,
+        "cleanedCL": cl1px,
+    }
+
+
+def CalculateAngle(clCleaned: "np.ndarray") -> "np.ndarray":
+    """Orthogonal direction (in degrees) of each pixel of the centerline.
+
+    Args:
+        clCleaned : Binary (0/1) cleaned centerline.
+
+    Returns:
+        Orthogonal direction (NaN outside the centerline or where it is undefined).
+    """
+    weights = np.array(ANGLE_WEIGHTS)
+    padded = np.pad(clCleaned.astype(float), 4)
+    rows, cols = clCleaned.shape
+    total = np.zeros(clCleaned.shape)
+    count = np.zeros(clCleaned.shape)
+
+    for r, c in zip(*np.nonzero(weights)):
+        window = padded[r : r + rows, c : c + cols]
+        total += weights[r, c] * window
+        count += window
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        angle = total / count
+    angle = np.where(count == 1, angle + 90, angle)
+
+    return np.where((clCleaned > 0) & (count >= 1) & (count <= 2), angle, np.nan)
+
+
+def GetWidth(
+    clAngleNorm: "np.ndarray",
+    channelMask: "np.ndarray",
+    riverMask: "np.ndarray",
+    DM: "np.ndarray",
+    scale: float,
+    origin: Tuple[float, float] = (0.0, 0.0),
+    offset: Tuple[int, int] = (0, 0),
+    shape: Optional[Tuple[int, int]] = None,
+    endBuffer: float = 30.0,
+) -> Dict[str, "np.ndarray"]:
+    """Width of the river at each centerline pixel, measured along the orthogonal direction.
+
+    The cross-section of each centerline pixel is 1.5 times the distance to the banks on
+    each side, and the width is its length times the fraction of it that is channel.
+
+    Args:
+        clAngleNorm : Orthogonal direction (in degrees) of the centerline pixels.
+        channelMask : 2D binary (0/1) channel mask.
+        riverMask : 2D binary (0/1) river mask.
+        DM : Distance map in meters.
+        scale : Pixel size in meters.
+        origin : Coordinates (x, y) of the upper left corner of the whole mask.
+        offset : Position (row, col) of these arrays in the whole mask.
+        shape : Shape of the whole mask. Defaults to the shape of these arrays.
+        endBuffer : Radius (in meters) around the cross-section ends to look for water.
+
+    Returns:
+        Dictionary of 1D arrays, one per column in WIDTH_COLUMNS.
+    """
+    ndimage = _check_scipy()
+    rows, cols = np.nonzero(~np.isnan(clAngleNorm) & ~np.isnan(DM))
+    shape = clAngleNorm.shape if shape is None else shape
+
+    orthRad = np.deg2rad(clAngleNorm[rows, cols])
+    toBankDistance = DM[rows, cols]
+    halfLength = toBankDistance * 1.5 / scale  # in pixels
+    drow = -halfLength * np.sin(orthRad)
+    dcol = halfLength * np.cos(orthRad)
+
+    # fraction of each cross-section that is channel (sampled about every pixel)
+    nSamples = np.ceil(2 * halfLength).astype(int) + 2
+    j = np.arange(nSamples.max() if len(rows) else 2)
+    t = -1 + 2 * j[None, :] / (nSamples[:, None] - 1)
+    sampleRows = np.rint(rows[:, None] + t * drow[:, None]).astype(int)
+    sampleCols = np.rint(cols[:, None] + t * dcol[:, None]).astype(int)
+    inside = (
+        (j[None, :] < nSamples[:, None])
+        & (sampleRows >= 0)
+        & (sampleRows < channelMask.shape[0])
+        & (sampleCols >= 0)
+        & (sampleCols < channelMask.shape[1])
+    )
+    values = channelMask[
+        np.clip(sampleRows, 0, channelMask.shape[0] - 1),
+        np.clip(sampleCols, 0, channelMask.shape[1] - 1),
+    ]
+    channelFraction = (values * inside).sum(axis=1) / np.maximum(inside.sum(axis=1), 1)
+
+    # water and mask edge flags at the cross-section ends
+    radius = endBuffer / scale
+    r = int(np.floor(radius))
+    disk = np.hypot(*np.mgrid[-r : r + 1, -r : r + 1]) <= radius
+    nearWater = ndimage.binary_dilation(riverMask > 0, disk)
+
+    endsInWater = np.zeros(len(rows), bool)
+    endsOverEdge = np.zeros(len(rows), bool)
+    for sign in (-1, 1):
+        endRows = np.rint(rows + sign * drow).astype(int)
+        endCols = np.rint(cols + sign * dcol).astype(int)
+        globalRows = endRows + offset[0]
+        globalCols = endCols + offset[1]
+        endsOverEdge |= (
+            (globalRows < 0)
+            | (globalRows >= shape[0])
+            | (globalCols < 0)
+            | (globalCols >= shape[1])
+        )
+        local = (
+            (endRows >= 0)
+            & (endRows < nearWater.shape[0])
+            & (endCols >= 0)
+            & (endCols < nearWater.shape[1])
+        )
+        endsInWater[local] |= nearWater[endRows[local], endCols[local]]
+
+    globalRows = rows + offset[0]
+    globalCols = cols + offset[1]
+
+    return {
+        "row": globalRows,
+        "col": globalCols,
+        "x": origin[0] + (globalCols + 0.5) * scale,
+        "y": origin[1] - (globalRows + 0.5) * scale,
+        "orthogonalDirection": orthRad,
+        "toBankDistance": toBankDistance,
+        "width": 2 * halfLength * scale * channelFraction,
+        "endsInWater": endsInWater,
+        "endsOverEdge": endsOverEdge,
+    }
+
+
+def _tiles(
+    shape: Tuple[int, int], tileSize: int, halo: int
+) -> Iterator[Tuple[Tuple[slice, slice], Tuple[slice, slice]]]:
+    """Yields the (window, core) slices of the tiles of an array.
+
+    The window is the core expanded by the halo (clipped to the array), and the core
+    slices are relative to the window.
+    """
+    for r0 in range(0, shape[0], tileSize):
+        for c0 in range(0, shape[1], tileSize):
+            r1, c1 = min(r0 + tileSize, shape[0]), min(c0 + tileSize, shape[1])
+            wr0, wc0 = max(r0 - halo, 0), max(c0 - halo, 0)
+            wr1, wc1 = min(r1 + halo, shape[0]), min(c1 + halo, shape[1])
+            yield (
+                (slice(wr0, wr1), slice(wc0, wc1)),
+                (slice(r0 - wr0, r1 - wr0), slice(c0 - wc0, c1 - wc0)),
+            )
+
+
+def riverWidths(
+    riverMask: "np.ndarray",
+    channelMask: Optional["np.ndarray"] = None,
+    scale: float = 30.0,
+    origin: Tuple[float, float] = (0.0, 0.0),
+    tileSize: int = 1024,
+    halo: int = 256,
+    neighborhoodSize: int = 256,
+    hGrad: float = 0.9,
+    maxBranchLengthToRemove: float = 300,
+    processes: Optional[int] = 1,
+) -> Dict[str, "np.ndarray"]:
+    """Calculate river centerlines and widths of a local river mask.
+
+    This is the local counterpart of rwGenSR (from the river mask on). The mask is
+    processed in tiles of tileSize x tileSize pixels, each one expanded by a halo of
+    overlapping pixels, so memory stays bounded. Only the centerline pixels in the core
+    of each tile are kept, so each width is reported once. The halo must be larger
+    than the cross-section half length (1.5 times the distance to the banks, in pixels)
+    of the widest river for the tiled results to match the untiled ones; a warning is
+    raised otherwise.
+
+    The masks are never copied as a whole: only the window of each tile is read (and
+    binarized). Masks larger than memory can be passed as an np.memmap or any other
+    object with a shape that returns arrays when sliced (e.g. an h5py or zarr
+    dataset). With processes > 1 (or None, for all the CPUs), the tiles are processed
+    on a process pool: workers read their window of a file-backed np.memmap
+    themselves, and the windows of other masks are read here and sent to them, a few
+    tiles at a time.
+
+    Args:
+        riverMask : 2D river mask (e.g. a channel mask with islands filled). Nonzero
+            pixels are river.
+        channelMask : 2D channel mask used to compute the widths. Nonzero pixels are
+            water. Defaults to riverMask.
+        scale : Pixel size in meters.
+        origin : Coordinates (x, y) of the upper left corner of the mask.
+        tileSize : Size (in pixels) of the core of each tile.
+        halo : Size (in pixels) of the overlap around each tile.
+        neighborhoodSize : Maximum distance (in pixels) of the distance map.
+        hGrad : Gradient threshold of the centerline.
+        maxBranchLengthToRemove : Maximum length (in meters) of the removed branches.
+        processes : Number of worker processes. Defaults to 1 (no process pool).
+
+    Returns:
+        Dictionary of 1D arrays, one per column in WIDTH_COLUMNS, sorted by row and col.
+
+    Examples:
+        >>> import numpy as np
+        >>> from ee_extra.Algorithms.riverLocal import riverWidths
+        >>> mask = np.zeros((200, 400), np.uint8)
+        >>> mask[80:120, :] = 1
+        >>> widths = riverWidths(mask, scale=30)
+        >>> widths["width"]  # about 40 pixels * 30 m
+    """
+    channelMask = riverMask if channelMask is None else channelMask
+    shape = tuple(riverMask.shape)
+    if tuple(channelMask.shape) != shape:
+        raise ValueError(
+            f"The masks have different shapes: {shape} and {tuple(channelMask.shape)}"
+        )
+
+    params = (
+        shape,
+        scale,
+        origin,
+        neighborhoodSize,
+        hGrad,
+        maxBranchLengthToRemove,
+    )
+    tiles = _tiles(shape, tileSize, halo)
+
+    if processes == 1:
+        results = [
+            _tileWidths(
+                _readWindow(riverMask, window),
+                _readWindow(channelMask, window),
+                window,
+                core,
+                *params,
+            )
+            for window, core in tiles
+        ]
+    else:
+        results = _parallelTileWidths(riverMask, channelMask, tiles, params, processes)
+
+    truncated = sum(n for _, n in results)
+    if truncated:
+        warnings.warn(
+            f"{truncated} river pixels are too far from the bank for the tile halo; "
+            "their widths may be underestimated or missing. Use a larger halo."
+        )
+
+    return _concatenateWidths([widths for widths, _ in results])
+
+
+def _readWindow(mask: Any, window: Tuple[slice, slice]) -> "np.ndarray":
+    """Reads a window of a mask as a binary (0/1) uint8 array."""
+    return (np.asarray(mask[window]) > 0).astype(np.uint8)
+
+
+class _MemmapReader:
+    """Picklable reference to a file-backed np.memmap.
+
+    Workers open the file themselves and read only their window, so the data of the
+    mask is never copied to them.
+    """
+
+    def __init__(self, mask: "np.memmap") -> None:
+        self.filename = mask.filename
+        self.dtype = mask.dtype
+        self.shape = mask.shape
+        self.offset = mask.offset
+        self.order = "C" if mask.flags.c_contiguous else "F"
+
+    def __getitem__(self, window: Tuple[slice, slice]) -> "np.ndarray":
+        mask = np.memmap(
+            self.filename, self.dtype, "r", self.offset, self.shape, self.order
+        )
+        return np.array(mask[window])
+
+
+def _tileInput(mask: Any, window: Tuple[slice, slice]) -> Any:
+    """What a worker gets to read the window of a mask.
+
+    A memmap opened from a file (not a view of one) is passed by reference. Any other
+    mask is read here, window by window.
+    """
+    if (
+        isinstance(mask, np.memmap)
+        and isinstance(mask.base, mmap.mmap)
+        and mask.filename is not None
+    ):
+        return _MemmapReader(mask)
+    return _readWindow(mask, window)
+
+
+def _parallelTileWidths(
+    riverMask: Any,
+    channelMask: Any,
+    tiles: Iterator[Tuple[Tuple[slice, slice], Tuple[slice, slice]]],
+    params: Tuple[Any, ...],
+    processes: Optional[int],
+) -> List[Tuple[Dict[str, "np.ndarray"], int]]:
+    """Runs _tileWidths on a process pool.
+
+    At most two tiles per worker are queued at a time, so only their windows are held
+    in memory besides the masks themselves.
+    """
+    workers = processes or os.cpu_count() or 1
+    results = []
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = collections.deque()
+        for window, core in tiles:
+            if len(futures) >= 2 * workers:
+                results.append(futures.popleft().result())
+            river = _tileInput(riverMask, window)
+            channel = (
+                None if channelMask is riverMask else _tileInput(channelMask, window)
+            )
+            futures.append(
+                executor.submit(_tileWorker, river, channel, window, core, params)
+            )
+        results.extend(future.result() for future in futures)
+    return results
+
+
+def _tileWorker(
+    river: Any,
+    channel: Any,
+    window: Tuple[slice, slice],
+    core: Tuple[slice, slice],
+    params: Tuple[Any, ...],
+) -> Tuple[Dict[str, "np.ndarray"], int]:
+    """Reads the window of a tile (if it was not read yet) and runs _tileWidths on it.
+
+    A channel of None means that the channel mask is the river mask.
+    """
+    if isinstance(river, _MemmapReader):
+        river = _readWindow(river, window)
+    if isinstance(channel, _MemmapReader):
+        channel = _readWindow(channel, window)
+    channel = river if channel is None else channel
+    return _tileWidths(river, channel, window, core, *params)
+
+
+def _tileWidths(
+    riverMask: "np.ndarray",
+    channelMask: "np.ndarray",
+    window: Tuple[slice, slice],
+    core: Tuple[slice, slice],
+    shape: Tuple[int, int],
+    scale: float,
+    origin: Tuple[float, float],
+    neighborhoodSize: int,
+    hGrad: float,
+    maxBranchLengthToRemove: float,
+) -> Tuple[Dict[str, "np.ndarray"], int]:
+    """Widths of the centerline pixels in the core of one tile.
+
+    Returns:
+        The widths and the number of river pixels in the core whose cross-sections
+        would extend beyond the window (but not beyond the whole mask).
+    """
+    centerline = CalculateCenterline(
+        riverMask, scale, neighborhoodSize, hGrad, maxBranchLengthToRemove
+    )
+    cleanedCL = np.zeros_like(centerline["cleanedCL"])
+    cleanedCL[core] = centerline["cleanedCL"][core]
+
+    # the angle needs the centerline around the core too
+    angle = CalculateAngle(centerline["cleanedCL"])
+    angle = np.where(cleanedCL > 0, angle, np.nan)
+
+    widths = GetWidth(
+        angle,
+        channelMask,
+        riverMask,
+        centerline["distanceMap"],
+        scale,
+        origin,
+        (window[0].start, window[1].start),
+        shape,
+    )
+
+    # a core pixel needs the mask within 1.5 times its distance to the bank, which
+    # is missing where the window stops inside the mask
+    rows, cols = np.ogrid[window[0], window[1]]
+    inf = np.inf
+    toEdge = np.minimum(
+        np.minimum(
+            np.where(window[0].start > 0, rows - window[0].start, inf),
+            np.where(window[0].stop < shape[0], window[0].stop - 1 - rows, inf),
+        ),
+        np.minimum(
+            np.where(window[1].start > 0, cols - window[1].start, inf),
+            np.where(window[1].stop < shape[1], window[1].stop - 1 - cols, inf),
+        ),
+    )
+    needed = centerline["distanceMap"] * 1.5 / scale
+    truncated = np.zeros(riverMask.shape, bool)
+    truncated[core] = ((riverMask > 0) & (needed > toEdge))[core]
+
+    return widths, int(truncated.sum())
+
+
+def _concatenateWidths(
+    results: Sequence[Dict[str, "np.ndarray"]],
+) -> Dict[str, "np.ndarray"]:
+    """Concatenates the widths of several tiles, sorted by row and col."""
+    widths = {
+        column: np.concatenate([result[column] for result in results])
+        for column in WIDTH_COLUMNS
+    }
+    order = np.lexsort((widths["col"], widths["row"]))
+    return {column: values[order] for column, values in widths.items()}
@@ -0,0 +1,223 @@
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Mapping, Optional
+
+import ee
+
+TERMINAL_STATES = ["COMPLETED", "FAILED", "CANCELLED"]
+
+ACTIVE_STATES = ["READY", "RUNNING"]
+
+
+def count_active_tasks() -> int:
+    """Number of tasks of the project that are waiting or running."""
+    return sum(task.state in ACTIVE_STATES for task in ee.batch.Task.list())
+
+
+class EETaskBackend:
+    """Submits and tracks Earth Engine batch tasks.
+
+    Any object with the same ``submit`` and ``states`` methods can be used as a
+    backend of a TaskScheduler (e.g. a fake backend for testing).
+    """
+
+    def submit(self, make_task: Callable[[], Any]) -> str:
+        """Creates and starts a task.
+
+        Args:
+            make_task : Function without arguments that returns an unstarted ee.batch.Task.
+
+        Returns:
+            ID of the started task.
+        """
+        task = make_task()
+        task.start()
+        return task.id
+
+    def states(self, ids: List[str]) -> Dict[str, str]:
+        """Gets the states of several tasks with ee.data.getTaskStatus.
+
+        Only the given tasks are requested (one request per task), instead of
+        listing every operation of the project.
+
+        Args:
+            ids : IDs of the tasks.
+
+        Returns:
+            Dictionary with the state of each task. Tasks that are not found (e.g.
+            tasks that were just submitted) are "UNKNOWN".
+        """
+        states = dict.fromkeys(ids, "UNKNOWN")
+        if ids:
+            for status in ee.data.getTaskStatus(ids):
+                states[status["id"]] = status["state"]
+        return states
+
+
+class TaskScheduler:
+    """Runs batch tasks keeping a maximum number of them in flight.
+
+    Tasks are created and submitted from a thread pool and the states of all the
+    tasks in flight are fetched together in each poll. Polls are spaced with exponential backoff
+    while no task changes its state. If a checkpoint file is given, the ID and state of
+    each job is saved after every change, and a new scheduler with the same checkpoint
+    resumes the work: completed jobs are skipped and submitted jobs are polled again
+    instead of being resubmitted.
+
+    Args:
+        backend : Task backend. Defaults to EETaskBackend().
+        max_active : Maximum number of tasks in flight (submitted and not finished).
+        max_workers : Number of threads used to create and submit tasks.
+        checkpoint : Path to a JSON file to save and resume the state of the jobs.
+        poll_interval : Initial time (in seconds) between polls.
+        max_poll_interval : Maximum time (in seconds) between polls.
+        backoff : Factor applied to the time between polls when no task changes.
+        retry_failed : Whether to resubmit jobs that failed (including jobs whose
+            submission failed) or were cancelled in a previous run.
+        max_unknown_polls : Number of consecutive polls in which the backend may not
+            know a task (e.g. a task that was just submitted and is not listed yet)
+            before its job is marked as FAILED.
+        sleep : Function used to wait between polls.
+
+    Examples:
+        >>> from ee_extra.Algorithms.tasks import TaskScheduler
+        >>> scheduler = TaskScheduler(max_active=5, checkpoint="tasks.json")
+        >>> scheduler.run({"scene_1": make_task_1, "scene_2": make_task_2})
+        {'scene_1': 'COMPLETED', 'scene_2': 'COMPLETED'}
+    """
+
+    def __init__(
+        self,
+        backend: Optional[Any] = None,
+        max_active: int = 10,
+        max_workers: int = 4,
+        checkpoint: Optional[str] = None,
+        poll_interval: float = 10,
+        max_poll_interval: float = 300,
+        backoff: float = 2,
+        retry_failed: bool = False,
+        max_unknown_polls: int = 10,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        if max_active < 1:
+            raise ValueError(f"max_active must be positive. Value passed: {max_active}")
+
+        self.backend = EETaskBackend() if backend is None else backend
+        self.max_active = max_active
+        self.max_workers = max_workers
+        self.checkpoint = checkpoint
+        self.poll_interval = poll_interval
+        self.max_poll_interval = max_poll_interval
+        self.backoff = backoff
+        self.retry_failed = retry_failed
+        self.max_unknown_polls = max_unknown_polls
+        self.sleep = sleep
+        self.jobs: Dict[str, Dict[str, Optional[str]]] = self._load_checkpoint()
+
+    def _load_checkpoint(self) -> Dict[str, Dict[str, Optional[str]]]:
+        """Loads the state of the jobs from the checkpoint file (if any)."""
+        if self.checkpoint is None or not os.path.exists(self.checkpoint):
+            return {}
+        with open(self.checkpoint, "r", encoding="utf-8") as f:
+            return json.load(f)
+
+    def _save_checkpoint(self) -> None:
+        """Atomically saves the state of the jobs to the checkpoint file (if any)."""
+        if self.checkpoint is None:
+            return
+        tmp = self.checkpoint + ".tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self.jobs, f, indent=2)
+        os.replace(tmp, self.checkpoint)
+
+    def _submit(
+        self, key: str, make_task: Callable[[], Any]
+    ) -> Dict[str, Optional[str]]:
+        """Submits a job and returns its record."""
+        try:
+            return {
+                "id": self.backend.submit(make_task),
+                "state": "READY",
+                "error": None,
+            }
+        except Exception as e:
+            return {"id": None, "state": "FAILED", "error": str(e)}
+
+    def run(self, jobs: Mapping[str, Callable[[], Any]]) -> Dict[str, str]:
+        """Runs the jobs until all of them reach a terminal state.
+
+        Args:
+            jobs : Ordered mapping of job keys (e.g. scene IDs) to functions without
+                arguments that return an unstarted task.
+
+        Returns:
+            Dictionary with the final state of each job.
+        """
+        pending = []
+        for key in jobs:
+            record = self.jobs.get(key)
+            if record is None:
+                pending.append(key)
+            elif record["state"] in ["FAILED", "CANCELLED"] and self.retry_failed:
+                pending.append(key)
+
+        active = [
+            key
+            for key in jobs
+            if key in self.jobs
+            and key not in pending
+            and self.jobs[key]["state"] not in TERMINAL_STATES
+        ]
+        # consecutive polls in which each active job was unknown to the backend
+        misses = dict.fromkeys(active, 0)
+        interval = self.poll_interval
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            while pending or active:
+                # a resumed checkpoint can have more active jobs than max_active
+                slots = max(0, self.max_active - len(active))
+                batch, pending = pending[:slots], pending[slots:]
+                records = executor.map(lambda key: self._submit(key, jobs[key]), batch)
+
+                for key, record in zip(batch, records):
+                    self.jobs[key] = record
+                    if record["state"] not in TERMINAL_STATES:
+                        active.append(key)
+                        misses[key] = 0
+
+                if batch:
+                    self._save_checkpoint()
+
+                if not active:
+                    continue
+
+                self.sleep(interval)
+                states = self.backend.states([self.jobs[key]["id"] for key in active])
+
+                changed = False
+                for key in list(active):
+                    state = states.get(self.jobs[key]["id"], "UNKNOWN")
+                    if state == "UNKNOWN":
+                        misses[key] += 1
+                        if misses[key] < self.max_unknown_polls:
+                            continue
+                        state = "FAILED"
+                        error = f"Task not found after {misses[key]} polls."
+                        self.jobs[key]["error"] = error
+                    else:
+                        misses[key] = 0
+                    if state != self.jobs[key]["state"]:
+                        self.jobs[key]["state"] = state
+                        changed = True
+                    if state in TERMINAL_STATES:
+                        active.remove(key)
+
+                if changed:
+                    self._save_checkpoint()
+                    interval = self.poll_interval
+                else:
+                    interval = min(interval * self.backoff, self.max_poll_interval)
+
+        return {key: self.jobs[key]["state"] for key in jobs}
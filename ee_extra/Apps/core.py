@@ -6,7 +6,8 @@ from typing import Any, List, Optional, Union
 
 import ee
 
-from ee_extra.Apps.utils import _get_apps
+from ee_extra.Apps.utils import _get_apps, _get_apps_index
+
 
 def apps(online: bool = False) -> dict:
     """Gets the dictionary of available Google Earth Engine Apps.
@@ -25,4 +26,45 @@ def apps(online: bool = False) -> dict:
         >>> Apps["jstnbraaten"][0]
         "https://jstnbraaten.users.earthengine.app/view/conus-cover-vis"
     """
-    return _get_apps(online)
\ No newline at end of file
+    return _get_apps(online)
+
+
+def searchApps(query: str, mode: str = "prefix") -> List[str]:
+    """Searches the local copy of the Google Earth Engine Apps by keyword.
+
+    The apps are searched by author name and by the words of their URL slug
+    (e.g. "conus", "cover" and "vis" for ".../view/conus-cover-vis"). The search
+    index is built once and reused by later searches. Queries with several words
+    return the apps that match all of them.
+
+    Args:
+        query : Keywords to search (case-insensitive).
+        mode : How keywords are matched. One of 'exact', 'prefix' (keywords are
+            prefixes of the app tokens) or 'fuzzy' (keywords are close matches of
+            the app tokens, e.g. misspellings).
+
+    Returns:
+        Sorted list of URLs of the matching apps.
+
+    Examples:
+        >>> import ee
+        >>> from ee_extra.Apps.core import searchApps
+        >>> ee.Initialize()
+        >>> searchApps("conus cov")
+        ['https://jstnbraaten.users.earthengine.app/view/conus-cover-vis', ...]
+    """
+    index = _get_apps_index()
+    lookup = {"exact": index.exact, "prefix": index.prefix, "fuzzy": index.fuzzy}
+
+    if mode not in lookup:
+        raise ValueError(
+            f"mode must be one of {list(lookup.keys())}. Value passed: {mode}"
+        )
+
+    urls = None
+    for token in re.split(r"[^0-9a-z]+", query.lower()):
+        if token:
+            matches = lookup[mode](token)
+            urls = matches if urls is None else urls & matches
+
+    return sorted(urls or [])
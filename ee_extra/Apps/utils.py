@@ -1,13 +1,16 @@
+import bisect
+import functools
 import json
 import os
 import re
 import urllib.request
 import warnings
-from typing import Optional, Union
+from collections import defaultdict
+from typing import Dict, List, Optional, Set, Union
 
 import ee
 
-from ee_extra.utils import _load_JSON
+from ee_extra.utils import _load_JSON, _TrigramMatcher
 
 
 def _get_apps(online: bool) -> dict:
@@ -24,4 +27,77 @@ def _get_apps(online: bool) -> dict:
     else:
         apps = _load_JSON("ee-appshot.json")
 
-    return apps
\ No newline at end of file
+    return apps
+
+
+def _get_app_tokens(author: str, url: str) -> Set[str]:
+    """Gets the (lowercase) search tokens of an app.
+
+    The tokens are the author name, the URL slug and each alphanumeric
+    piece of the slug (e.g. "conus-cover-vis", "conus", "cover" and "vis").
+
+    Args:
+        author : Author of the app.
+        url : URL of the app.
+
+    Returns:
+        Tokens of the app.
+    """
+    slug = url.rstrip("/").split("/")[-1].lower()
+    tokens = {author.lower(), slug}
+    tokens.update(token for token in re.split(r"[^0-9a-z]+", slug) if token)
+
+    return tokens
+
+
+class _AppsIndex:
+    """An inverted index over the author names and URL slug tokens of the apps.
+
+    Args:
+        apps : Dictionary of apps (author names as keys and lists of URLs as values).
+    """
+
+    def __init__(self, apps: dict) -> None:
+        self.index: Dict[str, List[str]] = defaultdict(list)
+
+        for author, urls in apps.items():
+            for url in urls:
+                for token in _get_app_tokens(author, url):
+                    self.index[token].append(url)
+
+        self.tokens = sorted(self.index.keys())
+        self.matcher = _TrigramMatcher(self.tokens)
+
+    def exact(self, token: str) -> Set[str]:
+        """Gets the URLs of the apps with a token."""
+        return set(self.index.get(token, []))
+
+    def prefix(self, token: str) -> Set[str]:
+        """Gets the URLs of the apps with a token that starts with the given prefix."""
+        urls = set()
+        i = bisect.bisect_left(self.tokens, token)
+
+        while i < len(self.tokens) and self.tokens[i].startswith(token):
+            urls.update(self.index[self.tokens[i]])
+            i += 1
+
+        return urls
+
+    def fuzzy(self, token: str, n: int = 3, cutoff: float = 0.6) -> Set[str]:
+        """Gets the URLs of the apps with a token that closely matches the given one."""
+        urls = set()
+
+        for match in self.matcher.get_close_matches(token, n, cutoff):
+            urls.update(self.index[match])
+
+        return urls
+
+
+@functools.lru_cache(maxsize=None)
+def _get_apps_index() -> _AppsIndex:
+    """Builds (once) the search index over the local copy of the apps.
+
+    Returns:
+        Search index of the apps.
+    """
+    return _AppsIndex(_load_JSON("ee-appshot.json"))
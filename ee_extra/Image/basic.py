@@ -33,11 +33,313 @@ VI. Accessing values of ee.Image object cells
 - maxValue: Get the maximum value of the cells of an ee.Image object.
 """
 
-from typing import Optional
+from typing import Any, List, Optional, Union
 
 import ee
 
 
+def _get_footprint(x: ee.Image) -> ee.Geometry:
+    """Gets a clean (i.e. geodesic = FALSE) footprint of an ee.Image.
+
+    The footprint is built server-side from the image geometry, so no
+    client-side request is needed.
+
+    Args:
+        x: An ee.Image.
+
+    Returns:
+        The planar footprint of x.
+    """
+    return ee.Geometry.Polygon(
+        coords=x.geometry().coordinates(),
+        proj="EPSG:4326",
+        evenOdd=True,
+        maxError=1.0,
+        geodesic=False,
+    )
+
+
+def _reduce_image(
+    x: ee.Image,
+    reducer: ee.Reducer,
+    scale: Optional[float] = None,
+    geometry: Optional[ee.Geometry] = None,
+) -> ee.Dictionary:
+    """Reduces the values of an ee.Image over a region.
+
+    Args:
+        x: An ee.Image.
+        reducer: The reducer to apply.
+        scale: A nominal scale in meters of the projection to work in.
+            Defaults image x$geometry()$projection()$nominalScale().
+        geometry: The region over which to reduce data. Defaults to
+            the footprint of x.
+
+    Returns:
+        A server-side dictionary with the reduced values.
+    """
+    if scale is None:
+        scale = x.geometry().projection().nominalScale()
+
+    if geometry is None:
+        geometry = _get_footprint(x)
+
+    return x.reduceRegion(
+        reducer=reducer,
+        geometry=geometry,
+        scale=scale,
+        bestEffort=True,
+    )
+
+
+def unstack(x: ee.ImageCollection) -> List[ee.Image]:
+    """Create a list of ee.Image from a ee.ImageCollection.
+
+    Only the size of the collection is requested, the images are
+    picked server-side from a single ee.List.
+
+    Args:
+        x: An ee.ImageCollection.
+
+    Returns:
+        A list with the images of x.
+
+    Examples:
+        >>> import ee
+        >>> import ee_extra
+        >>> ee.Initialize()
+        >>> ic = ee.ImageCollection([ee.Image(1), ee.Image(2)])
+        >>> unstack(ic)
+    """
+    size = x.size().getInfo()
+    images = x.toList(size)
+
+    return [ee.Image(images.get(i)) for i in range(size)]
+
+
+def _get_center(x: ee.Image) -> List[ee.Number]:
+    """Gets the center of the bounding box of an ee.Image (in EPSG:4326).
+
+    Args:
+        x: An ee.Image.
+
+    Returns:
+        A list with the longitude and latitude of the center.
+    """
+    coords = ee.List(x.geometry().bounds(maxError=1.0).coordinates().get(0))
+    lower_left = ee.List(coords.get(0))
+    upper_right = ee.List(coords.get(2))
+
+    return [
+        ee.Number(lower_left.get(0)).add(upper_right.get(0)).divide(2),
+        ee.Number(lower_left.get(1)).add(upper_right.get(1)).divide(2),
+    ]
+
+
+def _change_geotransform(x: ee.Image, transform: List[Any]) -> ee.Image:
+    """Moves the pixels of an ee.Image with an affine transform (in EPSG:4326).
+
+    Args:
+        x: An ee.Image.
+        transform: Row-major ordering of the 3x2 affine transform matrix.
+
+    Returns:
+        The ee.Image with its pixels moved.
+    """
+    return x.changeProj(
+        ee.Projection("EPSG:4326"), ee.Projection("EPSG:4326", transform)
+    )
+
+
+def flip(x: ee.Image, direction: str = "y") -> ee.Image:
+    """Flip values horizontally or vertically.
+
+    The image is mirrored around the center of its bounding box with
+    a single ee.Image.changeProj call.
+
+    Args:
+        x: An ee.Image.
+        direction: Direction of the flip. 'y' flips the values vertically
+            (upside down) and 'x' flips them horizontally.
+
+    Returns:
+        The flipped ee.Image.
+
+    Examples:
+        >>> import ee
+        >>> import ee_extra
+        >>> ee.Initialize()
+        >>> img = ee.Image("LANDSAT/LC08/C01/T1_TOA/LC08_047027_20160819")
+        >>> flip(img, "x")
+    """
+    cx, cy = _get_center(x)
+
+    if direction == "y":
+        transform = [1, 0, 0, 0, -1, cy.multiply(2)]
+    elif direction == "x":
+        transform = [-1, 0, cx.multiply(2), 0, 1, 0]
+    else:
+        raise ValueError(f"direction must be 'x' or 'y'. Value passed: {direction}")
+
+    return _change_geotransform(x, transform)
+
+
+def rotate(x: ee.Image) -> ee.Image:
+    """Rotate values around the date-line (for lon/lat data).
+
+    Images with longitudes between 0 and 360 degrees are rotated to
+    longitudes between -180 and 180 degrees: the image is mosaicked with
+    a copy of itself moved 360 degrees west and clipped back to the
+    -180..180 extent.
+
+    Args:
+        x: An ee.Image with longitudes between 0 and 360 degrees.
+
+    Returns:
+        The rotated ee.Image.
+
+    Examples:
+        >>> import ee
+        >>> import ee_extra
+        >>> ee.Initialize()
+        >>> img = ee.Image.loadGeoTIFF("gs://bucket/global_0_360.tif")
+        >>> rotate(img)
+    """
+    west = _change_geotransform(x, [1, 0, -360, 0, 1, 0])
+    extent = ee.Geometry.Rectangle([-180, -90, 180, 90], "EPSG:4326", False)
+
+    return ee.ImageCollection([x, west]).mosaic().clip(extent)
+
+
+def transpose(x: ee.Image) -> ee.Image:
+    """Transpose an ee.Image object.
+
+    Longitudes and latitudes are swapped with a single
+    ee.Image.changeProj call.
+
+    Args:
+        x: An ee.Image.
+
+    Returns:
+        The transposed ee.Image.
+
+    Examples:
+        >>> import ee
+        >>> import ee_extra
+        >>> ee.Initialize()
+        >>> img = ee.Image("LANDSAT/LC08/C01/T1_TOA/LC08_047027_20160819")
+        >>> transpose(img)
+    """
+    return _change_geotransform(x, [0, 1, 0, 1, 0, 0])
+
+
+def reclassify(
+    x: ee.Image, rcl: List[List[Union[int, float]]], right: bool = True
+) -> ee.Image:
+    """Reclassify using a 'from-to-becomes' matrix.
+
+    Values are reclassified with a constant number of server-side
+    operations regardless of the number of classes: ee.Image.remap
+    for 'is-becomes' matrices and one multi-band comparison for
+    'from-to-becomes' matrices. Values that are not covered by the
+    matrix are left unchanged.
+
+    Args:
+        x: A single-band ee.Image.
+        rcl: A list of [from, to, becomes] rows (intervals) or a list of
+            [is, becomes] rows (single values). Intervals must not overlap.
+        right: Whether the intervals are closed on the right (and open on
+            the left) or vice versa.
+
+    Returns:
+        The reclassified ee.Image.
+
+    Examples:
+        >>> import ee
+        >>> import ee_extra
+        >>> ee.Initialize()
+        >>> img = ee.Image.random()
+        >>> reclassify(img, [[0, 0.5, 1], [0.5, 1, 2]])
+    """
+    columns = set(len(row) for row in rcl)
+
+    if columns == {2}:
+        values, becomes = [list(column) for column in zip(*rcl)]
+        remapped = x.remap(values, becomes)
+        return x.where(remapped.mask(), remapped)
+
+    if columns != {3}:
+        raise ValueError(
+            "rcl must be a list of [from, to, becomes] or [is, becomes] rows."
+        )
+
+    lower, upper, becomes = [list(column) for column in zip(*rcl)]
+
+    if right:
+        inside = x.gt(ee.Image.constant(lower)).And(x.lte(ee.Image.constant(upper)))
+    else:
+        inside = x.gte(ee.Image.constant(lower)).And(x.lt(ee.Image.constant(upper)))
+
+    reclassified = inside.multiply(ee.Image.constant(becomes)).reduce(ee.Reducer.sum())
+
+    return x.where(inside.reduce(ee.Reducer.anyNonZero()), reclassified)
+
+
+def distanceFromPoints(
+    x: ee.Image,
+    points: Union[ee.Geometry, ee.FeatureCollection],
+    maxDistance: Union[int, float] = 100000,
+) -> ee.Image:
+    """Shortest distance to any point in a set of points.
+
+    Args:
+        x: An ee.Image that defines the output projection.
+        points: The points (or any geometries) to compute the distance to.
+        maxDistance: Maximum distance in meters to search for points.
+
+    Returns:
+        A single-band ee.Image ('distance') with the distance in meters.
+
+    Examples:
+        >>> import ee
+        >>> import ee_extra
+        >>> ee.Initialize()
+        >>> img = ee.Image("LANDSAT/LC08/C01/T1_TOA/LC08_047027_20160819")
+        >>> distanceFromPoints(img, ee.Geometry.Point([-122.3, 47.6]))
+    """
+    return (
+        ee.FeatureCollection(points)
+        .distance(searchRadius=maxDistance)
+        .rename("distance")
+        .setDefaultProjection(x.projection())
+    )
+
+
+def area(x: ee.Image) -> ee.Image:
+    """Compute area of cells (for longitude/latitude data).
+
+    Args:
+        x: An ee.Image that defines the output projection.
+
+    Returns:
+        A single-band ee.Image ('area') with the area of the cells in square
+        kilometers.
+
+    Examples:
+        >>> import ee
+        >>> import ee_extra
+        >>> ee.Initialize()
+        >>> img = ee.Image("LANDSAT/LC08/C01/T1_TOA/LC08_047027_20160819")
+        >>> area(img)
+    """
+    return (
+        ee.Image.pixelArea()
+        .divide(1e6)
+        .rename("area")
+        .setDefaultProjection(x.projection())
+    )
+
+
 def minvalue(x: ee.Image, scale: Optional[float] = None) -> float:
     """Get a minimum value.
 
@@ -59,30 +361,7 @@ def minvalue(x: ee.Image, scale: Optional[float] = None) -> float:
         >>> img = ee.Image.random()
         >>> minvalue(img)
     """
-
-    if scale is None:
-        scale = x.geometry().projection().nominalScale()
-
-    # Create a clean geometry i.e. geodesic = FALSE
-    img_geom_local = x.geometry().getInfo()["coordinates"]
-    ee_geom = ee.Geometry.Polygon(
-        coords=img_geom_local,
-        proj="EPSG:4326",
-        evenOdd=True,
-        maxError=1.0,
-        geodesic=False,
-    )
-
-    # get min values
-    minval = ee.Image.reduceRegion(
-        image=x,
-        reducer=ee.Reducer.min(),
-        scale=scale,
-        geometry=ee_geom,
-        bestEffort=True,
-    ).getInfo()
-
-    return minval
+    return _reduce_image(x, ee.Reducer.min(), scale).getInfo()
 
 
 def maxvalue(x: ee.Image, scale: Optional[float] = None) -> float:
@@ -108,27 +387,109 @@ def maxvalue(x: ee.Image, scale: Optional[float] = None) -> float:
         >>> img = ee.Image.random()
         >>> maxvalue(img)
     """
+    return _reduce_image(x, ee.Reducer.max(), scale).getInfo()
 
-    if scale is None:
-        scale = x.geometry().projection().nominalScale()
 
-    # Create a clean geometry i.e. geodesic = FALSE
-    img_geom_local = x.geometry().getInfo()["coordinates"]
-    ee_geom = ee.Geometry.Polygon(
-        coords=img_geom_local,
-        proj="EPSG:4326",
-        evenOdd=True,
-        maxError=1.0,
-        geodesic=False,
+_CELL_STATS = {
+    "sum": ee.Reducer.sum,
+    "mean": ee.Reducer.mean,
+    "min": ee.Reducer.min,
+    "max": ee.Reducer.max,
+    "sd": ee.Reducer.stdDev,
+    "skew": ee.Reducer.skew,
+    "median": ee.Reducer.median,
+    "count": ee.Reducer.count,
+}
+
+
+def cellStats(
+    x: ee.Image,
+    stat: str = "mean",
+    scale: Optional[float] = None,
+    geometry: Optional[ee.Geometry] = None,
+) -> dict:
+    """Summarize an ee.Image cell values with a function.
+
+    The return value will be an approximation if the region contains
+    too many pixels at the given scale.
+
+    Args:
+        x: An ee.Image.
+        stat: The statistic to compute. One of 'sum', 'mean', 'min', 'max',
+            'sd', 'skew', 'median' or 'count'.
+        scale: A nominal scale in meters of the projection to work in.
+            Defaults image x$geometry()$projection()$nominalScale().
+        geometry: The region over which to reduce data. Defaults to
+            the footprint of x.
+
+    Returns:
+        A dictionary with the statistic of each band.
+
+    Examples:
+        >>> import ee
+        >>> import ee_extra
+        >>> ee.Initialize()
+        >>> img = ee.Image.random()
+        >>> cellStats(img, "sd")
+    """
+    if stat not in _CELL_STATS:
+        raise ValueError(
+            f"stat {stat} is not supported. Use one of {list(_CELL_STATS.keys())}."
+        )
+
+    return _reduce_image(x, _CELL_STATS[stat](), scale, geometry).getInfo()
+
+
+_SUMMARY_STATS = ["min", "q1", "median", "q3", "max", "mean", "count"]
+
+
+def summary(
+    x: ee.Image,
+    scale: Optional[float] = None,
+    geometry: Optional[ee.Geometry] = None,
+) -> dict:
+    """Summary of the values of an ee.Image object.
+
+    Computes the minimum, quartiles, maximum, mean and count of the
+    cells of each band of an ee.Image. All the statistics are computed
+    with one combined reducer and retrieved in a single request. The
+    return values will be an approximation if the region contains too
+    many pixels at the given scale.
+
+    Args:
+        x: An ee.Image.
+        scale: A nominal scale in meters of the projection to work in.
+            Defaults image x$geometry()$projection()$nominalScale().
+        geometry: The region over which to reduce data. Defaults to
+            the footprint of x.
+
+    Returns:
+        A dictionary with one entry per band. Each entry is a dictionary
+        with the 'min', 'q1', 'median', 'q3', 'max', 'mean' and 'count'
+        values of the band.
+
+    Examples:
+        >>> import ee
+        >>> import ee_extra
+        >>> ee.Initialize()
+        >>> img = ee.Image.random()
+        >>> summary(img)
+        {'random': {'min': 0.0001, 'q1': 0.25, 'median': 0.5, ...}}
+    """
+    reducer = (
+        ee.Reducer.minMax()
+        .combine(ee.Reducer.percentile([25, 50, 75], ["q1", "median", "q3"]), "", True)
+        .combine(ee.Reducer.mean(), "", True)
+        .combine(ee.Reducer.count(), "", True)
     )
+    stats = _reduce_image(x, reducer, scale, geometry).getInfo()
 
-    # get max values
-    maxval = ee.Image.reduceRegion(
-        image=x,
-        reducer=ee.Reducer.max(),
-        scale=scale,
-        geometry=ee_geom,
-        bestEffort=True,
-    ).getInfo()
+    result = {}
+    for key, value in stats.items():
+        band, stat = key.rsplit("_", 1)
+        result.setdefault(band, {})[stat] = value
 
-    return maxval
+    return {
+        band: {stat: values.get(stat) for stat in _SUMMARY_STATS}
+        for band, values in result.items()
+    }
@@ -2,7 +2,7 @@ import json
 import os
 import re
 import warnings
-from typing import Optional, Union
+from typing import List, Optional, Union
 
 import ee
 
@@ -65,3 +65,121 @@ def closest(
     x = x.filter(ee.Filter.And(dayToFilter, monthToFilter, yearToFilter))
 
     return x
+
+
+_UNIT_MILLIS = {
+    "year": 365.25 * 86400000,
+    "month": 30.4375 * 86400000,
+    "week": 7 * 86400000,
+    "day": 86400000,
+    "hour": 3600000,
+    "minute": 60000,
+    "second": 1000,
+}
+
+
+def closestBatch(
+    x: ee.ImageCollection,
+    dates: Union[ee.Date, str, List[Union[ee.Date, str]]],
+    geometries: Optional[Union[ee.Geometry, List[ee.Geometry]]] = None,
+    tolerance: Union[float, int] = 1,
+    unit: str = "month",
+) -> ee.ImageCollection:
+    """Gets the closest image to each one of the specified dates in a single server-side join.
+
+    Unlike calling :func:`closest` in a loop, the matches for all the dates are resolved
+    by one ``ee.Join.saveBest`` on the absolute time difference, without any client-side
+    request.
+
+    Args:
+        x : Image Collection from which to get the closest images to the specified dates.
+        dates : Target date, or list of target dates. The method will look for the image
+            closest to each date. The list must not be empty.
+        geometries : Optional geometry, or list of geometries (one per date), that the
+            closest image must intersect. A list must not mix None with geometries.
+        tolerance : Maximum time difference between a target date and its closest image.
+            Dates without any image within the tolerance are dropped from the result.
+        unit : Units for tolerance. Available units: 'year', 'month', 'week', 'day', 'hour', 'minute' or 'second'.
+            Years and months are approximated as 365.25 and 30.4375 days, respectively.
+
+    Returns:
+        Closest image to each target date. Each image has the properties 'target_index'
+        (position of the date in the list), 'target_date' (ISO-formatted target date) and
+        'dateDist' (time difference in milliseconds).
+
+    Examples:
+        >>> import ee
+        >>> from ee_extra.ImageCollection.core import closestBatch
+        >>> ee.Initialize()
+        >>> S2 = ee.ImageCollection('COPERNICUS/S2_SR')
+        >>> point = ee.Geometry.Point([-76.21, 3.45])
+        >>> closestBatch(S2, ['2020-01-01', '2020-06-15'], point, tolerance=10, unit='day')
+    """
+    if unit not in _UNIT_MILLIS:
+        raise ValueError(
+            f"Unit {unit} is not supported. Use one of {list(_UNIT_MILLIS.keys())}."
+        )
+
+    if isinstance(dates, (str, ee.Date)):
+        dates = [dates]
+
+    if len(dates) == 0:
+        raise ValueError("dates must contain at least one date.")
+
+    if geometries is None or not isinstance(geometries, (list, tuple)):
+        geometries = [geometries] * len(dates)
+
+    if len(geometries) != len(dates):
+        raise ValueError("dates and geometries must have the same length.")
+
+    if None in geometries and any(geometry is not None for geometry in geometries):
+        raise ValueError(
+            "geometries must be all None or all geometries: a target without geometry"
+            " cannot be matched by the spatial filter of the other targets."
+        )
+
+    targets = ee.FeatureCollection(
+        [
+            ee.Feature(
+                geometry,
+                {"system:time_start": ee.Date(date).millis(), "target_index": i},
+            )
+            for i, (date, geometry) in enumerate(zip(dates, geometries))
+        ]
+    )
+
+    maxDifference = tolerance * _UNIT_MILLIS[unit]
+    startDate = ee.Date(targets.aggregate_min("system:time_start")).advance(
+        -maxDifference, "millisecond"
+    )
+    endDate = ee.Date(targets.aggregate_max("system:time_start")).advance(
+        maxDifference, "millisecond"
+    )
+    x = x.filterDate(startDate, endDate)
+
+    condition = ee.Filter.maxDifference(
+        difference=maxDifference,
+        leftField="system:time_start",
+        rightField="system:time_start",
+    )
+    if any(geometry is not None for geometry in geometries):
+        x = x.filterBounds(targets.geometry())
+        condition = ee.Filter.And(
+            condition, ee.Filter.intersects(leftField=".geo", rightField=".geo")
+        )
+
+    joined = ee.Join.saveBest(matchKey="closest", measureKey="dateDist").apply(
+        targets, x, condition
+    )
+
+    def getClosest(target):
+        target_time = ee.Date(target.get("system:time_start"))
+        return (
+            ee.Image(target.get("closest"))
+            .set("target_index", target.get("target_index"))
+            .set("target_date", target_time.format())
+            .set("dateDist", target.get("dateDist"))
+            .set("system:index", target.get("system:index"))
+        )
+
+    return ee.ImageCollection(joined.map(getClosest))
@@ -0,0 +1,244 @@
+"""Translation of many EE JavaScript files at once.
+
+The files are translated across a pool of processes. A file is skipped when its
+output is up to date: the output is newer than the source, or the source has the
+same hash as in the previous report. The report lists, for each file, its status,
+the time spent translating it and the error raised, if any. It is written in the
+output folder or, without one, in the folder that contains all the inputs, so runs
+over different inputs keep separate reports.
+
+Usage:
+    python -m ee_extra.JavaScript.batch scripts/ "more/**/*.js" --out-dir py/
+"""
+
+import argparse
+import concurrent.futures
+import glob
+import hashlib
+import itertools
+import json
+import os
+import pathlib
+import sys
+import time
+import traceback
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from ee_extra.JavaScript.cache import _translator_version
+from ee_extra.JavaScript.install import _write_atomic
+from ee_extra.JavaScript.translate_main import translate
+from ee_extra.JavaScript.utils import _check_black
+
+REPORT_NAME = "ee_js_to_py_report.json"
+_WILDCARDS = set("*?[")
+
+
+def _glob_root(path: str) -> pathlib.Path:
+    """Folder before the first wildcard of a glob (or the folder of a file)."""
+    parts = pathlib.Path(path).parts
+    fixed = itertools.takewhile(lambda part: not _WILDCARDS & set(part), parts)
+    root = pathlib.Path(*fixed)
+    return root if root.is_dir() else root.parent
+
+
+def _find_sources(paths: Sequence[str]) -> List[Tuple[pathlib.Path, pathlib.Path]]:
+    """Expands directories and globs into (source, root) pairs.
+
+    The root is the folder the output path of the source is relative to.
+    """
+    sources = {}
+    for path in paths:
+        if os.path.isdir(path):
+            root = pathlib.Path(path)
+            files = sorted(root.rglob("*.js"))
+        else:
+            root = _glob_root(path)
+            files = [
+                pathlib.Path(file) for file in sorted(glob.glob(path, recursive=True))
+            ]
+        for file in files:
+            if file.is_file():
+                sources.setdefault(file, root)
+    return list(sources.items())
+
+
+def _get_report_path(
+    paths: Sequence[str],
+    sources: List[Tuple[pathlib.Path, pathlib.Path]],
+    out_dir: Optional[str],
+) -> str:
+    """Default report path: in out_dir, or in the folder that contains the inputs."""
+    if out_dir is not None:
+        return os.path.join(out_dir, REPORT_NAME)
+    roots = [root for _, root in sources]
+    roots = roots or [
+        pathlib.Path(path) if os.path.isdir(path) else _glob_root(path)
+        for path in paths
+    ]
+    folder = os.path.commonpath([str(root.resolve()) for root in roots])
+    return os.path.join(folder, REPORT_NAME)
+
+
+def _get_output_path(
+    source: pathlib.Path, root: pathlib.Path, out_dir: Optional[str]
+) -> pathlib.Path:
+    """Output path of a source: next to it, or mirrored inside out_dir."""
+    if out_dir is None:
+        return source.with_suffix(".py")
+    return pathlib.Path(out_dir).joinpath(source.relative_to(root)).with_suffix(".py")
+
+
+def _source_hash(source: pathlib.Path, black: bool) -> str:
+    """Hash of a source, the translator version and the options."""
+    digest = hashlib.sha256(_translator_version().encode())
+    digest.update(json.dumps({"black": black}).encode())
+    digest.update(source.read_bytes())
+    return digest.hexdigest()
+
+
+def _is_up_to_date(
+    source: pathlib.Path, output: pathlib.Path, sha256: str, previous: Optional[Dict]
+) -> bool:
+    """Whether the output of a source does not need to be translated again."""
+    if not output.exists():
+        return False
+    if previous is not None and previous.get("status") in ("ok", "skipped"):
+        return previous.get("sha256") == sha256
+    return output.stat().st_mtime >= source.stat().st_mtime
+
+
+def _translate_file(source: str, output: str, black: bool) -> Dict:
+    """Translates one file. Errors are reported instead of raised."""
+    start = time.perf_counter()
+    try:
+        with open(source, "r", encoding="utf-8") as f:
+            py_file = translate(f.read(), black)
+        _write_atomic(pathlib.Path(output), py_file.encode("utf-8"))
+        status, error = "ok", None
+    except Exception as e:
+        status = "error"
+        error = "".join(traceback.format_exception_only(type(e), e)).strip()
+    return {"status": status, "seconds": time.perf_counter() - start, "error": error}
+
+
+def ee_js_to_py_batch(
+    paths: Sequence[str],
+    out_dir: Optional[str] = None,
+    black: bool = True,
+    max_workers: Optional[int] = None,
+    report: Optional[str] = None,
+    force: bool = False,
+) -> List[Dict]:
+    """Converts many EE JavaScript files to EE Python files in parallel.
+
+    Args:
+        paths (list): Files, directories (searched recursively for .js files) or
+            glob patterns.
+        out_dir (str): Folder of the Python scripts. The folder structure of the
+            inputs is kept. By default each script is written next to its source.
+        black (bool): Whether to format the Python scripts with black.
+        max_workers (int): Number of processes. Defaults to the number of CPUs.
+        report (str): Path of the JSON report. Defaults to a file in out_dir or,
+            without out_dir, in the folder that contains all the inputs.
+        force (bool): Whether to translate files whose output is up to date.
+
+    Returns:
+        list: One entry per file with its source, output, sha256, status ("ok",
+        "skipped" or "error"), seconds and error.
+
+    Examples:
+        >>> from ee_extra.JavaScript.batch import ee_js_to_py_batch
+        >>> ee_js_to_py_batch(["scripts/"], out_dir="py/")  # doctest: +SKIP
+    """
+    if black:
+        # fail once here instead of once per file in the workers
+        _check_black()
+
+    sources = _find_sources(paths)
+    report = report or _get_report_path(paths, sources, out_dir)
+    previous = {}
+    if not force and os.path.exists(report):
+        with open(report, "r", encoding="utf-8") as f:
+            previous = {entry["source"]: entry for entry in json.load(f)["files"]}
+
+    results = []
+    pending = []
+    for source, root in sources:
+        output = _get_output_path(source, root, out_dir)
+        entry = {
+            "source": str(source),
+            "output": str(output),
+            "sha256": _source_hash(source, black),
+            "status": "skipped",
+            "seconds": 0.0,
+            "error": None,
+        }
+        results.append(entry)
+        if force or not _is_up_to_date(
+            source, output, entry["sha256"], previous.get(entry["source"])
+        ):
+            pending.append(entry)
+
+    start = time.perf_counter()
+    if pending:
+        with concurrent.futures.ProcessPoolExecutor(
+            max_workers=max_workers
+        ) as executor:
+            futures = {
+                executor.submit(
+                    _translate_file, entry["source"], entry["output"], black
+                ): entry
+                for entry in pending
+            }
+            for future in concurrent.futures.as_completed(futures):
+                futures[future].update(future.result())
+
+    summary = {
+        status: sum(entry["status"] == status for entry in results)
+        for status in ("ok", "skipped", "error")
+    }
+    summary["seconds"] = time.perf_counter() - start
+    _write_atomic(
+        pathlib.Path(report),
+        json.dumps({"summary": summary, "files": results}, indent=2).encode("utf-8"),
+    )
+    return results
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    """Command line entry point. Returns 1 if any file failed."""
+    parser = argparse.ArgumentParser(
+        description="Translate EE JavaScript files to Python in parallel."
+    )
+    parser.add_argument("paths", nargs="+", help="files, directories or globs")
+    parser.add_argument("--out-dir", default=None)
+    parser.add_argument("--no-black", dest="black", action="store_false")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--report", default=None)
+    parser.add_argument("--force", action="store_true")
+    args = parser.parse_args(argv)
+
+    results = ee_js_to_py_batch(
+        args.paths,
+        out_dir=args.out_dir,
+        black=args.black,
+        max_workers=args.workers,
+        report=args.report,
+        force=args.force,
+    )
+    for entry in results:
+        if entry["status"] == "error":
+            print(f"{entry['source']}: {entry['error']}", file=sys.stderr)
+    counts = {
+        status: sum(entry["status"] == status for entry in results)
+        for status in ("ok", "skipped", "error")
+    }
+    print(
+        f"{counts['ok']} translated, {counts['skipped']} up to date, "
+        f"{counts['error']} failed"
+    )
+    return 1 if counts["error"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
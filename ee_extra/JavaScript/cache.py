@@ -0,0 +1,183 @@
+"""On-disk cache of translated JavaScript modules.
+
+Translating a module takes much longer than loading it, so the translated Python
+source and its compiled bytecode are saved in a per-user cache folder:
+$EE_EXTRA_CACHE_DIR if it is set, otherwise ee_extra/translate inside
+$XDG_CACHE_HOME (~/.cache by default). Every function also accepts a cache_dir that
+overrides both. The cache key is
+a hash of the JavaScript source, the translator version and the translation options:
+changing any of them produces a new entry.
+
+In incremental mode the cache works at the level of the top-level units of a module
+(functions, var blocks, exports, ...): after an edit only the changed units are
+translated again.
+"""
+
+import functools
+import hashlib
+import importlib.util
+import json
+import marshal
+import os
+import pathlib
+from types import CodeType
+from typing import Optional
+
+import ee_extra
+from ee_extra.JavaScript.install import _write_atomic
+from ee_extra.JavaScript.tokenizer import split_units
+from ee_extra.JavaScript.translate_main import (
+    _add_headers,
+    _merge_helpers,
+    _translate_body,
+    translate,
+)
+
+
+def _get_cache_path(cache_dir: Optional[str] = None) -> pathlib.Path:
+    """Gets the folder of the translation cache.
+
+    Args:
+        cache_dir (str): Folder of the cache. Defaults to $EE_EXTRA_CACHE_DIR, or to
+            ee_extra/translate inside $XDG_CACHE_HOME (~/.cache if it is not set).
+
+    Returns:
+        pathlib.Path: The folder of the translation cache.
+    """
+    if cache_dir is None:
+        cache_dir = os.environ.get("EE_EXTRA_CACHE_DIR")
+    if cache_dir is None:
+        base = os.environ.get("XDG_CACHE_HOME") or os.path.join("~", ".cache")
+        cache_dir = os.path.join(base, "ee_extra", "translate")
+    return pathlib.Path(cache_dir).expanduser()
+
+
+@functools.lru_cache(maxsize=None)
+def _translator_version() -> str:
+    """Version of the translator: the ee_extra version and a hash of its sources.
+
+    The hash makes unreleased changes of the translator invalidate the cache too.
+    """
+    digest = hashlib.sha256(ee_extra.__version__.encode())
+    for path in sorted(pathlib.Path(__file__).parent.glob("*.py")):
+        digest.update(path.read_bytes())
+    return digest.hexdigest()
+
+
+def _cache_key(x: str, **options) -> str:
+    """Hash of a JavaScript source, the translator version and the options."""
+    digest = hashlib.sha256(_translator_version().encode())
+    digest.update(json.dumps(options, sort_keys=True).encode())
+    digest.update(x.encode("utf-8"))
+    return digest.hexdigest()
+
+
+def translate_cached(
+    x: str, black: bool = False, cache_dir: Optional[str] = None
+) -> str:
+    """Translates a JavaScript script to a Python script, using the on-disk cache.
+
+    Args:
+        x (str): A JavaScript script.
+        black (bool): Whether to format the Python script with black.
+        cache_dir (str): Folder of the cache. Defaults to the per-user cache folder.
+
+    Returns:
+        str: A Python script.
+    """
+    path = _get_cache_path(cache_dir).joinpath(_cache_key(x, black=black) + ".py")
+    if path.exists():
+        return path.read_text(encoding="utf-8")
+
+    module = translate(x, black)
+    _write_atomic(path, module.encode("utf-8"))
+    return module
+
+
+def _translate_unit_cached(x: str, cache_dir: Optional[str] = None) -> tuple:
+    """Translates a top-level unit of a module, using the on-disk cache."""
+    path = _get_cache_path(cache_dir).joinpath(_cache_key(x, unit=True) + ".json")
+    if path.exists():
+        try:
+            entry = json.loads(path.read_text(encoding="utf-8"))
+            return entry["code"], entry["helpers"]
+        except (ValueError, KeyError):
+            pass
+
+    code, helpers = _translate_body(x)
+    entry = {"code": code, "helpers": helpers}
+    _write_atomic(path, json.dumps(entry).encode("utf-8"))
+    return code, helpers
+
+
+def translate_incremental(
+    x: str, black: bool = False, cache_dir: Optional[str] = None
+) -> str:
+    """Translates a JavaScript script unit by unit, using the on-disk cache.
+
+    The script is split into its top-level units and each unit is translated on its
+    own, so after an edit only the changed units are translated again. The units are
+    then joined in their original order and the headers are added once. Passes that
+    look at the whole script (e.g. where exports are assigned) can lay out the result
+    slightly differently than translate does.
+
+    Args:
+        x (str): A JavaScript script.
+        black (bool): Whether to format the Python script with black.
+        cache_dir (str): Folder of the cache. Defaults to the per-user cache folder.
+
+    Returns:
+        str: A Python script.
+    """
+    codes = []
+    helpers = []
+    for unit in split_units(x):
+        if not unit.strip():
+            continue
+        code, unit_helpers = _translate_unit_cached(unit, cache_dir)
+        codes.append(code.strip("\n"))
+        helpers.append(unit_helpers)
+    return _add_headers("\n\n".join(codes) + "\n", _merge_helpers(helpers), black)
+
+
+def compile_cached(x: str, cache_dir: Optional[str] = None) -> CodeType:
+    """Translates and compiles a JavaScript script, using the on-disk cache.
+
+    The bytecode is saved next to the translated source and is only used by the same
+    Python version that wrote it.
+
+    Args:
+        x (str): A JavaScript script.
+        cache_dir (str): Folder of the cache. Defaults to the per-user cache folder.
+
+    Returns:
+        code: Code object of the translated Python script.
+    """
+    key = _cache_key(x, black=False)
+    source = _get_cache_path(cache_dir).joinpath(key + ".py")
+    bytecode = _get_cache_path(cache_dir).joinpath(key + ".pyc")
+    magic = importlib.util.MAGIC_NUMBER
+
+    if bytecode.exists():
+        data = bytecode.read_bytes()
+        if data[: len(magic)] == magic:
+            try:
+                return marshal.loads(data[len(magic) :])
+            except (EOFError, ValueError, TypeError):
+                pass
+
+    code = compile(translate_cached(x, cache_dir=cache_dir), str(source), "exec")
+    _write_atomic(bytecode, magic + marshal.dumps(code))
+    return code
+
+
+def clear_cache(cache_dir: Optional[str] = None) -> None:
+    """Deletes every cached translation.
+
+    Args:
+        cache_dir (str): Folder of the cache. Defaults to the per-user cache folder.
+    """
+    path = _get_cache_path(cache_dir)
+    if path.exists():
+        for file in path.iterdir():
+            file.unlink()
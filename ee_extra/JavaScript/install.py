@@ -2,11 +2,19 @@
 a JavaScript Earth Enginemodule.
 """
 
+import hashlib
+import json
+import os
 import pathlib
 import re
+import threading
 import urllib.request
-
+import warnings
+from concurrent.futures import ThreadPoolExecutor
 from importlib.resources import files
+from typing import Dict, List
+
+EE_SOURCES_URL = "https://storage.googleapis.com/ee-sources"
 
 
 def _convert_path_to_ee_sources(path: str) -> str:
@@ -22,7 +30,7 @@ def _convert_path_to_ee_sources(path: str) -> str:
         eempath = path
     else:
         bpath = path.replace(":", "/")
-        eempath = f"https://storage.googleapis.com/ee-sources/{bpath}"
+        eempath = f"{EE_SOURCES_URL}/{bpath}"
     return eempath
 
 
@@ -91,6 +99,19 @@ def _open_module_as_str(path: str) -> str:
         raise Exception(f"The module '{path}' is not installed!")
 
 
+def _parse_dependencies(module: str) -> list:
+    """Get the dependencies required by the source of an Earth Engine module.
+
+    Args:
+        module: str
+
+    Returns:
+        List of dependencies.
+    """
+    dependencies = re.findall(r"require\((.*?)\)", module)
+    return [dep.replace('"', "").replace("'", "") for dep in dependencies]
+
+
 def _get_dependencies(path: str) -> list:
     """Get the dependencies of an Earth Engine module.
 
@@ -101,75 +122,153 @@ def _get_dependencies(path: str) -> list:
         List of dependencies.
     """
     if _check_if_module_exists(path):
+        return _parse_dependencies(_open_module_as_str(path))
+    else:
+        raise Exception(f"The module '{path}' is not installed!")
 
-        module = _open_module_as_str(path)
 
-        dependencies = re.findall(r"require\((.*?)\)", module)
-        dependenciesClean = []
+def _get_lockfile_path() -> pathlib.Path:
+    """Gets the path of the lockfile of the installed modules.
 
-        for dep in dependencies:
-            dependenciesClean.append(dep.replace('"', "").replace("'", ""))
+    Returns:
+        The lockfile path.
+    """
+    return pathlib.Path(_get_ee_sources_path()).joinpath("ee-sources.lock.json")
 
-        return dependenciesClean
 
-    else:
+def _read_lockfile() -> Dict[str, dict]:
+    """Reads the lockfile (empty if there is none).
 
-        raise Exception(f"The module '{path}' is not installed!")
+    Returns:
+        The URL, SHA-256 and dependencies of each installed module.
+    """
+    path = _get_lockfile_path()
+    if not path.exists():
+        return {}
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _write_lockfile(lock: Dict[str, dict]) -> None:
+    """Writes the lockfile.
+
+    Args:
+        lock: The URL, SHA-256 and dependencies of each installed module.
+    """
+    content = json.dumps(lock, indent=2, sort_keys=True)
+    _write_atomic(_get_lockfile_path(), content.encode("utf-8"))
+
+
+def _write_atomic(path: pathlib.Path, content: bytes) -> None:
+    """Writes a file through a temporary file, so it is never left half written.
+
+    Args:
+        path: pathlib.Path
+        content: bytes
+    """
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    tmp.write_bytes(content)
+    os.replace(tmp, path)
+
+
+def _download(opener: urllib.request.OpenerDirector, url: str) -> bytes:
+    """Downloads a URL.
 
+    Connections are not pooled: urllib opens a new connection for every download.
+    A pool of http.client connections per host and thread had to reimplement the
+    proxy settings, CONNECT tunnels, proxy authentication and redirects that the
+    opener already handles, and was not faster against a local server, so the
+    downloads of a level run concurrently on new connections instead.
 
-def _install(x: str, update: bool, quiet: bool = False):
+    Args:
+        opener: urllib opener shared by the downloads. It honors the proxy settings
+            of the environment (e.g. HTTPS_PROXY and NO_PROXY), proxy
+            authentication and redirects.
+        url: str
+
+    Returns:
+        The content of the URL.
+    """
+    with opener.open(url, timeout=60) as response:
+        return response.read()
+
+
+def _install(
+    x: str,
+    update: bool,
+    quiet: bool,
+    lock: Dict[str, dict],
+    opener: urllib.request.OpenerDirector,
+) -> dict:
     """Install an Earth Engine JavaScript module.
 
-    The specified module will be installed in the ee_extra module path.
+    The specified module will be installed in the ee_extra module path. Installed
+    modules are only downloaded again if update is True. The lockfile hash is not
+    used to decide whether to download: an installed module whose content no longer
+    matches its lockfile hash (e.g. a file edited locally) is kept as it is, with a
+    warning, and its new hash is recorded.
 
     Args:
         x: str
         update: bool
+        quiet: bool
+        lock: Current lockfile.
+        opener: urllib opener used to download the module.
+
+    Returns:
+        The lockfile entry of the module.
     """
-    if _check_if_module_exists(x) and not update:
+    path = _convert_path_to_ee_extra(x)
+
+    if path.exists() and not update:
         if not quiet:
             print(f"The module '{x}' is already installed!")
-
+        content = path.read_bytes()
+        sha256 = hashlib.sha256(content).hexdigest()
+        if x in lock:
+            if lock[x]["sha256"] == sha256:
+                return lock[x]
+            warnings.warn(
+                f"The module '{x}' was modified after it was installed. The local "
+                "file is kept; use update=True to download it again."
+            )
     else:
         if not quiet:
             print(f"Downloading '{x}'...")
-
-        ee_sources = _get_ee_sources_path()
-
-        # Local path
-        if x.startswith("http"):
-            module_folder = pathlib.Path(ee_sources).joinpath(
-                "EXTERNAL/" + pathlib.Path(x).stem
-            )
-        else:
-            module_folder = pathlib.Path(ee_sources).joinpath(
-                "/".join(x.replace(":", "/").split("/")[:-1])
-            )
-
-        if not module_folder.exists():
-            module_folder.mkdir(parents=True, exist_ok=True)
-
-        # With requests:
-        # r = requests.get(_convert_path_to_ee_sources(x))
-        # open(_convert_path_to_ee_extra(x), "wb").write(r.content)
-
-        # With urllib:
-        with urllib.request.urlopen(_convert_path_to_ee_sources(x)) as url:
-            r = url.read()  # .decode()
-        open(_convert_path_to_ee_extra(x), "wb").write(r)
-
+        content = _download(opener, _convert_path_to_ee_sources(x))
+        sha256 = hashlib.sha256(content).hexdigest()
+        _write_atomic(path, content)
         if not quiet:
             print(f"The module '{x}' was successfully installed!")
 
+    return {
+        "url": _convert_path_to_ee_sources(x),
+        "sha256": sha256,
+        "dependencies": _parse_dependencies(content.decode("utf-8")),
+    }
+
 
-def install(x: str, update: bool = False, quiet: bool = False) -> list:
+def install(
+    x: str, update: bool = False, quiet: bool = False, max_workers: int = 8
+) -> List[str]:
     """Install an Earth Engine modue and its dependencies.
 
-    The specified dependencies will be installed in the ee_extra module path.
+    The specified dependencies will be installed in the ee_extra module path. The
+    dependency graph is resolved breadth-first and the modules of each level are
+    downloaded concurrently, each on its own connection (see _download). The URL,
+    SHA-256 and dependencies of each module are recorded in a lockfile, so later
+    runs with update=False only read local files. A local file whose hash differs
+    from the lockfile raises a warning and is not downloaded again.
 
     Args:
         x: str
         update: bool
+        quiet: bool
+        max_workers: Maximum number of concurrent downloads.
+
+    Returns:
+        The installed modules, in breadth-first order.
 
     Examples:
         >>> import ee
@@ -177,26 +276,38 @@ def install(x: str, update: bool = False, quiet: bool = False) -> list:
         >>> ee.Initialize()
         >>> Extra.JavaScript.eejs2py.install("users/dmlmont/spectral:spectral")
     """
-    deps = [x]
-
-    def _install_dependencies(x: list, update: bool, installed: list):
-
-        if len(x) > 0:
-            for dep in x:
-                if dep not in installed:
-                    _install(dep, update, quiet)
+    lock = _read_lockfile()
+    opener = urllib.request.build_opener()
+    installed = []
+    seen = {x}
+    level = [x]
+
+    try:
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            while level:
+                entries = list(
+                    executor.map(
+                        lambda dep: _install(dep, update, quiet, lock, opener), level
+                    )
+                )
+                nextLevel = []
+                for dep, entry in zip(level, entries):
                     if not quiet:
                         print(f"Checking dependencies for {dep}...")
-                    x.extend(_get_dependencies(dep))
+                    lock[dep] = entry
                     installed.append(dep)
-                    x = [item for item in x if item not in installed]
-                    _install_dependencies(x, update, installed)
+                    for child in entry["dependencies"]:
+                        if child not in seen:
+                            seen.add(child)
+                            nextLevel.append(child)
+                level = nextLevel
+    finally:
+        if installed:
+            _write_lockfile(lock)
 
-        else:
+    quiet or print(f"All dependencies were successfully installed!")
 
-            quiet or print(f"All dependencies were successfully installed!")
-
-    return _install_dependencies(x=deps, update=update, installed=[])
+    return installed
 
 
 def rmtree(path):
@@ -225,6 +336,17 @@ def uninstall(x: str, quiet: bool = False):
     """
     if _check_if_module_exists(x):
         rmtree(_convert_path_to_ee_extra(x).parent)
+
+        # forget the modules removed with the folder
+        lock = _read_lockfile()
+        if lock:
+            lock = {
+                dep: entry
+                for dep, entry in lock.items()
+                if _check_if_module_exists(dep)
+            }
+            _write_lockfile(lock)
+
         quiet or print(f"The module '{x}' was successfully uninstalled!")
     else:
         quiet or print(f"The module '{x}' is not installed!")
@@ -4,33 +4,46 @@ JavaScript code to Python code. The following functions are implemented:
 I. Functions
 
 * ee_js_to_py: Convert an EE JavaScript file to an EE Python file.
+* ee_js_to_py_batch: Convert many EE JavaScript files in parallel.
 * ee_translate: Translate a EE Js module to a Python script.
 * require:
 """
 
 from ee_extra import translate
+from ee_extra.JavaScript.batch import ee_js_to_py_batch
+from ee_extra.JavaScript.cache import translate_cached, translate_incremental
 from ee_extra.JavaScript.merge import require
 from ee_extra.JavaScript.install import install
 
 
-def ee_translate(x: str) -> str:
+def ee_translate(x: str, cache: bool = False) -> str:
     """Translate a EE Js module to a Python script.
 
     Args:
         x (str): EE Js module as a string.
+        cache (bool): Whether to reuse a previous translation of the same module
+            from the on-disk cache.
 
     Returns:
         str: EE Python script.
     """
+    if cache:
+        return translate_cached(x)
     return translate(x)
 
 
-def ee_js_to_py(in_file: str, out_file: str, black: bool = True) -> bool:
+def ee_js_to_py(
+    in_file: str, out_file: str, black: bool = True, incremental: bool = False
+) -> bool:
     """Convert an EE JavaScript file to an EE Python file.
 
     Args:
         in_file (str): File path of the input JavaScript.
         out_file (str): File path of the output Python script.
+        black (bool): Whether to format the Python script with black.
+        incremental (bool): Whether to translate the top-level units of the file
+            (functions, var blocks, exports, ...) one by one and cache them on disk,
+            so that a new run after an edit only translates the changed units.
 
     Returns:
         bool: Return True if the conversion is successful.
@@ -39,7 +52,10 @@ def ee_js_to_py(in_file: str, out_file: str, black: bool = True) -> bool:
     with open(in_file, "r") as f_in:
         js_file = f_in.read()
 
-    py_file = translate(js_file, black)
+    if incremental:
+        py_file = translate_incremental(js_file, black)
+    else:
+        py_file = translate(js_file, black)
 
     with open(out_file, "w") as f_out:
         f_out.write(py_file)
@@ -47,15 +63,19 @@ def ee_js_to_py(in_file: str, out_file: str, black: bool = True) -> bool:
     return True
 
 
-def ee_require(x: str):
+def ee_require(x: str, cache: bool = True, lazy: bool = False):
     """Requires a JavaScript module as a python module.
 
     Args:
         x (str): EE Js module as a string.
+        cache (bool): Whether to reuse the translation of an unchanged module from
+            the on-disk cache.
+        lazy (bool): Whether to evaluate each export only when it is first accessed,
+            together with the definitions it depends on.
 
     Returns:
         module: Python module.
     """
     install(x, quiet=True)
 
-    return require(x)
+    return require(x, cache=cache, lazy=lazy)
@@ -1,6 +1,7 @@
 """Merge Javascript module in one file"""
 
-import pathlib
+import ast
+import collections
 import re
 import sys
 from types import SimpleNamespace
@@ -8,11 +9,13 @@ from types import SimpleNamespace
 import ee
 
 from ee_extra import translate
+from ee_extra.JavaScript.cache import compile_cached, translate_cached
 from ee_extra.JavaScript.install import (
     _convert_path_to_ee_extra,
     _get_ee_sources_path,
     _open_module_as_str,
 )
+from ee_extra.JavaScript.tokenizer import COMMENT, tokenize
 
 
 class JSModule(SimpleNamespace):
@@ -29,108 +32,291 @@ class JSModule(SimpleNamespace):
         return str(toShow)
 
 
-def junction(x: str) -> str:
-    """Evaluate an Earth Engine module.
-
-    Returns an EvalJs object hosting all EE objects evaluated in the Earth Engine module.
-    The EE objects can be accessed using dot notation.
+def _member_key(node):
+    """Key of a member access with a constant name, e.g. exports["x"] -> exports.x"""
+    if not isinstance(node.value, ast.Name):
+        return None
+    if isinstance(node, ast.Attribute):
+        return f"{node.value.id}.{node.attr}"
+    index = node.slice
+    if isinstance(index, getattr(ast, "Index", ())):  # Python 3.8
+        index = index.value
+    if isinstance(index, ast.Constant) and isinstance(index.value, str):
+        return f"{node.value.id}.{index.value}"
+    return None
+
+
+def _base_name(node):
+    """Name at the base of a chain of member accesses and calls, e.g. a.b(c).d -> a"""
+    while isinstance(node, (ast.Attribute, ast.Subscript, ast.Call)):
+        node = node.func if isinstance(node, ast.Call) else node.value
+    return node.id if isinstance(node, ast.Name) else None
+
+
+def _defined(statement) -> set:
+    """Keys defined by a top-level statement: names, members (a.x) and a.* when a
+    is modified in some other way."""
+    if isinstance(statement, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+        return {statement.name}
+    if isinstance(statement, (ast.Import, ast.ImportFrom)):
+        return {(alias.asname or alias.name).split(".")[0] for alias in statement.names}
+
+    keys = set()
+    for node in ast.walk(statement):
+        if isinstance(node, ast.Name) and isinstance(node.ctx, ast.Store):
+            keys.add(node.id)
+        elif isinstance(node, (ast.Attribute, ast.Subscript)) and isinstance(
+            node.ctx, (ast.Store, ast.Del)
+        ):
+            key = _member_key(node)
+            base = _base_name(node)
+            if key:
+                keys.add(key)
+            elif base:
+                keys.add(f"{base}.*")
+        elif isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.ClassDef)):
+            keys.add(node.name)
+
+    # a method called for its side effects may modify its object, e.g. a.append(1)
+    if isinstance(statement, ast.Expr):
+        for node in ast.walk(statement):
+            if isinstance(node, ast.Call) and isinstance(node.func, ast.Attribute):
+                base = _base_name(node.func)
+                if base:
+                    keys.add(f"{base}.*")
+    return keys
+
+
+def _used(statement) -> set:
+    """Keys read by a statement, including the bodies of its functions."""
+    keys = set()
+    members = set()
+    for node in ast.walk(statement):
+        if not isinstance(node, (ast.Attribute, ast.Subscript)):
+            continue
+        key = _member_key(node)
+        if key and isinstance(node.ctx, ast.Load):
+            keys.add(key)
+            members.add(id(node.value))
+        elif isinstance(node.value, ast.Name) and not isinstance(node.ctx, ast.Load):
+            # assigning a member only needs the object, not its other members
+            keys.add(f"{node.value.id}.*")
+            members.add(id(node.value))
+    for node in ast.walk(statement):
+        if (
+            isinstance(node, ast.Name)
+            and isinstance(node.ctx, ast.Load)
+            and id(node) not in members
+        ):
+            keys.add(node.id)
+    return keys
+
+
+class _LazyLoader:
+    """Executes the top-level statements of a Python module on demand.
 
     Args:
-        x: str
+        source: Python source of the module.
+        filename: File name used in tracebacks.
+    """
 
-    Returns:
-        An EvalJs object hosting all EE objects evaluated in the Earth Engine module.
+    def __init__(self, source: str, filename: str):
+        self.filename = filename
+        self.statements = ast.parse(source, filename).body
+        self.defs = collections.defaultdict(set)
+        self.members = collections.defaultdict(set)
+        self.uses = []
+        for index, statement in enumerate(self.statements):
+            for key in _defined(statement):
+                self.defs[key].add(index)
+                if "." in key:
+                    self.members[key.split(".")[0]].add(key)
+            self.uses.append(_used(statement))
+        self.namespace = dict()
+        self.executed = set()
+
+    def exports(self) -> list:
+        """Names of the exports defined with a constant name."""
+        return sorted(
+            key.split(".", 1)[1] for key in self.members["exports"] if key[-2:] != ".*"
+        )
+
+    def _providers(self, key: str) -> set:
+        """Statements that define what a key needs."""
+        base = key.split(".")[0]
+        statements = self.defs[base] | self.defs[f"{base}.*"]
+        if "." in key:
+            return statements | self.defs[key]
+        for member in self.members[base]:
+            statements = statements | self.defs[member]
+        return statements
+
+    def load(self, name: str):
+        """Executes the statements an export needs and returns the export."""
+        pending = [f"exports.{name}"]
+        needed = set()
+        while pending:
+            for index in self._providers(pending.pop()) - needed:
+                needed.add(index)
+                pending.extend(self.uses[index])
+
+        statements = sorted(needed - self.executed)
+        if statements:
+            module = ast.Module(
+                body=[self.statements[index] for index in statements], type_ignores=[]
+            )
+            exec(compile(module, self.filename, "exec"), self.namespace)
+            self.executed.update(statements)
+
+        try:
+            return self.namespace["exports"][name]
+        except KeyError:
+            raise AttributeError(f"The module has no export '{name}'") from None
+
+
+class LazyJSModule(JSModule):
+    """Creates a JSModule object whose exports are evaluated on first access.
+
+    Accessing an export executes only the top-level definitions it depends on (its
+    transitive local dependencies). The export is then cached on the object.
 
-    Examples:
-        >>> import ee
-        >>> from ee_extra import Extra
-        >>> ee.Initialize()
-        >>> spectral = Extra.JavaScript.eejs2py.require("users/dmlmont/spectral:spectral")
+    Args:
+        source: Python source of the translated module.
+        filename: File name used in tracebacks.
     """
-    module = _open_module_as_str(x)
 
-    module = re.sub(re.compile("/\*.*?\*/", re.DOTALL), "", module)
-    # module = re.sub(re.compile("//.*?\n"), "", module)
+    def __init__(self, source: str, filename: str = "<JavaScript module>"):
+        super().__init__()
+        self.__dict__["_loader"] = _LazyLoader(source, filename)
 
-    lines = module.split("\n")
+    def __getattr__(self, name):
+        if name.startswith("_"):
+            raise AttributeError(name)
+        value = self._loader.load(name)
+        setattr(self, name, value)
+        return value
 
-    counter = 0
+    def __dir__(self):
+        return self._loader.exports()
 
-    while any([line for line in lines if "require(" in line]):
+    def __repr__(self):
+        toShow = dict()
+        for key in self._loader.exports():
+            toShow[key] = type(self.__dict__[key]) if key in self.__dict__ else "lazy"
+        return str(toShow)
 
-        newLines = []
 
-        for line in lines:
-            if "require(" in line:
-                var = re.findall(r"var(.*?)=", line)[0].replace(" ", "")
-                newText = _open_module_as_str(
-                    re.findall(r"require\((.*?)\)", line)[0]
-                    .replace('"', "")
-                    .replace("'", "")
-                )
-                newText = re.sub(re.compile("/\*.*?\*/", re.DOTALL), "", newText)
-                # newText = re.sub(re.compile("//.*?\n"), "", newText)
-                newText = newText.replace("exports", f"eeExtraExports{counter}")
-                newLines.append("var eeExtraExports" + str(counter) + " = AttrDict();")
-                newLines.extend(newText.split("\n"))
-                newLines.append(f"var {var} = eeExtraExports{counter}")
-                counter += 1
-            else:
-                newLines.append(line)
+# A require call, as in install._parse_dependencies.
+_REQUIRE = re.compile(r"require\((.*?)\)")
 
-            lines = newLines
 
-    # replacing nested double quotes
-    raw_file = "\n".join(lines)
-    regex_exp = r'(:\s+")(.*(?:\n(?!\s*"[^"\n:]+":).*)*)",$'
-    final_file = re.sub(
-        pattern=regex_exp,
-        repl=lambda x: '{}{}",'.format(x.group(1), x.group(2).replace('"', "'")),
-        string=raw_file,
-        flags=re.M,
-    )
+def _require_path(match) -> str:
+    """Module path of a require call."""
+    return match.group(1).replace('"', "").replace("'", "").strip()
 
-    return final_file
 
+def _load_module(x: str) -> str:
+    """Reads an installed module and strips its comments."""
+    return "".join(
+        token.text
+        for token in tokenize(_open_module_as_str(x))
+        if token.kind != COMMENT
+    )
 
-def _convert_path_to_ee_extra_python_module(path: str) -> str:
-    """Convert an Earth Engine module path into an ee_extra python module path to import it later.
+
+def _sort_modules(x: str) -> list:
+    """Loads a module and all its dependencies once, in topological order.
 
     Args:
-        path: str
+        x: str
 
     Returns:
-        An ee_extra python module path.
+        List of (path, source) pairs. Every module comes after the modules it
+        requires, and x comes last.
     """
-    path = _convert_path_to_ee_extra(path)
-    path = "/".join(str(path).split("/")[:-1]) + "/module.py"
+    sources = dict()
+    visiting = set()
 
-    return path
+    def visit(path):
+        if path in sources:
+            return
+        if path in visiting:
+            raise ValueError(f"The module '{path}' requires itself (circular require)!")
+        visiting.add(path)
+        source = _load_module(path)
+        for match in _REQUIRE.finditer(source):
+            visit(_require_path(match))
+        visiting.remove(path)
+        sources[path] = source
 
+    visit(x)
+    return list(sources.items())
 
-def _check_if_python_module_exists(path: str) -> bool:
-    """Check if an Earth Engine python module has been created from a JavaScript module in ee_extra.
+
+def junction(x: str) -> str:
+    """Evaluate an Earth Engine module.
+
+    Merges the module and its dependencies into a single script. Each dependency is
+    inlined once, before the modules that require it, and its exports are stored in
+    its own eeExtraExports<i> object.
 
     Args:
-        path: str
+        x: str
 
     Returns:
-        Whether the python module has been created.
+        The merged JavaScript script.
+
+    Examples:
+        >>> import ee
+        >>> from ee_extra import Extra
+        >>> ee.Initialize()
+        >>> spectral = Extra.JavaScript.eejs2py.require("users/dmlmont/spectral:spectral")
     """
-    return pathlib.Path(_convert_path_to_ee_extra_python_module(path)).exists()
+    modules = _sort_modules(x)
+    names = {path: f"eeExtraExports{i}" for i, (path, _) in enumerate(modules[:-1])}
+
+    def link(source):
+        return _REQUIRE.sub(lambda match: names[_require_path(match)], source)
+
+    lines = []
+    for path, source in modules[:-1]:
+        lines.append(f"var {names[path]} = AttrDict();")
+        lines.append(link(source).replace("exports", names[path]))
+    lines.append(link(modules[-1][1]))
 
+    # replacing nested double quotes
+    raw_file = "\n".join(lines)
+    regex_exp = r'(:\s+")(.*(?:\n(?!\s*"[^"\n:]+":).*)*)",$'
+    final_file = re.sub(
+        pattern=regex_exp,
+        repl=lambda x: '{}{}",'.format(x.group(1), x.group(2).replace('"', "'")),
+        string=raw_file,
+        flags=re.M,
+    )
+
+    return final_file
 
-def require(x: str):
+
+def require(x: str, cache: bool = True, lazy: bool = False):
     """Require a JavaScript module as a python module.
 
     Args:
         path: str
+        cache: Whether to reuse the translation of an unchanged module (and its
+            dependencies) from the on-disk cache.
+        lazy: Whether to evaluate each export only when it is first accessed,
+            instead of evaluating the whole module now.
 
     Returns:
         A python module.
     """
-    # x = junction(x)
-    module = translate(junction(x))
+    merged = junction(x)
+
+    if lazy:
+        source = translate_cached(merged) if cache else translate(merged)
+        return LazyJSModule(source, filename=f"<{x}>")
+
+    module = compile_cached(merged) if cache else translate(merged)
 
     exports = dict()
 
@@ -0,0 +1,127 @@
+"""Instrumentation of the JavaScript translator.
+
+translate accepts a hook that is called after every pass with a PassRecord: the name
+of the pass, its wall time, the size of the code before and after it and the number
+of lines it rewrote. Without a hook the passes are called directly and nothing is
+measured.
+
+Examples:
+    >>> from ee_extra import translate
+    >>> from ee_extra.JavaScript.profiling import TranslationProfile
+    >>> profile = TranslationProfile()
+    >>> translate("var x = 'a'.trim();", hook=profile)
+    >>> print(profile.report())
+"""
+
+import collections
+import time
+from typing import Callable, List, NamedTuple, Optional
+
+
+class PassRecord(NamedTuple):
+    """Measurements of a translation pass.
+
+    Args:
+        name : Name of the pass, e.g. "change_operators" or "jsmethods.trim".
+        seconds : Wall time of the pass.
+        input_size : Number of characters before the pass.
+        output_size : Number of characters after the pass.
+        rewrites : Number of lines changed by the pass.
+    """
+
+    name: str
+    seconds: float
+    input_size: int
+    output_size: int
+    rewrites: int
+
+
+def _count_rewrites(before: str, after: str) -> int:
+    """Number of lines changed between two versions of the code.
+
+    Lines are compared as multisets, so the count is linear in the size of the code
+    (moved lines are not counted).
+    """
+    if before == after:
+        return 0
+    old = collections.Counter(before.split("\n"))
+    new = collections.Counter(after.split("\n"))
+    return max(sum((old - new).values()), sum((new - old).values()))
+
+
+def _text(x) -> str:
+    """Code of a pass: a source, or its list of tokens (see tokenizer.tokenize)."""
+    return x if isinstance(x, str) else "".join(token.text for token in x)
+
+
+def run_pass(
+    hook: Optional[Callable[[PassRecord], None]], name: str, func, x, *args, **kwargs
+):
+    """Runs a pass on the code x and reports it to the hook, if any.
+
+    Args:
+        hook (callable): Function called with the PassRecord of the pass, or None.
+        name (str): Name of the pass.
+        func (callable): The pass. It returns the new code, or a tuple whose first
+            item is the new code.
+        x (str or list): Code before the pass, as a source or as its tokens. The
+            sizes of tokens are measured on their text.
+        *args, **kwargs: Other arguments of the pass.
+
+    Returns:
+        The result of func.
+    """
+    if hook is None:
+        return func(x, *args, **kwargs)
+
+    start = time.perf_counter()
+    result = func(x, *args, **kwargs)
+    seconds = time.perf_counter() - start
+
+    before = _text(x)
+    after = _text(result[0] if isinstance(result, tuple) else result)
+    hook(
+        PassRecord(
+            name, seconds, len(before), len(after), _count_rewrites(before, after)
+        )
+    )
+    return result
+
+
+class TranslationProfile:
+    """Collects the PassRecords of one or more translations.
+
+    An instance is a hook: pass it to translate(x, hook=profile).
+    """
+
+    def __init__(self):
+        self.records: List[PassRecord] = []
+
+    def __call__(self, record: PassRecord) -> None:
+        self.records.append(record)
+
+    def totals(self) -> List[PassRecord]:
+        """Records of each pass added over all its runs, slowest first."""
+        totals = dict()
+        for record in self.records:
+            if record.name in totals:
+                total = totals[record.name]
+                record = PassRecord(
+                    record.name,
+                    total.seconds + record.seconds,
+                    total.input_size + record.input_size,
+                    total.output_size + record.output_size,
+                    total.rewrites + record.rewrites,
+                )
+            totals[record.name] = record
+        return sorted(totals.values(), key=lambda record: record.seconds, reverse=True)
+
+    def report(self) -> str:
+        """Table of the totals of each pass, slowest first."""
+        lines = [f"{'pass':<32} {'seconds':>9} {'in':>9} {'out':>9} {'rewrites':>8}"]
+        for record in self.totals():
+            lines.append(
+                f"{record.name:<32} {record.seconds:>9.4f} {record.input_size:>9} "
+                f"{record.output_size:>9} {record.rewrites:>8}"
+            )
+        return "\n".join(lines)
@@ -0,0 +1,285 @@
+"""Single-pass lexer for JavaScript sources.
+
+The translation stages rewrite code with regular expressions, which must not touch
+the content of strings, comments or regex literals. Instead of guessing whether a
+match is quoted, the quote-sensitive stages lex the source in a single pass into a
+flat list of tokens and apply their rewrites only to the tokens of one kind (see
+map_tokens). Rewriting a token keeps the others, so consecutive quote-sensitive
+stages share one lex: remove_documentation and remove_single_declarations share the
+first one, change_operators and fix_multiline_comments the second one, and
+fix_str_plus_int (through replace_non_quoted) lexes the formatted script.
+
+The other stages (beautify, the method translators, the loop and if passes, ...)
+rewrite the source as text, often across strings and code (e.g. "abc".trim()), so
+the source is lexed again after them instead of sharing a single token stream
+through the whole translation.
+"""
+
+from typing import Callable, List, NamedTuple, Union
+
+from ee_extra.JavaScript.utils import _check_regex
+
+# Kinds of tokens.
+CODE = "code"
+COMMENT = "comment"
+STRING = "string"
+REGEX = "regex"
+
+_COMMENT = r"(?P<comment>//[^\n]*|/\*[\s\S]*?(?:\*/|\Z))"
+_STRING = (
+    r"(?P<string>"
+    r'"(?:[^"\\\n]|\\[\s\S])*"?'
+    r"|'(?:[^'\\\n]|\\[\s\S])*'?"
+    r"|`(?:[^`\\]|\\[\s\S])*`?)"
+)
+_REGEX = r"(?P<regex>/(?![*/])(?:[^/\\\[\n]|\\.|\[(?:[^\]\\\n]|\\.)*\])+/[A-Za-z]*)"
+_CODE = r"(?P<code>[^\"'`/]+|/)"
+
+# A "/" starts a regex literal (and not a division) after these characters or words.
+_REGEX_PUNCTUATORS = set("(,=:[!&|?{};+-*%<>~^")
+_REGEX_KEYWORDS = {
+    "return",
+    "typeof",
+    "case",
+    "do",
+    "else",
+    "in",
+    "of",
+    "new",
+    "delete",
+    "void",
+    "throw",
+    "yield",
+    "await",
+}
+
+
+class Token(NamedTuple):
+    """A piece of a JavaScript source.
+
+    Args:
+        kind : One of "code", "comment", "string" or "regex".
+        text : Text of the token. Joining the text of all the tokens gives back the
+            source.
+    """
+
+    kind: str
+    text: str
+
+
+_PATTERNS = {}
+
+
+def _get_patterns():
+    """Compiles the token patterns once (with and without regex literals)."""
+    if not _PATTERNS:
+        regex = _check_regex()
+        _PATTERNS["division"] = regex.compile("|".join([_COMMENT, _STRING, _CODE]))
+        _PATTERNS["regex"] = regex.compile("|".join([_COMMENT, _STRING, _REGEX, _CODE]))
+    return _PATTERNS
+
+
+def _allows_regex(code: str) -> bool:
+    """Whether a "/" after a piece of code starts a regex literal."""
+    code = code.rstrip()
+    if not code or code[-1] in _REGEX_PUNCTUATORS:
+        return True
+    start = len(code)
+    while start > 0 and (code[start - 1].isalnum() or code[start - 1] in "_$"):
+        start -= 1
+    return code[start:] in _REGEX_KEYWORDS
+
+
+def tokenize(x: str) -> List[Token]:
+    """Splits a JavaScript source into code, comment, string and regex tokens.
+
+    Consecutive code is merged in a single token, so code and non-code tokens
+    alternate. Unterminated strings end at the end of the line and unterminated
+    block comments at the end of the source.
+
+    Args:
+        x (str): A string with Javascript syntax.
+
+    Returns:
+        list: Tokens of the source.
+
+    Examples:
+        >>> from ee_extra.JavaScript.tokenizer import tokenize
+        >>> tokenize("var x = 'a//b'; // comment")
+        >>> # [Token('code', 'var x = '), Token('string', "'a//b'"), ...]
+    """
+    patterns = _get_patterns()
+    tokens = []
+    code = []
+    position = 0
+    regex_allowed = True
+
+    while position < len(x):
+        pattern = patterns["regex"] if regex_allowed else patterns["division"]
+        match = pattern.match(x, position)
+        kind, text = match.lastgroup, match.group()
+        position = match.end()
+
+        if kind == CODE:
+            code.append(text)
+            if text.strip():
+                regex_allowed = _allows_regex(text)
+            continue
+
+        if code:
+            tokens.append(Token(CODE, "".join(code)))
+            code = []
+        if kind != COMMENT:
+            regex_allowed = False
+        tokens.append(Token(kind, text))
+
+    if code:
+        tokens.append(Token(CODE, "".join(code)))
+
+    return tokens
+
+
+def untokenize(tokens: List[Token]) -> str:
+    """Joins tokens back into a source."""
+    return "".join(token.text for token in tokens)
+
+
+def map_tokens(
+    tokens: List[Token], func: Callable[[str], str], kind: str = CODE
+) -> List[Token]:
+    """Applies a rewrite to the tokens of one kind, keeping the others.
+
+    The result is the token list of the rewritten source, so it can be passed to
+    the next quote-sensitive rewrite without lexing the source again.
+
+    Args:
+        tokens (list): Tokens of a source, as returned by tokenize.
+        func (callable): Function that rewrites the text of a token.
+        kind (str): Kind of the rewritten tokens.
+
+    Returns:
+        list: Tokens of the rewritten source.
+    """
+    return [
+        Token(kind, func(token.text)) if token.kind == kind else token
+        for token in tokens
+    ]
+
+
+def map_code(x: Union[str, List[Token]], func: Callable[[str], str]) -> str:
+    """Applies a rewrite only to the code of a JavaScript source.
+
+    Args:
+        x (str or list): A string with Javascript syntax, or its tokens.
+        func (callable): Function that rewrites a piece of code.
+
+    Returns:
+        str: The source with every code token rewritten by func.
+
+    Examples:
+        >>> from ee_extra.JavaScript.tokenizer import map_code
+        >>> map_code("x = true + 'true'", lambda code: code.replace("true", "True"))
+        >>> # x = True + 'true'
+    """
+    tokens = tokenize(x) if isinstance(x, str) else x
+    return untokenize(map_tokens(tokens, func))
+
+
+def drop_line_comments(tokens: List[Token]) -> List[Token]:
+    """Removes the // comments of a lexed source, keeping the line breaks.
+
+    The code before and after a removed comment is merged into one token, so code
+    and non-code tokens still alternate.
+
+    Args:
+        tokens (list): Tokens of a source, as returned by tokenize.
+
+    Returns:
+        list: Tokens of the source without // comments.
+    """
+    result = []
+    for token in tokens:
+        if token.kind == COMMENT and token.text.startswith("//"):
+            continue
+        if token.kind == CODE and result and result[-1].kind == CODE:
+            result[-1] = Token(CODE, result[-1].text + token.text)
+        else:
+            result.append(token)
+    return result
+
+
+def remove_line_comments(x: str) -> str:
+    """Removes // comments, keeping the line breaks.
+
+    Args:
+        x (str): A string with Javascript syntax.
+
+    Returns:
+        str: The source without // comments.
+    """
+    return untokenize(drop_line_comments(tokenize(x)))
+
+
+# Words that continue the statement of a previous "}", e.g. "} else {".
+_CONTINUATIONS = ("else", "catch", "finally")
+# Characters that continue the statement of a previous line.
+_CONTINUATION_CHARS = set(".,)]}?:+-*/%&|=<>")
+
+
+def split_units(x: str) -> List[str]:
+    """Splits a JavaScript source into its top-level statements.
+
+    A unit ends with a line break that follows a ";" or a "}" outside any bracket,
+    unless the next line continues the statement (e.g. "} else {" or a line that
+    starts with "."). Comments before a statement belong to its unit. Joining the
+    units gives back the source.
+
+    Args:
+        x (str): A string with Javascript syntax.
+
+    Returns:
+        list: Top-level units (functions, var blocks, exports, ...) of the source.
+
+    Examples:
+        >>> from ee_extra.JavaScript.tokenizer import split_units
+        >>> split_units("var a = 1;\\nfunction f(x) {\\n  return x;\\n}\\n")
+        >>> # ['var a = 1;\\n', 'function f(x) {\\n  return x;\\n}\\n']
+    """
+    units = []
+    start = 0
+    depth = 0
+    last = ""
+    boundary = None
+    offset = 0
+
+    for token in tokenize(x):
+        if token.kind == CODE:
+            for index, char in enumerate(token.text):
+                if char.isspace():
+                    if char == "\n" and depth == 0 and last in (";", "}"):
+                        boundary = boundary or offset + index + 1
+                    continue
+                if boundary is not None:
+                    following = x[offset + index : offset + index + 8]
+                    if char not in _CONTINUATION_CHARS and not following.startswith(
+                        _CONTINUATIONS
+                    ):
+                        units.append(x[start:boundary])
+                        start = boundary
+                    boundary = None
+                if char in "([{":
+                    depth += 1
+                elif char in ")]}":
+                    depth = max(depth - 1, 0)
+                last = char
+        elif token.kind != COMMENT:
+            if boundary is not None:
+                units.append(x[start:boundary])
+                start = boundary
+                boundary = None
+            last = token.text[-1]
+        offset += len(token.text)
+
+    if start < len(x):
+        units.append(x[start:])
+    return units
@@ -21,9 +21,9 @@ GitHub :).
 import random
 import string
 
-from ee_extra.JavaScript.translate_general import from_bin_to_list
+from ee_extra.JavaScript.translate_general import group_lines
 
-from ee_extra.JavaScript.utils import _check_regex
+from ee_extra.JavaScript.utils import _check_regex, _get_pattern
 
 
 def random_fn_name():
@@ -98,7 +98,6 @@ def from_js_to_py_fn_simple(js_function):
         >>> from_js_to_py_fn_simple(js_function)["fun_py_style"]
         >>> # def pUsmYqrpCbaOKduJA(x):\n    return x\n
     """
-    regex = _check_regex()
 
     # 1. Get function header
     if isinstance(js_function, list):
@@ -107,11 +106,11 @@ def from_js_to_py_fn_simple(js_function):
         fn_header = js_function
 
     # is there a assignement? e.g. eeExtraExports0.addBand = function(image) {...}
-    tentative_name = regex.findall("(.*\..*)\s=\sfunction\(", fn_header)
+    tentative_name = _get_pattern("(.*\..*)\s=\sfunction\(").findall(fn_header)
 
     # 2. get function name
     pattern = r"function\s*([\x00-\x7F][^\s]+)\s*\(.*\)\s*{"
-    regex_result = regex.findall(pattern, fn_header)
+    regex_result = _get_pattern(pattern).findall(fn_header)
 
     # 3. if it is a anonymous function assign a random name
     if len(regex_result) == 0:
@@ -123,7 +122,7 @@ def from_js_to_py_fn_simple(js_function):
 
     # 4. get args
     pattern = r"function\s*[\x00-\x7F][^\s]*\s*\(\s*([^)]+?)\s*\)\s*{|function\(\s*([^)]+?)\s*\)\s*"
-    int_args = regex.findall(pattern, fn_header)
+    int_args = _get_pattern(pattern).findall(fn_header)
     if int_args == []:
         args_name = ""
     else:
@@ -138,10 +137,10 @@ def from_js_to_py_fn_simple(js_function):
 
     # 5. get body
     pattern = r"({(?>[^{}]+|(?R))*})"
-    body = regex.search(pattern, fn_header)[0][1:-1].rstrip()
+    body = _get_pattern(pattern).search(fn_header)[0][1:-1].rstrip()
 
     # 6. Init space
-    init_space = regex.match("\s*", fn_header)[0]
+    init_space = _get_pattern("\s*").match(fn_header)[0]
 
     # 7. py function info
     if tentative_name == []:
@@ -178,20 +177,18 @@ def func_detector(lines):
         >>> func_detector(lines)
         >>> # ['var a = 2;', ['function(x) {', '    function(y) return y', '}'], 'return x}']
     """
-    regex = _check_regex()
 
     pattern = r".*function.*{"
     counter = 0  # curly brackets counter
-    subgroup = list("0" * len(lines))
+    subgroup = bytearray(len(lines))
     for index, line in enumerate(lines):
-        regex_result = regex.match(pattern, line)
+        regex_result = _get_pattern(pattern).match(line)
         if regex_result or counter != 0:
-            openings = len(regex.findall("{", line))
-            closings = len(regex.findall("}", line))
+            openings = len(_get_pattern("{").findall(line))
+            closings = len(_get_pattern("}").findall(line))
             counter = counter + openings - closings
-            subgroup[index] = "1"
-    subgroups = "".join(subgroup)
-    merge_rule = from_bin_to_list(subgroups)
+            subgroup[index] = 1
+    merge_rule = group_lines(subgroup)
 
     # Create the new x string
     final_x = list()
@@ -349,7 +346,6 @@ def from_mapjs_to_py_fn_simple(js_function):
         >>> #    return y
         >>> #ic2.map(EvsFYLkYJHtiIj5au)
     """
-    regex = _check_regex()
 
     # 1. Get function header
     if isinstance(js_function, list):
@@ -359,7 +355,7 @@ def from_mapjs_to_py_fn_simple(js_function):
 
     # 2. get function name
     pattern = r"function\s*([\x00-\x7F][^\s]+)\s*\(.*\)\s*{"
-    regex_result = regex.findall(pattern, fn_header)
+    regex_result = _get_pattern(pattern).findall(fn_header)
 
     # 3. if it is a anonymous function assign a random name
     if len(regex_result) == 0:
@@ -371,7 +367,7 @@ def from_mapjs_to_py_fn_simple(js_function):
 
     # 4. get args
     pattern = r"function\s*[\x00-\x7F][^\s]*\s*\(\s*([^)]+?)\s*\)\s*{|function\(\s*([^)]+?)\s*\)\s*"
-    int_args = regex.findall(pattern, fn_header)
+    int_args = _get_pattern(pattern).findall(fn_header)
     if int_args == []:
         args_name = ""
     else:
@@ -386,10 +382,10 @@ def from_mapjs_to_py_fn_simple(js_function):
 
     # 5. get body
     pattern = r"({(?>[^{}]+|(?R))*})"
-    body = regex.search(pattern, fn_header)[0][1:-1].rstrip()
+    body = _get_pattern(pattern).search(fn_header)[0][1:-1].rstrip()
 
     # 6. Init space
-    init_space = regex.match("\s*", fn_header)[0]
+    init_space = _get_pattern("\s*").match(fn_header)[0]
 
     # 7. py function info
     py_func = f"{init_space}def {function_name}({args_name}):{body}\n"
@@ -425,21 +421,19 @@ def mapfunc_detector(lines):
         >>> # ['var ic = ee.ImageCollection([ee.Image(0), ee.Image(1)])',
         >>> #  ['ic.map(function(x){return x})']]
     """
-    regex = _check_regex()
 
     # Function detector -------------------------------------------------------
     pattern = r".*map\(.*function.*{|.*forEach\(.*function.*{"
     counter = 0  # curly brackets counter
-    subgroup = list("0" * len(lines))
+    subgroup = bytearray(len(lines))
     for index, line in enumerate(lines):
-        regex_result = regex.match(pattern, line)
+        regex_result = _get_pattern(pattern).match(line)
         if regex_result or counter != 0:
-            openings = len(regex.findall("{", line))
-            closings = len(regex.findall("}", line))
+            openings = len(_get_pattern("{").findall(line))
+            closings = len(_get_pattern("}").findall(line))
             counter = counter + openings - closings
-            subgroup[index] = "1"
-    subgroups = "".join(subgroup)
-    merge_rule = from_bin_to_list(subgroups)
+            subgroup[index] = 1
+    merge_rule = group_lines(subgroup)
 
     # Create the new x string
     final_x = list()
@@ -583,6 +577,7 @@ def func_translate_case03(x):
     >>> #     return 0;
     >>> # exports.addBand  = mNrjUIPHkCfPiM3pH
     """
+
     regex = _check_regex()
 
     # does anonymous function asignation exists?
@@ -591,7 +586,9 @@ def func_translate_case03(x):
     # Does the line starts with "exports" or "eeExtraExports"?
     pattern01 = r"(?:^|\W)exports|eeExtraExports(?:$|\W)"
     lines_to_work = [
-        index for index, line in enumerate(lines) if bool(regex.search(pattern01, line))
+        index
+        for index, line in enumerate(lines)
+        if bool(_get_pattern(pattern01).search(line))
     ]
     if len(lines_to_work) == 0:
         return x
@@ -599,13 +596,14 @@ def func_translate_case03(x):
         for index in lines_to_work:
             line = lines[index]
             # Does the line inmediately assign a function?
-            if bool(regex.search("=\s*function", line)):
+            if bool(_get_pattern("=\s*function").search(line)):
                 # Search the name
                 pattern02 = "([^=]*)="
-                export_str = regex.findall(pattern02, line)[0]
+                export_str = _get_pattern(pattern02).findall(line)[0]
                 rname = random_fn_name()
-                pattern02 = export_str + "=.*function"
-                x = regex.sub(pattern02, ("function " + rname), x)
+                # built from the code: not kept in the pattern registry
+                pattern02 = regex.escape(export_str) + "=.*function"
+                x = regex.sub(pattern02, "function " + rname, x)
 
                 # add export at the end of the file
                 x = x + "\n" + export_str + " = " + rname
@@ -1,8 +1,71 @@
 """ Functions used in 'utils.py', 'utils_general.py', and 'utils_loops.py'."""
 import keyword
-from itertools import islice, zip_longest
 
-from ee_extra.JavaScript.utils import _check_regex
+from ee_extra.JavaScript.translate_utils import EditBuffer
+from ee_extra.JavaScript.utils import _get_pattern
+
+
+def line_runs(flags, before=False, after=False):
+    """Run-length encode the flagged lines of a file.
+
+    Args:
+        flags (sequence): One truth value per line (e.g. a list of bools or a
+            bytearray).
+        before (bool): Whether to extend each run with the line before it.
+        after (bool): Whether to extend each run with the line after it.
+
+    Returns:
+        [list]: (start, stop) line indices of each run of consecutive flagged lines.
+
+    Example:
+        >>> from ee_extra.JavaScript.translate_general import line_runs
+        >>> line_runs([0, 0, 1, 1, 1, 0, 1, 0, 1])
+        >>> # [(2, 5), (6, 7), (8, 9)]
+    """
+    runs = []
+    size = len(flags)
+    index = 0
+    while index < size:
+        if not flags[index]:
+            index += 1
+            continue
+        start = index
+        while index < size and flags[index]:
+            index += 1
+        stop = index
+        if before and start > 0:
+            start -= 1
+        if after and stop < size:
+            stop += 1
+        runs.append((start, stop))
+    return runs
+
+
+def group_lines(flags, before=False, after=False):
+    """Group the indices of the lines to merge (see line_runs).
+
+    Args:
+        flags (sequence): One truth value per line.
+        before (bool): Whether to merge each run with the line before it.
+        after (bool): Whether to merge each run with the line after it.
+
+    Returns:
+        [list]: The index of each line that is not merged and a list with the
+        indices of each group of lines to merge.
+
+    Example:
+        >>> from ee_extra.JavaScript.translate_general import group_lines
+        >>> group_lines([0, 0, 1, 1, 1, 0, 1, 0, 1])
+        >>> # [0, 1, [2, 3, 4], 5, [6], 7, [8]]
+    """
+    groups = []
+    position = 0
+    for start, stop in line_runs(flags, before, after):
+        groups.extend(range(position, start))
+        groups.append(list(range(start, stop)))
+        position = stop
+    groups.extend(range(position, len(flags)))
+    return groups
 
 
 def from_bin_to_list(x):
@@ -19,40 +82,7 @@ def from_bin_to_list(x):
         >>> from_bin_to_list("001110101")
         >>> # [0, 1, [2, 3, 4], 5, [6], 7, [8]]
     """
-    group_list = list(yield_subgroups(x, subgroup_test=lambda i, j: i + j))[1:]
-    list_01 = []
-    counter = 0
-    for value2 in group_list:
-        # all are zero?
-        value2 = [int(i) for i in value2]
-        if sum(value2) == 0:
-            for _ in value2:
-                list_01.append(counter)
-                counter += 1
-        else:
-            value2 = [value + counter for value in range(len(value2))]
-            list_01.append(value2)
-            counter = value2[-1] + 1
-    return list_01
-
-
-def yield_subgroups(group, subgroup_test):
-    """Helper function to group lines see from_bin_to_list"""
-    subgroup = [0]
-    for i, j in zip_longest(group, islice(group, 1, None), fillvalue=0):
-        if subgroup_test(str(i), str(j)) in ["00", "01"]:
-            if subgroup[-1] == "0":
-                subgroup.append(i)
-            else:
-                yield subgroup
-                subgroup = [i]
-        else:
-            if subgroup[-1] == "1":
-                subgroup.append(i)
-            else:
-                yield subgroup
-                subgroup = [i]
-    yield subgroup
+    return group_lines([char == "1" for char in x])
 
 
 def var_remove(x):
@@ -71,7 +101,6 @@ def var_remove(x):
         >>> var_remove("var cesar = 10")
         >>> # cesar = 10
     """
-    regex = _check_regex()
     
     # remove single declarations
     # from "var lesly;" to ""
@@ -79,7 +108,7 @@ def var_remove(x):
     lines = x.split("\n")
     new_lines = []
     for line in lines:
-        if regex.match(pattern01, line):
+        if _get_pattern(pattern01).match(line):
             new_lines.append(line)
         else:
             new_lines.append(line)
@@ -87,8 +116,8 @@ def var_remove(x):
 
     # does it your word assignment a keyword?
     pattern02 = r"var(\s+[A-Za-z0-9Α-Ωα-ωίϊΐόάέύϋΰήώ\[\]_]+)\s*[=|in]"
-    matches = regex.findall(pattern02, x)
-    var_names = [match for match in matches]
+    matches = list(_get_pattern(pattern02).finditer(x))
+    var_names = [match.group(1) for match in matches]
 
     if set(var_names) & set(keyword.kwlist) != set():
         raise NameError(
@@ -96,11 +125,13 @@ def var_remove(x):
             "var_names: %s" % " ,".join(var_names),
         )
 
-    if not matches == []:
-        for match in matches:
-            if " in " not in match:
-                x = x.replace(f"var{match}", f"{match.replace(' ','')}")
-    return x
+    # drop the "var" of each declaration where it was matched
+    buffer = EditBuffer(x)
+    for match in matches:
+        var_name = match.group(1)
+        if " in " not in var_name:
+            buffer.replace(match.start(), match.end(1), var_name.replace(" ", ""))
+    return buffer.apply()
 
 
 def delete_brackets(x):
@@ -120,17 +151,17 @@ def delete_brackets(x):
         >>> # obj={'b':'a'}
     """
     counter = 0
-    newstring = ""
+    newstring = []
     for char in x:
         if char == "{":
             counter += 1
         elif char == "}":
             counter -= 1
         if counter >= 0:
-            newstring += char
+            newstring.append(char)
         else:
             counter = 0
-    return newstring
+    return "".join(newstring)
 
 
 def subgroups_creator_bef(groups):
@@ -142,30 +173,7 @@ def subgroups_creator_bef(groups):
     Returns:
         list: List of subgroups.
     """
-    lsubgroups = []
-    onecounter = 0
-    for index, word in enumerate(groups):
-        if word == "0":
-            if index != len(groups) - 1:
-                if groups[index + 1] == "0":
-                    lsubgroups.append(index)
-            else:
-                lsubgroups.append(index)
-        else:
-            if onecounter == 0:
-                onecounter = 1
-                start = index - 1
-                end = index
-            else:
-                end += 1
-
-            if index != len(groups) - 1:
-                if groups[index + 1] == "0":
-                    onecounter = 0
-                    lsubgroups.append(list(range(start, end + 1)))
-            else:
-                lsubgroups.append(list(range(start, end + 1)))
-    return lsubgroups
+    return group_lines([char == "1" for char in groups], before=True)
 
 
 def subgroups_creator_aft(groups):
@@ -177,25 +185,4 @@ def subgroups_creator_aft(groups):
     Returns:
         list: List of subgroups.
     """
-    lsubgroups = []
-    onecounter = 0
-    for index, word in enumerate(groups):
-        if word == "0":
-            if index != len(groups) - 1:
-                if groups[index + 1] == "0":
-                    lsubgroups.append(index + 1)
-        else:
-            if onecounter == 0:
-                onecounter = 1
-                start = index
-                end = index + 1
-            else:
-                end += 1
-
-            if index != len(groups) - 1:
-                if groups[index + 1] == "0":
-                    onecounter = 0
-                    lsubgroups.append(list(range(start, end + 1)))
-            else:
-                lsubgroups.append(list(range(start, end + 1)))
-    return [0] + lsubgroups
+    return group_lines([char == "1" for char in groups], after=True)
@@ -1,238 +1,189 @@
 from ee_extra import translate_jsm_extra as jsmextra
 from ee_extra import translate_jsm_wrappers as jsmwrappers
 from ee_extra import translate_specialfunctions as fspecial
+from ee_extra.JavaScript.profiling import run_pass
+from ee_extra.JavaScript.utils import _check_regex
 
-
-def translate_jsmethods(x):
-    """Translates Javascript methods to Python
-    Args:
-        x (str): JavaScript code to translate.
-
-    Returns:
-        str: Translated JavaScript code.
-
-    Examples:
-        >>> from ee_extra import translate_string
-        >>> translate_string(x = '"LesLywashere".substring(1,3)')
-    """
-    eextra_special_functions_to = []
-    specialfun_counter = 0
-
+# (name, translator, header) of the JavaScript methods, e.g. x.trim(), in the
+# order in which they are translated.
+JSMETHODS = [
     # 0. Returns the Unicode of the character at the specified index in a string
-    x, cond = jsmwrappers.translate_charCodeAt(x)
-    if cond:
-        specialfun_counter += 1
-        eextra_special_functions_to.append(jsmextra.local_charCodeAt())
-
+    ("charCodeAt", jsmwrappers.translate_charCodeAt, jsmextra.local_charCodeAt),
     # 1. Remove whitespace from the beginning and end of the string.
-    x, cond = jsmwrappers.translate_trim(x)
-    if cond:
-        specialfun_counter += 1
-        eextra_special_functions_to.append(jsmextra.local_trim())
-
+    ("trim", jsmwrappers.translate_trim, jsmextra.local_trim),
     # 2. Searches a string for a match against a regular expression, and returns the matches.
-    x, cond = jsmwrappers.translate_match(x)
-    if cond:
-        specialfun_counter += 1
-        eextra_special_functions_to.append(jsmextra.local_match())
-
+    ("match", jsmwrappers.translate_match, jsmextra.local_match),
     # 3. Extracts a part of a string and returns a new string.
-    x, cond = jsmwrappers.translate_slice(x)
-    if cond:
-        specialfun_counter += 1
-        eextra_special_functions_to.append(jsmextra.local_slice())
-
+    ("slice", jsmwrappers.translate_slice, jsmextra.local_slice),
     # 4. Extracts the characters from a string, beginning at a specified
     # start position, and through the specified number of character.
-    x, cond = jsmwrappers.translate_substr(x)
-    if cond:
-        specialfun_counter += 1
-        eextra_special_functions_to.append(jsmextra.local_substr())
-
+    ("substr", jsmwrappers.translate_substr, jsmextra.local_substr),
     # 5. Searches a string for a specified value, or regular expression,
     # and returns the position of the match.
-    x, cond = jsmwrappers.translate_search(x)
-    if cond:
-        specialfun_counter += 1
-        eextra_special_functions_to.append(jsmextra.local_search())
-
+    ("search", jsmwrappers.translate_search, jsmextra.local_search),
     # 6. Returns the character at the specified index (position) of a string.
-    x, cond = jsmwrappers.translate_charAt(x)
-    if cond:
-        specialfun_counter += 1
-        eextra_special_functions_to.append(jsmextra.local_charAt())
-
+    ("charAt", jsmwrappers.translate_charAt, jsmextra.local_charAt),
     # 7. Joins two or more strings, and returns a new joined strings.
-    x, cond = jsmwrappers.translate_concat(x)
-    if cond:
-        specialfun_counter += 1
-        eextra_special_functions_to.append(jsmextra.local_concat())
-
+    ("concat", jsmwrappers.translate_concat, jsmextra.local_concat),
     # 8. Returns the length of a string.
-    x, cond = jsmwrappers.translate_length(x)
-    if cond:
-        specialfun_counter += 1
-        eextra_special_functions_to.append(jsmextra.local_length())
-
+    ("length", jsmwrappers.translate_length, jsmextra.local_length),
     # 9. Returns the value of a String object.
-    x, cond = jsmwrappers.translate_toString(x)
-    if cond:
-        specialfun_counter += 1
-        eextra_special_functions_to.append(jsmextra.local_toString())
-
+    ("toString", jsmwrappers.translate_toString, jsmextra.local_toString),
     # 10. Returns the position of the first found occurrence of a
     # specified value in a string.
-    x, cond = jsmwrappers.translate_indexOf(x)
-    if cond:
-        specialfun_counter += 1
-        eextra_special_functions_to.append(jsmextra.local_indexOf())
-
+    ("indexOf", jsmwrappers.translate_indexOf, jsmextra.local_indexOf),
     # 11. Extracts the characters from a string, between two
     # specified indices.
-    x, cond = jsmwrappers.translate_substring(x)
-    if cond:
-        specialfun_counter += 1
-        eextra_special_functions_to.append(jsmextra.local_substring())
-
+    ("substring", jsmwrappers.translate_substring, jsmextra.local_substring),
     # 12. Returns the position of the last found occurrence of
     # a specified value in a string.
-    x, cond = jsmwrappers.translate_lastIndexOf(x)
-    if cond:
-        specialfun_counter += 1
-        eextra_special_functions_to.append(jsmextra.local_lastIndexOf())
-
+    ("lastIndexOf", jsmwrappers.translate_lastIndexOf, jsmextra.local_lastIndexOf),
     # 13. Converts a string to uppercase letters
-    x, cond = jsmwrappers.translate_toUpperCase(x)
-    if cond:
-        specialfun_counter += 1
-        eextra_special_functions_to.append(jsmextra.local_toUpperCase())
-
+    ("toUpperCase", jsmwrappers.translate_toUpperCase, jsmextra.local_toUpperCase),
     # 14. Compares two strings in the current locale
-    x, cond = jsmwrappers.translate_localeCompare(x)
-    if cond:
-        specialfun_counter += 1
-        eextra_special_functions_to.append(jsmextra.local_localeCompare())
-
+    (
+        "localeCompare",
+        jsmwrappers.translate_localeCompare,
+        jsmextra.local_localeCompare,
+    ),
     # 15. Converts a string to lowercase letters
-    x, cond = jsmwrappers.translate_toLowerCase(x)
-    if cond:
-        specialfun_counter += 1
-        eextra_special_functions_to.append(jsmextra.local_toLowerCase())
-
+    ("toLowerCase", jsmwrappers.translate_toLowerCase, jsmextra.local_toLowerCase),
     # Returns true if all elements in an array pass a test (provided as a function).
-    x, cond = jsmwrappers.translate_every(x)
-    if cond:
-        specialfun_counter += 1
-        eextra_special_functions_to.append(jsmextra.local_every())
-
+    ("every", jsmwrappers.translate_every, jsmextra.local_every),
     # Returns true if all elements in an array pass a test (provided as a function).
-    x, cond = jsmwrappers.translate_filter(x)
-    if cond:
-        specialfun_counter += 1
-        eextra_special_functions_to.append(jsmextra.local_filter())
-
+    ("filter", jsmwrappers.translate_filter, jsmextra.local_filter),
     # Returns true if all elements in an array pass a test (provided as a function).
-    x, cond = jsmwrappers.translate_foreach(x)
-    if cond:
-        specialfun_counter += 1
-        eextra_special_functions_to.append(jsmextra.local_foreach())
-
+    ("forEach", jsmwrappers.translate_foreach, jsmextra.local_foreach),
     # Returns true if all elements in an array pass a test (provided as a function).
-    x, cond = jsmwrappers.translate_arrayfrom(x)
-    if cond:
-        specialfun_counter += 1
-        eextra_special_functions_to.append(jsmextra.local_arrayfrom())
-
+    ("from", jsmwrappers.translate_arrayfrom, jsmextra.local_arrayfrom),
     # Returns true if x is a list.
-    x, cond = jsmwrappers.translate_isArray(x)
-    if cond:
-        specialfun_counter += 1
-        eextra_special_functions_to.append(jsmextra.local_isArray())
-
+    ("isArray", jsmwrappers.translate_isArray, jsmextra.local_isArray),
     # join method returns an array as a string.
-    x, cond = jsmwrappers.translate_join(x)
-    if cond:
-        specialfun_counter += 1
-        eextra_special_functions_to.append(jsmextra.local_join())
-
+    ("join", jsmwrappers.translate_join, jsmextra.local_join),
     # Creates a new array with the results of calling a function for every array element.
-    x, cond = jsmwrappers.translate_map(x)
-    if cond:
-        specialfun_counter += 1
-        eextra_special_functions_to.append(jsmextra.local_map())
-
+    ("map", jsmwrappers.translate_map, jsmextra.local_map),
     # The push method adds new items to the end of an array.
-    x, cond = jsmwrappers.translate_push(x)
-    if cond:
-        specialfun_counter += 1
-        eextra_special_functions_to.append(jsmextra.local_push())
-
+    ("push", jsmwrappers.translate_push, jsmextra.local_push),
     # reducer function for each value of an array , from left to right.
-    x, cond = jsmwrappers.translate_reduce(x)
-    if cond:
-        specialfun_counter += 1
-        eextra_special_functions_to.append(jsmextra.local_reduce())
-
+    ("reduce", jsmwrappers.translate_reduce, jsmextra.local_reduce),
     # reducer function for each value of an array , from right to left
-    x, cond = jsmwrappers.translate_reduceRight(x)
-    if cond:
-        specialfun_counter += 1
-        eextra_special_functions_to.append(jsmextra.local_reduceRight())
-
+    ("reduceRight", jsmwrappers.translate_reduceRight, jsmextra.local_reduceRight),
     # Remove the first element of an array and returns that element.
-    x, cond = jsmwrappers.translate_shift(x)
-    if cond:
-        specialfun_counter += 1
-        eextra_special_functions_to.append(jsmextra.local_shift())
-
+    ("shift", jsmwrappers.translate_shift, jsmextra.local_shift),
     # Remove the first element of an array and returns that element.
-    x, cond = jsmwrappers.translate_some(x)
-    if cond:
-        specialfun_counter += 1
-        eextra_special_functions_to.append(jsmextra.local_some())
-
+    ("some", jsmwrappers.translate_some, jsmextra.local_some),
     # Add elements to an array.
-    x, cond = jsmwrappers.translate_splice(x)
-    if cond:
-        specialfun_counter += 1
-        eextra_special_functions_to.append(jsmextra.local_splice())
-
+    ("splice", jsmwrappers.translate_splice, jsmextra.local_splice),
     # Add new items to the beginning of an array.
-    x, cond = jsmwrappers.translate_unshift(x)
-    if cond:
-        specialfun_counter += 1
-        eextra_special_functions_to.append(jsmextra.local_unshift())
-
+    ("unshift", jsmwrappers.translate_unshift, jsmextra.local_unshift),
     # valueOf() is the default method of any Array object... aparently does not do nothing.
-    x, cond = jsmwrappers.translate_valueOf(x)
-    if cond:
-        specialfun_counter += 1
-        eextra_special_functions_to.append(jsmextra.local_valueOf())
-
-    x, cond = fspecial.translate_fun_parseInt(x)
-    if cond:
-        specialfun_counter += 1
-        eextra_special_functions_to.append(fspecial.local_fun_parseInt())
-
-    x, cond = fspecial.translate_fun_parseFloat(x)
-    if cond:
-        specialfun_counter += 1
-        eextra_special_functions_to.append(fspecial.local_fun_parseFloat())
-
-    x, cond = fspecial.translate_fun_Number(x)
-    if cond:
-        specialfun_counter += 1
-        eextra_special_functions_to.append(fspecial.local_fun_Number())
-
-    x, cond = fspecial.translate_fun_String(x)
-    if cond:
-        specialfun_counter += 1
-        eextra_special_functions_to.append(fspecial.local_fun_String())
+    ("valueOf", jsmwrappers.translate_valueOf, jsmextra.local_valueOf),
+]
+
+# (name, translator, header) of the JavaScript global functions, e.g. parseInt(x).
+JSFUNCTIONS = [
+    ("parseInt", fspecial.translate_fun_parseInt, fspecial.local_fun_parseInt),
+    ("parseFloat", fspecial.translate_fun_parseFloat, fspecial.local_fun_parseFloat),
+    ("Number", fspecial.translate_fun_Number, fspecial.local_fun_Number),
+    ("String", fspecial.translate_fun_String, fspecial.local_fun_String),
+]
+
+_PATTERN = None
+
+
+def _jsmethods_pattern():
+    """Compiles a single alternation over every method and function name."""
+    global _PATTERN
+    if _PATTERN is None:
+        regex = _check_regex()
+        # longest names first: .substring must not be taken as .substr
+        methods = sorted((item[0] for item in JSMETHODS), key=len, reverse=True)
+        functions = sorted((item[0] for item in JSFUNCTIONS), key=len, reverse=True)
+        _PATTERN = regex.compile(
+            r"\.(%s)|(?<![\w\.])(%s)\(" % ("|".join(methods), "|".join(functions))
+        )
+    return _PATTERN
+
+
+def find_jsmethods(x):
+    """Finds the JavaScript methods and global functions used in a script.
+
+    Args:
+        x (str): JavaScript code to translate.
+
+    Returns:
+        set: Names of the methods and functions found.
+
+    Examples:
+        >>> from ee_extra.JavaScript.translate_jsm_main import find_jsmethods
+        >>> find_jsmethods("var y = parseInt(x.trim())")
+        >>> # {'parseInt', 'trim'}
+    """
+    return {match.group(match.lastindex) for match in _jsmethods_pattern().finditer(x)}
+
+
+def translate_jsmethods(x):
+    """Translates Javascript methods to Python
+    Args:
+        x (str): JavaScript code to translate.
+
+    Returns:
+        str: Translated JavaScript code.
+
+    Examples:
+        >>> from ee_extra import translate_string
+        >>> translate_string(x = '"LesLywashere".substring(1,3)')
+    """
+    x, names = _translate_jsmethods(x)
+    return x, jsmethods_header(names)
+
+
+def _translate_jsmethods(x, hook=None):
+    """Translates Javascript methods to Python and returns the names translated.
+
+    Each translator that runs is reported to the hook as "jsmethods.<name>".
+    """
+    names = []
+
+    # a scan decides which translators have something to do. It is repeated after
+    # each rewrite, since a translator can emit a method or function that a later
+    # translator handles.
+    found = find_jsmethods(x)
+
+    # the method translators share their scans of the code until one of them
+    # rewrites it
+    cases = {}
+    for table, kwargs in [(JSMETHODS, {"cases": cases}), (JSFUNCTIONS, {})]:
+        for name, translator, _ in table:
+            if name not in found:
+                continue
+            y, cond = run_pass(hook, f"jsmethods.{name}", translator, x, **kwargs)
+            if y != x:
+                cases.clear()
+                found = find_jsmethods(y)
+            x = y
+            if cond:
+                names.append(name)
+    return x, names
+
+
+def jsmethods_header(names):
+    """Python helpers of the translated Javascript methods.
+
+    Args:
+        names (list): Names of the translated methods and functions.
+
+    Returns:
+        str: Definitions of the helpers, in translation order.
+    """
+    eextra_special_functions_to = [
+        header() for name, _, header in JSMETHODS + JSFUNCTIONS if name in names
+    ]
 
     # ---------------------------------------------------------------
     # If a special function is found, return varname func too
     # ---------------------------------------------------------------
-    if specialfun_counter > 0:
+    if eextra_special_functions_to:
         eextra_special_functions_to.append(jsmextra.local_varname())
 
-    return x, "\n".join(eextra_special_functions_to)
+    return "\n".join(eextra_special_functions_to)
@@ -1,4 +1,5 @@
 from ee_extra.JavaScript.translate_utils import (
+    replace_in_order,
     search_after,
     search_after_attribute,
     search_before,
@@ -6,7 +7,7 @@ from ee_extra.JavaScript.translate_utils import (
     search_open_square_bracket,
 )
 
-from ee_extra.JavaScript.utils import _check_regex
+from ee_extra.JavaScript.utils import _get_pattern
 
 
 # -----------------------------------------------------------------------------
@@ -17,23 +18,35 @@ from ee_extra.JavaScript.utils import _check_regex
 # The functions fcondition01, fcondition02, and fcondition03 help
 # to obtain the variable name (lista), the word to replace
 # (lista.concat([5, 6, 7, 8]), and the arguments (5, 6, 7, 8).
-def get_finditer_cases(condition, text):
+def get_finditer_cases(condition, text, cases=None):
     """
     get the results after apply a naive regex cond an the position of the
     point method.
+
+    fcondition01, fcondition02 and fcondition03 scan the same text with the
+    same condition: if a cases dictionary is given, the scan is done once for
+    the three of them and kept in it (see _translate_jsmethods).
     """
-    regex = _check_regex()
-    
+    if cases is None:
+        return _finditer_cases(condition, text)
+    key = (condition, text)
+    if key not in cases:
+        cases[key] = _finditer_cases(condition, text)
+    results, results_position = cases[key]
+    return list(results), list(results_position)
+
+
+def _finditer_cases(condition, text):
     results = list()
     results_position = list()
-    for match in regex.finditer(condition, text):
+    for match in _get_pattern(condition).finditer(text):
         match_group = match.group(1)
         results.append(match_group)
         results_position.append(match.start() + len(match_group))
     return results, results_position
 
 
-def fcondition01(line, method_name, attribute=False, extra=""):
+def fcondition01(line, method_name, attribute=False, extra="", cases=None):
     """Obtain the varname
     e.g.
         - lesly.every(checkAge) -> lesly
@@ -46,7 +59,7 @@ def fcondition01(line, method_name, attribute=False, extra=""):
     else:
         fcondition = "([\w'\"\]\)%s]+?)\.%s" % (extra, method_name)
 
-    results, results_position = get_finditer_cases(fcondition, line)
+    results, results_position = get_finditer_cases(fcondition, line, cases)
 
     # if is a attribute, delete cases with parenthesis.
     if attribute:
@@ -86,7 +99,7 @@ def fcondition01(line, method_name, attribute=False, extra=""):
     return new_results
 
 
-def fcondition02(line, method_name="every", extra=""):
+def fcondition02(line, method_name="every", extra="", cases=None):
     """Obtain the word to replace
     e.g.
         - print(lesly.every(checkAge)) -> lesly.every(checkAge)
@@ -94,8 +107,8 @@ def fcondition02(line, method_name="every", extra=""):
         - ["cesar".every(checkAge)] -> "cesar".every(checkAge)
     """
     fcondition = "([\w'\"\]\)%s]+?)\.%s\((?>[^()]+|(?1))*\)" % (extra, method_name)
-    results, results_position = get_finditer_cases(fcondition, line)
-    variables = fcondition01(line, method_name=method_name, extra=extra)
+    results, results_position = get_finditer_cases(fcondition, line, cases)
+    variables = fcondition01(line, method_name=method_name, extra=extra, cases=cases)
 
     if results == []:
         return []
@@ -109,7 +122,7 @@ def fcondition02(line, method_name="every", extra=""):
     return new_results
 
 
-def fcondition03(line, method_name, extra=""):
+def fcondition03(line, method_name, extra="", cases=None):
     """Obtain the arguments
     e.g.
         - print(lesly.every(checkAge)) -> checkAge
@@ -117,8 +130,8 @@ def fcondition03(line, method_name, extra=""):
         - ["cesar".every(checkAge)] -> checkAge
     """
     fcondition = "([\w'\"\]\)%s]+?)\.%s\((?>[^()]+|(?1))*\)" % (extra, method_name)
-    results, results_position = get_finditer_cases(fcondition, line)
-    variables = fcondition01(line, method_name=method_name, extra=extra)
+    results, results_position = get_finditer_cases(fcondition, line, cases)
+    variables = fcondition01(line, method_name=method_name, extra=extra, cases=cases)
 
     if results == []:
         return []
@@ -135,11 +148,12 @@ def fcondition03(line, method_name, extra=""):
 # -----------------------------------------------------------------------------
 
 
-def translate_charAt(x):
+def translate_charAt(x, cases=None):
     """Converts string.charAt(index) to __ee_extra_charAt(string, index)
 
     Args:
         x (str): JavaScript code to translate.
+        cases (dict): Memo of the scans of the code, see get_finditer_cases.
 
     Returns:
         str: Translated JavaScript code.
@@ -151,9 +165,9 @@ def translate_charAt(x):
     # Regex conditions to get the string to replace,
     # the arguments, and the variable name.
 
-    var_names = fcondition01(x, "charAt")
-    replacement = fcondition02(x, "charAt")
-    arg_names = fcondition03(x, "charAt")
+    var_names = fcondition01(x, "charAt", cases=cases)
+    replacement = fcondition02(x, "charAt", cases=cases)
+    arg_names = fcondition03(x, "charAt", cases=cases)
 
     # if does not match the condition, return the original string
     if var_names == []:
@@ -164,17 +178,17 @@ def translate_charAt(x):
         "__ee_extra_charAt(%s, %s)" % (var_name, arg_name)
         for arg_name, var_name in zip(arg_names, var_names)
     ]
-    for z in zip(replacement, to_replace_by):
-        x = x.replace(z[0], z[1])
+    x = replace_in_order(x, zip(replacement, to_replace_by))
     return x, 1
 
 
-def translate_concat(x):
+def translate_concat(x, cases=None):
     """Converts string.concat(string1, string2, ...) to
     __ee_extra_concat(string, string1, string2, ...)
 
     Args:
         x (str): JavaScript code to translate.
+        cases (dict): Memo of the scans of the code, see get_finditer_cases.
 
     Returns:
         str: Translated JavaScript code.
@@ -185,9 +199,9 @@ def translate_concat(x):
     """
     # Regex conditions to get the string to replace,
     # the arguments, and the variable name.
-    var_names = fcondition01(x, "concat")
-    replacement = fcondition02(x, "concat")
-    arg_names = fcondition03(x, "concat")
+    var_names = fcondition01(x, "concat", cases=cases)
+    replacement = fcondition02(x, "concat", cases=cases)
+    arg_names = fcondition03(x, "concat", cases=cases)
 
     # if does not match the condition, return the original string
     if var_names == []:
@@ -198,16 +212,16 @@ def translate_concat(x):
         "__ee_extra_concat(%s, %s)" % (var_name, arg_name)
         for arg_name, var_name in zip(arg_names, var_names)
     ]
-    for z in zip(replacement, to_replace_by):
-        x = x.replace(z[0], z[1])
+    x = replace_in_order(x, zip(replacement, to_replace_by))
     return x, 1
 
 
-def translate_indexOf(x):
+def translate_indexOf(x, cases=None):
     """Converts string.indexOf(string) to __ee_extra_indexOf(string, string)
 
     Args:
         x (str): JavaScript code to translate.
+        cases (dict): Memo of the scans of the code, see get_finditer_cases.
 
     Returns:
         str: Translated JavaScript code.
@@ -218,9 +232,9 @@ def translate_indexOf(x):
     """
     # Regex conditions to get the string to replace,
     # the arguments, and the variable name.
-    var_names = fcondition01(x, "indexOf")
-    replacement = fcondition02(x, "indexOf")
-    arg_names = fcondition03(x, "indexOf")
+    var_names = fcondition01(x, "indexOf", cases=cases)
+    replacement = fcondition02(x, "indexOf", cases=cases)
+    arg_names = fcondition03(x, "indexOf", cases=cases)
 
     # if does not match the condition, return the original string
     if var_names == []:
@@ -231,17 +245,17 @@ def translate_indexOf(x):
         "__ee_extra_indexOf(%s, %s)" % (var_name, arg_name)
         for arg_name, var_name in zip(arg_names, var_names)
     ]
-    for z in zip(replacement, to_replace_by):
-        x = x.replace(z[0], z[1])
+    x = replace_in_order(x, zip(replacement, to_replace_by))
     return x, 1
 
 
-def translate_lastIndexOf(x):
+def translate_lastIndexOf(x, cases=None):
     """Converts string.lastIndexOf(string) to
     __ee_extra_lastIndexOf(string, string)
 
     Args:
         x (str): JavaScript code to translate.
+        cases (dict): Memo of the scans of the code, see get_finditer_cases.
 
     Returns:
         str: Translated JavaScript code.
@@ -252,9 +266,9 @@ def translate_lastIndexOf(x):
     """
     # Regex conditions to get the string to replace,
     # the arguments, and the variable name.
-    var_names = fcondition01(x, "lastIndexOf")
-    replacement = fcondition02(x, "lastIndexOf")
-    arg_names = fcondition03(x, "lastIndexOf")
+    var_names = fcondition01(x, "lastIndexOf", cases=cases)
+    replacement = fcondition02(x, "lastIndexOf", cases=cases)
+    arg_names = fcondition03(x, "lastIndexOf", cases=cases)
 
     # if does not match the condition, return the original string
     if var_names == []:
@@ -265,17 +279,17 @@ def translate_lastIndexOf(x):
         "__ee_extra_lastIndexOf(%s, %s)" % (var_name, arg_name)
         for arg_name, var_name in zip(arg_names, var_names)
     ]
-    for z in zip(replacement, to_replace_by):
-        x = x.replace(z[0], z[1])
+    x = replace_in_order(x, zip(replacement, to_replace_by))
     return x, 1
 
 
-def translate_localeCompare(x):
+def translate_localeCompare(x, cases=None):
     """Converts string.localeCompare(compareString) to
     __ee_extra_localeCompare(string, compareString)
 
     Args:
         x (str): JavaScript code to translate.
+        cases (dict): Memo of the scans of the code, see get_finditer_cases.
 
     Returns:
         str: Translated JavaScript code.
@@ -286,9 +300,9 @@ def translate_localeCompare(x):
     """
     # Regex conditions to get the string to replace,
     # the arguments, and the variable name.
-    var_names = fcondition01(x, "localeCompare")
-    replacement = fcondition02(x, "localeCompare")
-    arg_names = fcondition03(x, "localeCompare")
+    var_names = fcondition01(x, "localeCompare", cases=cases)
+    replacement = fcondition02(x, "localeCompare", cases=cases)
+    arg_names = fcondition03(x, "localeCompare", cases=cases)
 
     # if does not match the condition, return the original string
     if var_names == []:
@@ -299,16 +313,16 @@ def translate_localeCompare(x):
         "__ee_extra_localeCompare(%s, %s)" % (var_name, arg_name)
         for arg_name, var_name in zip(arg_names, var_names)
     ]
-    for z in zip(replacement, to_replace_by):
-        x = x.replace(z[0], z[1])
+    x = replace_in_order(x, zip(replacement, to_replace_by))
     return x, 1
 
 
-def translate_length(x):
+def translate_length(x, cases=None):
     """Converts string.length to __ee_extra_length(string)
 
     Args:
         x (str): JavaScript code to translate.
+        cases (dict): Memo of the scans of the code, see get_finditer_cases.
 
     Returns:
         str: Translated JavaScript code.
@@ -320,7 +334,7 @@ def translate_length(x):
 
     # Regex conditions to get the string to replace,
     # the arguments, and the variable name.
-    var_names = fcondition01(x, "length", attribute=True)
+    var_names = fcondition01(x, "length", attribute=True, cases=cases)
     replacement = [var_name + ".length" for var_name in var_names]
 
     # if does not match the condition, return the original string
@@ -329,16 +343,16 @@ def translate_length(x):
 
     # Replace string by our built-in function
     to_replace_by = ["__ee_extra_length(%s)" % var_name for var_name in var_names]
-    for z in zip(replacement, to_replace_by):
-        x = x.replace(z[0], z[1])
+    x = replace_in_order(x, zip(replacement, to_replace_by))
     return x, 1
 
 
-def translate_match(x):
+def translate_match(x, cases=None):
     """Converts string.match(regexp) to __ee_extra_match(string, regexp)
 
     Args:
         x (str): JavaScript code to translate.
+        cases (dict): Memo of the scans of the code, see get_finditer_cases.
 
     Returns:
         str: Translated JavaScript code.
@@ -349,9 +363,9 @@ def translate_match(x):
     """
     # Regex conditions to get the string to replace,
     # the arguments, and the variable name.
-    var_names = fcondition01(x, "match")
-    replacement = fcondition02(x, "match")
-    arg_names = fcondition03(x, "match")
+    var_names = fcondition01(x, "match", cases=cases)
+    replacement = fcondition02(x, "match", cases=cases)
+    arg_names = fcondition03(x, "match", cases=cases)
 
     # if does not match the condition, return the original string
     if var_names == []:
@@ -362,16 +376,16 @@ def translate_match(x):
         "__ee_extra_match(%s, %s)" % (var_name, arg_name)
         for arg_name, var_name in zip(arg_names, var_names)
     ]
-    for z in zip(replacement, to_replace_by):
-        x = x.replace(z[0], z[1])
+    x = replace_in_order(x, zip(replacement, to_replace_by))
     return x, 1
 
 
-def translate_search(x):
+def translate_search(x, cases=None):
     """Converts string.search(regexp) to __ee_extra_search(string, regexp)
 
     Args:
         x (str): JavaScript code to translate.
+        cases (dict): Memo of the scans of the code, see get_finditer_cases.
 
     Returns:
         str: Translated JavaScript code.
@@ -382,9 +396,9 @@ def translate_search(x):
     """
     # Regex conditions to get the string to replace,
     # the arguments, and the variable name.
-    var_names = fcondition01(x, "search")
-    replacement = fcondition02(x, "search")
-    arg_names = fcondition03(x, "search")
+    var_names = fcondition01(x, "search", cases=cases)
+    replacement = fcondition02(x, "search", cases=cases)
+    arg_names = fcondition03(x, "search", cases=cases)
 
     # if does not match the condition, return the original string
     if var_names == []:
@@ -395,16 +409,16 @@ def translate_search(x):
         "__ee_extra_search(%s, %s)" % (var_name, arg_name)
         for arg_name, var_name in zip(arg_names, var_names)
     ]
-    for z in zip(replacement, to_replace_by):
-        x = x.replace(z[0], z[1])
+    x = replace_in_order(x, zip(replacement, to_replace_by))
     return x, 1
 
 
-def translate_slice(x):
+def translate_slice(x, cases=None):
     """Converts string.slice(start, end) to __ee_extra_slice(string, start, end)
 
     Args:
         x (str): JavaScript code to translate.
+        cases (dict): Memo of the scans of the code, see get_finditer_cases.
 
     Returns:
         str: Translated JavaScript code.
@@ -415,9 +429,9 @@ def translate_slice(x):
     """
     # Regex conditions to get the string to replace,
     # the arguments, and the variable name.
-    var_names = fcondition01(x, "slice")
-    replacement = fcondition02(x, "slice")
-    arg_names = fcondition03(x, "slice")
+    var_names = fcondition01(x, "slice", cases=cases)
+    replacement = fcondition02(x, "slice", cases=cases)
+    arg_names = fcondition03(x, "slice", cases=cases)
 
     # if does not match the condition, return the original string
     if var_names == []:
@@ -428,16 +442,16 @@ def translate_slice(x):
         "__ee_extra_slice(%s, %s)" % (var_name, arg_name)
         for arg_name, var_name in zip(arg_names, var_names)
     ]
-    for z in zip(replacement, to_replace_by):
-        x = x.replace(z[0], z[1])
+    x = replace_in_order(x, zip(replacement, to_replace_by))
     return x, 1
 
 
-def translate_substr(x):
+def translate_substr(x, cases=None):
     """Converts string.substr(start, length)
     to __ee_extra_substr(string, start, length)
     Args:
         x (str): JavaScript code to translate.
+        cases (dict): Memo of the scans of the code, see get_finditer_cases.
 
     Returns:
         str: Translated JavaScript code.
@@ -448,9 +462,9 @@ def translate_substr(x):
     """
     # Regex conditions to get the string to replace,
     # the arguments, and the variable name.
-    var_names = fcondition01(x, "substr")
-    replacement = fcondition02(x, "substr")
-    arg_names = fcondition03(x, "substr")
+    var_names = fcondition01(x, "substr", cases=cases)
+    replacement = fcondition02(x, "substr", cases=cases)
+    arg_names = fcondition03(x, "substr", cases=cases)
 
     # if does not match the condition, return the original string
     if var_names == []:
@@ -461,16 +475,16 @@ def translate_substr(x):
         "__ee_extra_substr(%s, %s)" % (var_name, arg_name)
         for arg_name, var_name in zip(arg_names, var_names)
     ]
-    for z in zip(replacement, to_replace_by):
-        x = x.replace(z[0], z[1])
+    x = replace_in_order(x, zip(replacement, to_replace_by))
     return x, 1
 
 
-def translate_substring(x):
+def translate_substring(x, cases=None):
     """Converts string.substring(start, length)
     to __ee_extra_substring(string, start, length)
     Args:
         x (str): JavaScript code to translate.
+        cases (dict): Memo of the scans of the code, see get_finditer_cases.
 
     Returns:
         str: Translated JavaScript code.
@@ -481,9 +495,9 @@ def translate_substring(x):
     """
     # Regex conditions to get the string to replace,
     # the arguments, and the variable name.
-    var_names = fcondition01(x, "substring")
-    replacement = fcondition02(x, "substring")
-    arg_names = fcondition03(x, "substring")
+    var_names = fcondition01(x, "substring", cases=cases)
+    replacement = fcondition02(x, "substring", cases=cases)
+    arg_names = fcondition03(x, "substring", cases=cases)
 
     # if does not match the condition, return the original string
     if var_names == []:
@@ -494,15 +508,15 @@ def translate_substring(x):
         "__ee_extra_substring(%s, %s)" % (var_name, arg_name)
         for arg_name, var_name in zip(arg_names, var_names)
     ]
-    for z in zip(replacement, to_replace_by):
-        x = x.replace(z[0], z[1])
+    x = replace_in_order(x, zip(replacement, to_replace_by))
     return x, 1
 
 
-def translate_toLowerCase(x):
+def translate_toLowerCase(x, cases=None):
     """Converts string.toLowerCase() to __ee_extra_toLowerCase(string)
     Args:
         x (str): JavaScript code to translate.
+        cases (dict): Memo of the scans of the code, see get_finditer_cases.
 
     Returns:
         str: Translated JavaScript code.
@@ -513,9 +527,9 @@ def translate_toLowerCase(x):
     """
     # Regex conditions to get the string to replace,
     # the arguments, and the variable name.
-    var_names = fcondition01(x, "toLowerCase")
-    replacement = fcondition02(x, "toLowerCase")
-    arg_names = fcondition03(x, "toLowerCase")
+    var_names = fcondition01(x, "toLowerCase", cases=cases)
+    replacement = fcondition02(x, "toLowerCase", cases=cases)
+    arg_names = fcondition03(x, "toLowerCase", cases=cases)
 
     # if does not match the condition, return the original string
     if var_names == []:
@@ -525,15 +539,15 @@ def translate_toLowerCase(x):
     to_replace_by = [
         "__ee_extra_toLowerCase(%s)" % (var_name) for var_name in var_names
     ]
-    for z in zip(replacement, to_replace_by):
-        x = x.replace(z[0], z[1])
+    x = replace_in_order(x, zip(replacement, to_replace_by))
     return x, 1
 
 
-def translate_toLocaleLowerCase(x):
+def translate_toLocaleLowerCase(x, cases=None):
     """Converts string.toLocaleLowerCase() to __ee_extra_toLowerCase(string)
     Args:
         x (str): JavaScript code to translate.
+        cases (dict): Memo of the scans of the code, see get_finditer_cases.
 
     Returns:
         str: Translated JavaScript code.
@@ -544,8 +558,8 @@ def translate_toLocaleLowerCase(x):
     """
     # Regex conditions to get the string to replace,
     # the arguments, and the variable name.
-    var_names = fcondition01(x, "toLocaleLowerCase")
-    replacement = fcondition02(x, "toLocaleLowerCase")
+    var_names = fcondition01(x, "toLocaleLowerCase", cases=cases)
+    replacement = fcondition02(x, "toLocaleLowerCase", cases=cases)
 
     # if does not match the condition, return the original string
     if var_names == []:
@@ -555,15 +569,15 @@ def translate_toLocaleLowerCase(x):
     to_replace_by = [
         "__ee_extra_toLowerCase(%s)" % (var_name) for var_name in var_names
     ]
-    for z in zip(replacement, to_replace_by):
-        x = x.replace(z[0], z[1])
+    x = replace_in_order(x, zip(replacement, to_replace_by))
     return x, 1
 
 
-def translate_toUpperCase(x):
+def translate_toUpperCase(x, cases=None):
     """Converts string.toUpperCase() to __ee_extra_toUpperCase(string)
     Args:
         x (str): JavaScript code to translate.
+        cases (dict): Memo of the scans of the code, see get_finditer_cases.
 
     Returns:
         str: Translated JavaScript code.
@@ -574,8 +588,8 @@ def translate_toUpperCase(x):
     """
     # Regex conditions to get the string to replace,
     # the arguments, and the variable name.
-    var_names = fcondition01(x, "toUpperCase")
-    replacement = fcondition02(x, "toUpperCase")
+    var_names = fcondition01(x, "toUpperCase", cases=cases)
+    replacement = fcondition02(x, "toUpperCase", cases=cases)
 
     # if does not match the condition, return the original string
     if var_names == []:
@@ -585,15 +599,15 @@ def translate_toUpperCase(x):
     to_replace_by = [
         "__ee_extra_toUpperCase(%s)" % (var_name) for var_name in var_names
     ]
-    for z in zip(replacement, to_replace_by):
-        x = x.replace(z[0], z[1])
+    x = replace_in_order(x, zip(replacement, to_replace_by))
     return x, 1
 
 
-def translate_toLocaleUpperCase(x):
+def translate_toLocaleUpperCase(x, cases=None):
     """Converts string.toLocaleUpperCase() to __ee_extra_toUpperCase(string)
     Args:
         x (str): JavaScript code to translate.
+        cases (dict): Memo of the scans of the code, see get_finditer_cases.
 
     Returns:
         str: Translated JavaScript code.
@@ -604,8 +618,8 @@ def translate_toLocaleUpperCase(x):
     """
     # Regex conditions to get the string to replace,
     # the arguments, and the variable name.
-    var_names = fcondition01(x, "toLocaleUpperCase")
-    replacement = fcondition02(x, "toLocaleUpperCase")
+    var_names = fcondition01(x, "toLocaleUpperCase", cases=cases)
+    replacement = fcondition02(x, "toLocaleUpperCase", cases=cases)
 
     # if does not match the condition, return the original string
     if var_names == []:
@@ -615,15 +629,15 @@ def translate_toLocaleUpperCase(x):
     to_replace_by = [
         "__ee_extra_toUpperCase(%s)" % (var_name) for var_name in var_names
     ]
-    for z in zip(replacement, to_replace_by):
-        x = x.replace(z[0], z[1])
+    x = replace_in_order(x, zip(replacement, to_replace_by))
     return x, 1
 
 
-def translate_toString(x):
+def translate_toString(x, cases=None):
     """Converts string.toString() to __ee_extra_toString(string)
     Args:
         x (str): JavaScript code to translate.
+        cases (dict): Memo of the scans of the code, see get_finditer_cases.
 
     Returns:
         str: Translated JavaScript code.
@@ -634,8 +648,8 @@ def translate_toString(x):
     """
     # Regex conditions to get the string to replace,
     # the arguments, and the variable name.
-    var_names = fcondition01(x, "toString")
-    replacement = fcondition02(x, "toString")
+    var_names = fcondition01(x, "toString", cases=cases)
+    replacement = fcondition02(x, "toString", cases=cases)
 
     # if does not match the condition, return the original string
     if var_names == []:
@@ -643,15 +657,15 @@ def translate_toString(x):
 
     # Replace string by our built-in function
     to_replace_by = ["__ee_extra_toString(%s)" % (var_name) for var_name in var_names]
-    for z in zip(replacement, to_replace_by):
-        x = x.replace(z[0], z[1])
+    x = replace_in_order(x, zip(replacement, to_replace_by))
     return x, 1
 
 
-def translate_trim(x):
+def translate_trim(x, cases=None):
     """Converts string.trim() to __ee_extra_trim(string)
     Args:
         x (str): JavaScript code to translate.
+        cases (dict): Memo of the scans of the code, see get_finditer_cases.
 
     Returns:
         str: Translated JavaScript code.
@@ -662,8 +676,8 @@ def translate_trim(x):
     """
     # Regex conditions to get the string to replace,
     # the arguments, and the variable name.
-    var_names = fcondition01(x, "trim", extra="\s")
-    replacement = fcondition02(x, "trim", extra="\s")
+    var_names = fcondition01(x, "trim", extra="\s", cases=cases)
+    replacement = fcondition02(x, "trim", extra="\s", cases=cases)
 
     # if does not match the condition, return the original string
     if var_names == []:
@@ -671,16 +685,16 @@ def translate_trim(x):
 
     # Replace string by our built-in function
     to_replace_by = ["__ee_extra_trim(%s)" % (var_name) for var_name in var_names]
-    for z in zip(replacement, to_replace_by):
-        x = x.replace(z[0], z[1])
+    x = replace_in_order(x, zip(replacement, to_replace_by))
     return x, 1
 
 
-def translate_charCodeAt(x):
+def translate_charCodeAt(x, cases=None):
     """Converts string.charCodeAt(index) to __ee_extra_charCodeAt(string, index)
 
     Args:
         x (str): JavaScript code to translate.
+        cases (dict): Memo of the scans of the code, see get_finditer_cases.
 
     Returns:
         str: Translated JavaScript code.
@@ -691,9 +705,9 @@ def translate_charCodeAt(x):
     """
     # Regex conditions to get the string to replace,
     # the arguments, and the variable name.
-    var_names = fcondition01(x, "charCodeAt")
-    replacement = fcondition02(x, "charCodeAt")
-    arg_names = fcondition03(x, "charCodeAt")
+    var_names = fcondition01(x, "charCodeAt", cases=cases)
+    replacement = fcondition02(x, "charCodeAt", cases=cases)
+    arg_names = fcondition03(x, "charCodeAt", cases=cases)
 
     # if does not match the condition, return the original string
     if var_names == []:
@@ -704,16 +718,16 @@ def translate_charCodeAt(x):
         "__ee_extra_charCodeAt(%s, %s)" % (var_name, arg_name)
         for arg_name, var_name in zip(arg_names, var_names)
     ]
-    for z in zip(replacement, to_replace_by):
-        x = x.replace(z[0], z[1])
+    x = replace_in_order(x, zip(replacement, to_replace_by))
     return x, 1
 
 
-def translate_every(x):
+def translate_every(x, cases=None):
     """Converts list.every(function, thisValue) to __ee_extra_every(function, thisValue)
 
     Args:
         x (str): JavaScript code to translate.
+        cases (dict): Memo of the scans of the code, see get_finditer_cases.
 
     Returns:
         str: Translated JavaScript code.
@@ -727,9 +741,9 @@ def translate_every(x):
     """
     # Regex conditions to get the string to replace,
     # the arguments, and the variable name.
-    var_names = fcondition01(x, "every")
-    replacement = fcondition02(x, "every")
-    arg_names = fcondition03(x, "every")
+    var_names = fcondition01(x, "every", cases=cases)
+    replacement = fcondition02(x, "every", cases=cases)
+    arg_names = fcondition03(x, "every", cases=cases)
 
     # if does not match the condition, return the original string
     if var_names == []:
@@ -740,16 +754,16 @@ def translate_every(x):
         "__ee_extra_every(%s, %s)" % (var_name, arg_name)
         for arg_name, var_name in zip(arg_names, var_names)
     ]
-    for z in zip(replacement, to_replace_by):
-        x = x.replace(z[0], z[1])
+    x = replace_in_order(x, zip(replacement, to_replace_by))
     return x, 1
 
 
-def translate_filter(x):
+def translate_filter(x, cases=None):
     """Converts list.filter(function, thisValue) to __ee_extra_filter(function, thisValue)
 
     Args:
         x (str): JavaScript code to translate.
+        cases (dict): Memo of the scans of the code, see get_finditer_cases.
 
     Returns:
         str: Translated JavaScript code.
@@ -763,9 +777,9 @@ def translate_filter(x):
     """
     # Regex conditions to get the string to replace,
     # the arguments, and the variable name.
-    var_names = fcondition01(x, "filter")
-    replacement = fcondition02(x, "filter")
-    arg_names = fcondition03(x, "filter")
+    var_names = fcondition01(x, "filter", cases=cases)
+    replacement = fcondition02(x, "filter", cases=cases)
+    arg_names = fcondition03(x, "filter", cases=cases)
 
     # if does not match the condition, return the original string
     if var_names == []:
@@ -776,16 +790,16 @@ def translate_filter(x):
         "__ee_extra_filter(%s, %s)" % (var_name, arg_name)
         for arg_name, var_name in zip(arg_names, var_names)
     ]
-    for z in zip(replacement, to_replace_by):
-        x = x.replace(z[0], z[1])
+    x = replace_in_order(x, zip(replacement, to_replace_by))
     return x, 1
 
 
-def translate_foreach(x):
+def translate_foreach(x, cases=None):
     """Converts list.foreach(function) to __ee_extra_foreach(function, list)
 
     Args:
         x (str): JavaScript code to translate.
+        cases (dict): Memo of the scans of the code, see get_finditer_cases.
 
     Returns:
         str: Translated JavaScript code.
@@ -799,9 +813,9 @@ def translate_foreach(x):
     """
     # Regex conditions to get the string to replace,
     # the arguments, and the variable name.
-    var_names = fcondition01(x, "forEach")
-    replacement = fcondition02(x, "forEach")
-    arg_names = fcondition03(x, "forEach")
+    var_names = fcondition01(x, "forEach", cases=cases)
+    replacement = fcondition02(x, "forEach", cases=cases)
+    arg_names = fcondition03(x, "forEach", cases=cases)
 
     # if does not match the condition, return the original string
     if var_names == []:
@@ -812,16 +826,16 @@ def translate_foreach(x):
         "__ee_extra_foreach(%s, %s)" % (var_name, arg_name)
         for arg_name, var_name in zip(arg_names, var_names)
     ]
-    for z in zip(replacement, to_replace_by):
-        x = x.replace(z[0], z[1])
+    x = replace_in_order(x, zip(replacement, to_replace_by))
     return x, 1
 
 
-def translate_arrayfrom(x):
+def translate_arrayfrom(x, cases=None):
     """Converts Array.from(iterable) to __ee_extra_arrayfrom(iterable)
 
     Args:
         x (str): JavaScript code to translate.
+        cases (dict): Memo of the scans of the code, see get_finditer_cases.
 
     Returns:
         str: Translated JavaScript code.
@@ -833,9 +847,9 @@ def translate_arrayfrom(x):
     """
     # Regex conditions to get the string to replace,
     # the arguments, and the variable name.
-    var_names = fcondition01(x, "from")
-    replacement = fcondition02(x, "from")
-    arg_names = fcondition03(x, "from")
+    var_names = fcondition01(x, "from", cases=cases)
+    replacement = fcondition02(x, "from", cases=cases)
+    arg_names = fcondition03(x, "from", cases=cases)
 
     # if does not match the condition, return the original string
     if var_names == []:
@@ -846,16 +860,16 @@ def translate_arrayfrom(x):
         "__ee_extra_arrayfrom(%s)" % (arg_name)
         for arg_name, _ in zip(arg_names, var_names)
     ]
-    for z in zip(replacement, to_replace_by):
-        x = x.replace(z[0], z[1])
+    x = replace_in_order(x, zip(replacement, to_replace_by))
     return x, 1
 
 
-def translate_isArray(x):
+def translate_isArray(x, cases=None):
     """Converts Array.isArray(list) to __ee_extra_isArray(list)
 
     Args:
         x (str): JavaScript code to translate.
+        cases (dict): Memo of the scans of the code, see get_finditer_cases.
 
     Returns:
         str: Translated JavaScript code.
@@ -867,9 +881,9 @@ def translate_isArray(x):
     """
     # Regex conditions to get the string to replace,
     # the arguments, and the variable name.
-    var_names = fcondition01(x, "isArray")
-    replacement = fcondition02(x, "isArray")
-    arg_names = fcondition03(x, "isArray")
+    var_names = fcondition01(x, "isArray", cases=cases)
+    replacement = fcondition02(x, "isArray", cases=cases)
+    arg_names = fcondition03(x, "isArray", cases=cases)
 
     # if does not match the condition, return the original string
     if var_names == []:
@@ -880,16 +894,16 @@ def translate_isArray(x):
         "__ee_extra_isArray(%s)" % (arg_name)
         for arg_name, _ in zip(arg_names, var_names)
     ]
-    for z in zip(replacement, to_replace_by):
-        x = x.replace(z[0], z[1])
+    x = replace_in_order(x, zip(replacement, to_replace_by))
     return x, 1
 
 
-def translate_join(x):
+def translate_join(x, cases=None):
     """Converts list.join(separator) to __ee_extra_isArray(list, separator)
 
     Args:
         x (str): JavaScript code to translate.
+        cases (dict): Memo of the scans of the code, see get_finditer_cases.
 
     Returns:
         str: Translated JavaScript code.
@@ -901,9 +915,9 @@ def translate_join(x):
     """
     # Regex conditions to get the string to replace,
     # the arguments, and the variable name.
-    var_names = fcondition01(x, "join")
-    replacement = fcondition02(x, "join")
-    arg_names = fcondition03(x, "join")
+    var_names = fcondition01(x, "join", cases=cases)
+    replacement = fcondition02(x, "join", cases=cases)
+    arg_names = fcondition03(x, "join", cases=cases)
     if arg_names == [""]:
         arg_names = ['","']
 
@@ -916,16 +930,16 @@ def translate_join(x):
         "__ee_extra_join(%s, %s)" % (var_name, arg_name)
         for arg_name, var_name in zip(arg_names, var_names)
     ]
-    for z in zip(replacement, to_replace_by):
-        x = x.replace(z[0], z[1])
+    x = replace_in_order(x, zip(replacement, to_replace_by))
     return x, 1
 
 
-def translate_map(x):
+def translate_map(x, cases=None):
     """Converts list.map(function) to __ee_extra_map(list, function)
 
     Args:
         x (str): JavaScript code to translate.
+        cases (dict): Memo of the scans of the code, see get_finditer_cases.
 
     Returns:
         str: Translated JavaScript code.
@@ -937,9 +951,9 @@ def translate_map(x):
     """
     # Regex conditions to get the string to replace,
     # the arguments, and the variable name.
-    var_names = fcondition01(x, "map")
-    replacement = fcondition02(x, "map")
-    arg_names = fcondition03(x, "map")
+    var_names = fcondition01(x, "map", cases=cases)
+    replacement = fcondition02(x, "map", cases=cases)
+    arg_names = fcondition03(x, "map", cases=cases)
 
     # if does not match the condition, return the original string
     if var_names == []:
@@ -950,16 +964,16 @@ def translate_map(x):
         "__ee_extra_map(%s, %s)" % (var_name, arg_name)
         for arg_name, var_name in zip(arg_names, var_names)
     ]
-    for z in zip(replacement, to_replace_by):
-        x = x.replace(z[0], z[1])
+    x = replace_in_order(x, zip(replacement, to_replace_by))
     return x, 1
 
 
-def translate_push(x):
+def translate_push(x, cases=None):
     """Converts list.push(v1, v2, ....) to __ee_extra_push(list, v1, v2, ...)
 
     Args:
         x (str): JavaScript code to translate.
+        cases (dict): Memo of the scans of the code, see get_finditer_cases.
 
     Returns:
         str: Translated JavaScript code.
@@ -971,9 +985,9 @@ def translate_push(x):
     """
     # Regex conditions to get the string to replace,
     # the arguments, and the variable name.
-    var_names = fcondition01(x, "push")
-    replacement = fcondition02(x, "push")
-    arg_names = fcondition03(x, "push")
+    var_names = fcondition01(x, "push", cases=cases)
+    replacement = fcondition02(x, "push", cases=cases)
+    arg_names = fcondition03(x, "push", cases=cases)
 
     # if does not match the condition, return the original string
     if var_names == []:
@@ -984,16 +998,16 @@ def translate_push(x):
         "__ee_extra_push(%s, %s)" % (var_name, arg_name)
         for arg_name, var_name in zip(arg_names, var_names)
     ]
-    for z in zip(replacement, to_replace_by):
-        x = x.replace(z[0], z[1])
+    x = replace_in_order(x, zip(replacement, to_replace_by))
     return x, 1
 
 
-def translate_reduce(x):
+def translate_reduce(x, cases=None):
     """Converts list.reduce(function) to __ee_extra_reduce(list, function)
 
     Args:
         x (str): JavaScript code to translate.
+        cases (dict): Memo of the scans of the code, see get_finditer_cases.
 
     Returns:
         str: Translated JavaScript code.
@@ -1007,9 +1021,9 @@ def translate_reduce(x):
     """
     # Regex conditions to get the string to replace,
     # the arguments, and the variable name.
-    var_names = fcondition01(x, "reduce")
-    replacement = fcondition02(x, "reduce")
-    arg_names = fcondition03(x, "reduce")
+    var_names = fcondition01(x, "reduce", cases=cases)
+    replacement = fcondition02(x, "reduce", cases=cases)
+    arg_names = fcondition03(x, "reduce", cases=cases)
 
     # if does not match the condition, return the original string
     if var_names == []:
@@ -1020,16 +1034,16 @@ def translate_reduce(x):
         "__ee_extra_reduce(%s, %s)" % (var_name, arg_name)
         for arg_name, var_name in zip(arg_names, var_names)
     ]
-    for z in zip(replacement, to_replace_by):
-        x = x.replace(z[0], z[1])
+    x = replace_in_order(x, zip(replacement, to_replace_by))
     return x, 1
 
 
-def translate_reduceRight(x):
+def translate_reduceRight(x, cases=None):
     """Converts list.reduceRight(function) to __ee_extra_reduceRight(list, function)
 
     Args:
         x (str): JavaScript code to translate.
+        cases (dict): Memo of the scans of the code, see get_finditer_cases.
 
     Returns:
         str: Translated JavaScript code.
@@ -1043,9 +1057,9 @@ def translate_reduceRight(x):
     """
     # Regex conditions to get the string to replace,
     # the arguments, and the variable name.
-    var_names = fcondition01(x, "reduceRight")
-    replacement = fcondition02(x, "reduceRight")
-    arg_names = fcondition03(x, "reduceRight")
+    var_names = fcondition01(x, "reduceRight", cases=cases)
+    replacement = fcondition02(x, "reduceRight", cases=cases)
+    arg_names = fcondition03(x, "reduceRight", cases=cases)
 
     # if does not match the condition, return the original string
     if var_names == []:
@@ -1056,16 +1070,16 @@ def translate_reduceRight(x):
         "__ee_extra_reduceRight(%s, %s)" % (var_name, arg_name)
         for arg_name, var_name in zip(arg_names, var_names)
     ]
-    for z in zip(replacement, to_replace_by):
-        x = x.replace(z[0], z[1])
+    x = replace_in_order(x, zip(replacement, to_replace_by))
     return x, 1
 
 
-def translate_shift(x):
+def translate_shift(x, cases=None):
     """Converts list.shift() to __ee_extra_shift(list)
 
     Args:
         x (str): JavaScript code to translate.
+        cases (dict): Memo of the scans of the code, see get_finditer_cases.
 
     Returns:
         str: Translated JavaScript code.
@@ -1079,8 +1093,8 @@ def translate_shift(x):
     """
     # Regex conditions to get the string to replace,
     # the arguments, and the variable name.
-    var_names = fcondition01(x, "shift")
-    replacement = fcondition02(x, "shift")
+    var_names = fcondition01(x, "shift", cases=cases)
+    replacement = fcondition02(x, "shift", cases=cases)
 
     # if does not match the condition, return the original string
     if var_names == []:
@@ -1088,16 +1102,16 @@ def translate_shift(x):
 
     # Replace string by our built-in function
     to_replace_by = ["__ee_extra_shift(%s)" % (var_name) for var_name in var_names]
-    for z in zip(replacement, to_replace_by):
-        x = x.replace(z[0], z[1])
+    x = replace_in_order(x, zip(replacement, to_replace_by))
     return x, 1
 
 
-def translate_some(x):
+def translate_some(x, cases=None):
     """Converts list.some(function) to __ee_extra_some(list, function)
 
     Args:
         x (str): JavaScript code to translate.
+        cases (dict): Memo of the scans of the code, see get_finditer_cases.
 
     Returns:
         str: Translated JavaScript code.
@@ -1111,9 +1125,9 @@ def translate_some(x):
     """
     # Regex conditions to get the string to replace,
     # the arguments, and the variable name.
-    var_names = fcondition01(x, "some")
-    replacement = fcondition02(x, "some")
-    arg_names = fcondition03(x, "some")
+    var_names = fcondition01(x, "some", cases=cases)
+    replacement = fcondition02(x, "some", cases=cases)
+    arg_names = fcondition03(x, "some", cases=cases)
 
     # if does not match the condition, return the original string
     if var_names == []:
@@ -1124,17 +1138,17 @@ def translate_some(x):
         "__ee_extra_some(%s, %s)" % (var_name, arg_name)
         for arg_name, var_name in zip(arg_names, var_names)
     ]
-    for z in zip(replacement, to_replace_by):
-        x = x.replace(z[0], z[1])
+    x = replace_in_order(x, zip(replacement, to_replace_by))
     return x, 1
 
 
-def translate_splice(x):
+def translate_splice(x, cases=None):
     """Converts list.splice(index, howmany, item1, ... itemx) to 
        __ee_extra_splice(list, index, howmany, item1, ... itemx)
 
     Args:
         x (str): JavaScript code to translate.
+        cases (dict): Memo of the scans of the code, see get_finditer_cases.
 
     Returns:
         str: Translated JavaScript code.
@@ -1147,9 +1161,9 @@ def translate_splice(x):
     """
     # Regex conditions to get the string to replace,
     # the arguments, and the variable name.
-    var_names = fcondition01(x, "splice")
-    replacement = fcondition02(x, "splice")
-    arg_names = fcondition03(x, "splice")
+    var_names = fcondition01(x, "splice", cases=cases)
+    replacement = fcondition02(x, "splice", cases=cases)
+    arg_names = fcondition03(x, "splice", cases=cases)
 
     # if does not match the condition, return the original string
     if var_names == []:
@@ -1160,17 +1174,17 @@ def translate_splice(x):
         "__ee_extra_splice(%s, %s)" % (var_name, arg_name)
         for arg_name, var_name in zip(arg_names, var_names)
     ]
-    for z in zip(replacement, to_replace_by):
-        x = x.replace(z[0], z[1])
+    x = replace_in_order(x, zip(replacement, to_replace_by))
     return x, 1
 
 
-def translate_unshift(x):
+def translate_unshift(x, cases=None):
     """Converts list.unshift(item1, item2, ..., itemX) to
        __ee_extra_unshift(list, item1, item2, ..., itemX)
 
     Args:
         x (str): JavaScript code to translate.
+        cases (dict): Memo of the scans of the code, see get_finditer_cases.
 
     Returns:
         str: Translated JavaScript code.
@@ -1182,9 +1196,9 @@ def translate_unshift(x):
     """
     # Regex conditions to get the string to replace,
     # the arguments, and the variable name.
-    var_names = fcondition01(x, "unshift")
-    replacement = fcondition02(x, "unshift")
-    arg_names = fcondition03(x, "unshift")
+    var_names = fcondition01(x, "unshift", cases=cases)
+    replacement = fcondition02(x, "unshift", cases=cases)
+    arg_names = fcondition03(x, "unshift", cases=cases)
 
     # if does not match the condition, return the original string
     if var_names == []:
@@ -1195,16 +1209,16 @@ def translate_unshift(x):
         "__ee_extra_unshift(%s, %s)" % (var_name, arg_name)
         for arg_name, var_name in zip(arg_names, var_names)
     ]
-    for z in zip(replacement, to_replace_by):
-        x = x.replace(z[0], z[1])
+    x = replace_in_order(x, zip(replacement, to_replace_by))
     return x, 1
 
 
-def translate_valueOf(x):
+def translate_valueOf(x, cases=None):
     """Converts list.valueOf() to __ee_extra_valueOf(list)
 
     Args:
         x (str): JavaScript code to translate.
+        cases (dict): Memo of the scans of the code, see get_finditer_cases.
 
     Returns:
         str: Translated JavaScript code.
@@ -1216,9 +1230,9 @@ def translate_valueOf(x):
     """
     # Regex conditions to get the string to replace,
     # the arguments, and the variable name.
-    var_names = fcondition01(x, "valueOf")
-    replacement = fcondition02(x, "valueOf")
-    arg_names = fcondition03(x, "valueOf")
+    var_names = fcondition01(x, "valueOf", cases=cases)
+    replacement = fcondition02(x, "valueOf", cases=cases)
+    arg_names = fcondition03(x, "valueOf", cases=cases)
 
     # if does not match the condition, return the original string
     if var_names == []:
@@ -1229,6 +1243,5 @@ def translate_valueOf(x):
         "__ee_extra_valueOf(%s, %s)" % (var_name, arg_name)
         for arg_name, var_name in zip(arg_names, var_names)
     ]
-    for z in zip(replacement, to_replace_by):
-        x = x.replace(z[0], z[1])
+    x = replace_in_order(x, zip(replacement, to_replace_by))
     return x, 1
@@ -12,11 +12,11 @@ This module try to convert all theses cases to Python. If you consider that
 there is more cases that must be added to the module, please, contact us by
 GitHub :).
 """
-from ee_extra.JavaScript.utils import _check_regex
+from ee_extra.JavaScript.utils import _get_pattern
 
 from ee_extra.JavaScript.translate_general import (
     delete_brackets,
-    from_bin_to_list,
+    group_lines,
     var_remove,
 )
 
@@ -37,17 +37,16 @@ def fix_case03_loop(x):
         >>> fix_case03_loop('for (var i = 0; i < 5; i++) \n numbers[i]')
         >>> # 'for (var i = 0; i < 5; i++) numbers[i]'
     """
-    regex = _check_regex()
 
     lines = x.split("\n")
     fulfill_condition = list()
-    merge_condition = list("0" * len(lines))
+    merge_condition = bytearray(len(lines))
 
     # Is a line with a for loop?
     for line in lines:
         # 1. Get the text inside parenthesis (ignore nested parenthesis)
         condition_01 = "(?<=for\s*\()(?:[^()]+|\([^)]+\))+(?=\))"
-        matches = list(regex.finditer(condition_01, line))
+        matches = list(_get_pattern(condition_01).finditer(line))
         if matches == []:
             fulfill_condition.append(False)
         else:
@@ -58,17 +57,18 @@ def fix_case03_loop(x):
     index01 = [index for index, x in enumerate(fulfill_condition) if x]
 
     def fast_ck03(line):
-        return regex.findall("\).*", line)[0][1:].strip() == ""
+        return _get_pattern("\).*").findall(line)[0][1:].strip() == ""
 
     index02 = [index for index, x in enumerate(lines_to_check) if fast_ck03(x)]
     index03 = [index01[x] for x in index02]
 
-    # Create the merge condition and the merge subgroups
+    # Create the merge condition and the merge subgroups (each loop line is merged
+    # with the next line)
     for index in index03:
-        merge_condition[index] = "1"
-    subgroups = "".join(merge_condition)
-    subgroups = subgroups.replace("10", "11")
-    merge_rule = from_bin_to_list(subgroups)
+        merge_condition[index] = 1
+        if index + 1 < len(lines):
+            merge_condition[index + 1] = 1
+    merge_rule = group_lines(merge_condition)
 
     # Create the new x string
     final_x = list()
@@ -96,7 +96,6 @@ def fix_while_loop(x):
         >>> fix_for_loop('for(var i = 0;i < x.length;i++){\nprint(i)\n}')
         >>> # var x = ee.Image(0)
     """
-    regex = _check_regex()
 
     # Fix the case03 loop style (See bellow)
     x = fix_case03_loop(x)
@@ -107,8 +106,8 @@ def fix_while_loop(x):
     for line in lines:
         # 1. Get the text inside parenthesis (ignore nested parenthesis)
         condition_01 = "(?<=while.*\()(?:[^()]+|\([^)]+\))+(?=\))"
-        matches = list(regex.finditer(condition_01, line))
-        initial_white_space = regex.findall("^\s*", line)[0]
+        matches = list(_get_pattern(condition_01).finditer(line))
+        initial_white_space = _get_pattern("^\s*").findall(line)[0]
         if matches == []:
             list_while_solver.append(line)
             continue
@@ -150,7 +149,6 @@ def fix_for_loop(x):
         >>> fix_for_loop('for(var i = 0;i < x.length;i++){\nprint(i)\n}')
         >>> # var x = ee.Image(0)
     """
-    regex = _check_regex()
 
     # Fix beautify loop style
     x = check_loop_line_breaks_r(x)
@@ -165,7 +163,7 @@ def fix_for_loop(x):
     for line in lines:
         # 1. Get the text inside parenthesis (ignore nested parenthesis)
         condition_01 = "(?<=for\s*\()(?:[^()]+|\([^)]+\))+(?=\))"
-        matches = list(regex.finditer(condition_01, line))
+        matches = list(_get_pattern(condition_01).finditer(line))
         if matches == []:
             list_for_solver.append(line)
             continue
@@ -174,7 +172,7 @@ def fix_for_loop(x):
             for_loop_body = match.group()
 
         # initial space
-        initial_white_space = regex.findall("^\s*", line)[0]
+        initial_white_space = _get_pattern("^\s*").findall(line)[0]
 
         ## Match for in
         if " in " in for_loop_body:
@@ -209,7 +207,7 @@ def fix_for_loop(x):
                 if not for_loop_var in (lgradient + lcond)
             ]
 
-            lcond = regex.sub("\s+", "", lcond[0])
+            lcond = _get_pattern("\s+").sub("", lcond[0])
 
             # 5. Get the iterator name and range
             fcop = [cop for cop in cops if cop in lcond][0]
@@ -217,12 +215,16 @@ def fix_for_loop(x):
 
             # this statement is to transform the case of "for(;i < x.length;){...}" to while(i < x.length){...}
             if len(lgradient) == 0:
-                ldef = "\n".join([regex.sub("\s+", "", var_remove(ld)) for ld in ldef])
+                ldef = "\n".join(
+                    [_get_pattern("\s+").sub("", var_remove(ld)) for ld in ldef]
+                )
                 ldef = "\n".join(ldef.split(","))
                 python_for_loop = delete_brackets(x="%s\nwhile %s :\n" % (ldef, lcond))
             else:
-                lgradient = regex.sub("\s+", "", lgradient[0])
-                ldef = "\n".join([regex.sub("\s+", "", var_remove(ld)) for ld in ldef])
+                lgradient = _get_pattern("\s+").sub("", lgradient[0])
+                ldef = "\n".join(
+                    [_get_pattern("\s+").sub("", var_remove(ld)) for ld in ldef]
+                )
                 ldef = "\n".join(ldef.split(","))
 
                 # 6. Get the step value
@@ -368,25 +370,17 @@ def check_loop_line_breaks_r(x):
 
 
 def check_loop_line_breaks(x):
-    regex = _check_regex()
-    
     lines = x.split("\n")
     # trace for loop bad line breaks
     condtion = r"^for\s*\("
-    list_true = []
-    for line in lines:
+    list_true = bytearray(len(lines))
+    for index, line in enumerate(lines):
         line = line.strip()
-        if regex.search(condtion, line):
-            if not is_par_close(line):
-                list_true.append("1")
-            else:
-                list_true.append("0")
-        else:
-            list_true.append("0")
-    group = "".join(list_true)
-    if int(group) == 0:
+        if _get_pattern(condtion).search(line) and not is_par_close(line):
+            list_true[index] = 1
+    if not any(list_true):
         return x
-    merge_condition = from_bin_to_list(group.replace("10", "12"))
+    merge_condition = group_lines(list_true, after=True)
     new_x = "\n".join(merge_group(lines, merge_condition))
     return new_x
 
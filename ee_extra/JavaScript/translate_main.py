@@ -1,21 +1,24 @@
 """Auxiliary module with functions to translate JavaScript scripts to Python."""
 
 import textwrap
+from collections import OrderedDict
+from typing import Callable, Optional
 
 from ee_extra import translate_functions as tfunc
 from ee_extra import translate_general as tgnrl
 from ee_extra import translate_jsm_main as tjsm
 from ee_extra import translate_loops as tloops
 from ee_extra import translate_utils as tutils
-from ee_extra.JavaScript.utils import _check_regex
-from ee_extra.JavaScript.utils import _check_jsbeautifier
+from ee_extra.JavaScript import tokenizer
+from ee_extra.JavaScript.profiling import PassRecord, run_pass
+from ee_extra.JavaScript.utils import _check_regex, _get_pattern
+from ee_extra.JavaScript.utils import _check_black, _check_jsbeautifier
 
 
 def inside_quoation_marks(x, word):
-    regex = _check_regex()
     pattern = r"([\"'])(?:(?=(\\?))\2.)*?\1"
-    if regex.search(pattern, x):
-        qm_word = regex.search(pattern, x).group(0)
+    if _get_pattern(pattern).search(x):
+        qm_word = _get_pattern(pattern).search(x).group(0)
         return word in qm_word
     else:
         return False
@@ -35,14 +38,16 @@ def fix_typeof(x):
         >>> fix_typeof("typeof lesly")
         >>> # typeof(lesly)
     """
-    regex = _check_regex()
     lazy_cond = r"typeof\s*\(*[A-Za-z0-9Α-Ωα-ωίϊΐόάέύϋΰήώ\[\]_]*\)*"
-    typeof_cases = regex.findall(lazy_cond, x)
-    if typeof_cases == []:
+    buffer = tutils.EditBuffer(x)
+    for match in _get_pattern(lazy_cond).finditer(x):
+        typeof_case = match.group(0)
+        buffer.replace(
+            match.start(), match.end(), "typeof(%s)" % typeof_case.split(" ")[1]
+        )
+    if len(buffer) == 0:
         return x, ""
-    else:
-        for typeof_case in typeof_cases:
-            x = x.replace(typeof_case, "typeof(%s)" % typeof_case.split(" ")[1])
+    x = buffer.apply()
     header = """
     
     # Javascript typeof wrapper ---------------------------------------
@@ -87,28 +92,31 @@ def fix_sugar_if(x):
     regex = _check_regex()
     lines = x.split("\n")
     condition01 = "\(.*\)\s\?\s\w+\s:.*"  # search for sugar strings
-    sugar_lines = [line for line in lines if regex.search(condition01, line)]
+    sugar_lines = [
+        i for i, line in enumerate(lines) if _get_pattern(condition01).search(line)
+    ]
 
     if sugar_lines == []:
         return x
     else:
-        for sugar_line in sugar_lines:
+        for index in sugar_lines:
+            sugar_line = lines[index]
             if " = " in sugar_line:
                 # initial space
                 whitespace_cond = "^\s*"
-                init_space = regex.findall(whitespace_cond, sugar_line)[0]
+                init_space = _get_pattern(whitespace_cond).findall(sugar_line)[0]
 
                 # is there a assignment?
                 condition02 = "(.*)\s+=\s+"
-                matches = regex.findall(condition02, sugar_line, regex.MULTILINE)
+                matches = _get_pattern(condition02, regex.MULTILINE).findall(sugar_line)
                 varname = matches[0].strip() + " = "
             else:
                 varname = ""
             # sugar syntax is: if (condition) ? true_value : false_value
             condition03 = "=(.*)\?(.*):(.*)"
-            ifcondition, dotrue, dofalse = regex.findall(
-                condition03, sugar_line, regex.MULTILINE
-            )[0]
+            ifcondition, dotrue, dofalse = _get_pattern(
+                condition03, regex.MULTILINE
+            ).findall(sugar_line)[0]
 
             # fix the if condition
             ifcondition = ifcondition.strip()
@@ -119,8 +127,8 @@ def fix_sugar_if(x):
                 ifcondition,
                 dofalse.strip(),
             )
-            x = x.replace(sugar_line, new_line)
-    return x
+            lines[index] = new_line
+    return "\n".join(lines)
 
 
 def normalize_fn_name(x: str) -> str:
@@ -141,12 +149,28 @@ def normalize_fn_name(x: str) -> str:
     """
     regex = _check_regex()
     pattern = "var\s*(.*[^\s])\s*=\s*function"
-    matches = regex.finditer(pattern, x, regex.MULTILINE)
-    for _, item in enumerate(matches):
-        match = item.group(0)
-        group = item.group(1)
-        x = x.replace(match, f"function {group}")
-    return x
+    buffer = tutils.EditBuffer(x)
+    for item in _get_pattern(pattern, regex.MULTILINE).finditer(x):
+        buffer.replace(item.start(), item.end(), f"function {item.group(1)}")
+    return buffer.apply()
+
+
+# JavaScript operators and literals and their Python version, in order.
+_RESERVED = OrderedDict(
+    {
+        "===": " == ",
+        "!==": " != ",
+        "\.and\(": ".And(",
+        "\.or\(": ".Or(",
+        "\.not\(": ".Not(",
+        "(?<![a-zA-Z])true(?![a-zA-Z])": "True",
+        "(?<![a-zA-Z])false(?![a-zA-Z])": "False",
+        "(?<![a-zA-Z])null(?![a-zA-Z])": "None",
+        "//": "#",
+        "!(\w)": " not ",
+        "\|\|": " or ",
+    }
+)
 
 
 def change_operators(x):
@@ -165,31 +189,15 @@ def change_operators(x):
         >>> change_operators("s.and(that);")
         >>> # m = s.And(that)
     """
-    regex = _check_regex()
-    from collections import OrderedDict
-
-    reserved = OrderedDict(
-        {
-            "===": " == ",
-            "!==": " != ",
-            "\.and\(": ".And(",
-            "\.or\(": ".Or(",
-            "\.not\(": ".Not(",
-            "(?<![a-zA-Z])true(?![a-zA-Z])": "True",
-            "(?<![a-zA-Z])false(?![a-zA-Z])": "False",
-            "(?<![a-zA-Z])null(?![a-zA-Z])": "None",
-            "//": "#",
-            "!(\w)": " not ",
-            "\|\|": " or ",
-        }
-    )
+    # strings and regex literals are kept as they are
+    return tokenizer.map_code(x, _change_operators_code)
 
-    for key, item in reserved.items():
-        x = regex.sub(key, item, x)
-    # Correct https://
-    x = x.replace("https:#", "https://")
-    x = x.replace("http:#", "http://")
-    return x
+
+def _change_operators_code(code):
+    """Changes the logical operators, booleans and null of a piece of code."""
+    for key, item in _RESERVED.items():
+        code = _get_pattern(key).sub(item, code)
+    return code
 
 
 def fix_multiline_comments(x):
@@ -206,15 +214,21 @@ def fix_multiline_comments(x):
         >>> fix_multiline_comments("/* hola lesly */")
         >>> # # hola lesly */
     """
-    regex = _check_regex()
-    pattern = r"/\*(.*?)\*/"
-    matches = regex.findall(pattern, x, regex.DOTALL)
-    if matches == []:
-        return x
-    for match in matches:
-        x = x.replace(match, match.replace("\n", "\n#"))
-    x = x.replace("/*", "#")
-    return x
+    # only block comments are rewritten, "/*" inside strings is kept
+    return tokenizer.untokenize(
+        tokenizer.map_tokens(
+            tokenizer.tokenize(x), _fix_block_comment, tokenizer.COMMENT
+        )
+    )
+
+
+def _fix_block_comment(comment):
+    """Changes a "/* */" comment token to "#" lines."""
+    if not comment.startswith("/*"):
+        return comment
+    if comment.endswith("*/") and len(comment) >= 4:
+        comment = "/*" + comment[2:-2].replace("\n", "\n#") + "*/"
+    return comment.replace("/*", "#")
 
 
 def delete_inline_comments(x):
@@ -279,30 +293,20 @@ def line_starts_with_dot(x):
     # Remove all whitespace at the end.
     lines = [line.rstrip() for line in x.split("\n")]
 
-    # Get "1" is the first chr is "." otherwise get "0"
-    is_first_chr_dot = list()
+    # Is the first chr "."? (empty lines follow the next line)
+    is_first_chr_dot = bytearray(len(lines))
     for index, line in enumerate(lines):
         if line != "":
-            cond = str(int(first_is_dot(line.strip())))
-        else:
-            try:
-                nextline = lines[index + 1]
-                ncond = str(int(first_is_dot(nextline.strip())))
-                if ncond == "1":
-                    cond = "1"
-                else:
-                    cond = "0"
-            except IndexError:
-                cond = "0"
-        is_first_chr_dot.append(cond)
-    subgroups = "".join(is_first_chr_dot)  # e.g. "011000100"
+            is_first_chr_dot[index] = first_is_dot(line.strip())
+        elif index + 1 < len(lines):
+            is_first_chr_dot[index] = first_is_dot(lines[index + 1].strip())
 
     # If no "." at the begining, then return the original string
-    if int(subgroups) == 0:
+    if not any(is_first_chr_dot):
         return x
 
     # If the next line starts with ".", merge with the previous line.
-    merge_rule = tgnrl.subgroups_creator_bef(subgroups)
+    merge_rule = tgnrl.group_lines(is_first_chr_dot, before=True)
 
     # Create the new x string
     final_x = list()
@@ -346,22 +350,15 @@ def ends_with_plus(x):
     # Remove all whitespace at the end.
     lines = [line.rstrip() for line in x.split("\n")]
 
-    # Get "1" is the last chr is "+" otherwise get "0"
-    is_last_chr_plus = list()
-    for line in lines:
-        if len(line) > 0:
-            cond = str(int(last_is_plus(line.strip())))
-        else:
-            cond = "0"
-        is_last_chr_plus.append(cond)
-    subgroups = "".join(is_last_chr_plus)  # e.g. "011000100"
+    # Is the last chr "+"?
+    is_last_chr_plus = bytearray(last_is_plus(line.strip()) for line in lines)
 
     # If no "+", then return the original string
-    if int(subgroups) == 0:
+    if not any(is_last_chr_plus):
         return x
 
-    # Merge the current line with the next line if '10'
-    merge_rule = tgnrl.subgroups_creator_aft(subgroups)
+    # Merge the lines ending with "+" with the next line
+    merge_rule = tgnrl.group_lines(is_last_chr_plus, after=True)
 
     # Create the new x string
     final_x = list()
@@ -399,22 +396,15 @@ def ends_with_equal(x):
     # Remove all whitespace at the end.
     lines = [line.rstrip() for line in x.split("\n")]
 
-    # Get "1" is the last chr is "=" otherwise get "0"
-    is_last_chr_plus = list()
-    for line in lines:
-        if len(line) > 0:
-            cond = str(int(last_is_equal(line)))
-        else:
-            cond = "0"
-        is_last_chr_plus.append(cond)
-    subgroups = "".join(is_last_chr_plus)  # e.g. "011000100"
+    # Is the last chr "="?
+    is_last_chr_equal = bytearray(last_is_equal(line) for line in lines)
 
     # If no "=", then return the original string
-    if int(subgroups) == 0:
+    if not any(is_last_chr_equal):
         return x
 
-    # Merge the current line with the next line if '10'
-    merge_rule = tgnrl.subgroups_creator_aft(subgroups)
+    # Merge the lines ending with "=" with the next line
+    merge_rule = tgnrl.group_lines(is_last_chr_equal, after=True)
 
     # Create the new x string
     final_x = list()
@@ -492,7 +482,6 @@ def fix_identation(x):
         >>> from ee_extra import fix_identation
         >>> fix_identation("if(i==10){\ni}")
     """
-    regex = _check_regex()
     ident_base = "    "
     brace_counter = 0
 
@@ -502,10 +491,10 @@ def fix_identation(x):
 
     # remove multiple \n by just one
     pattern = r"\n+"
-    x = regex.sub(pattern, r"\n", x)
+    x = _get_pattern(pattern).sub(r"\n", x)
 
     # Detect the spaces of the first identation
-    x = regex.sub(r"\n\s+", "\n", x)
+    x = _get_pattern(r"\n\s+").sub("\n", x)
 
     # fix nested identation
     brace_counter = 0
@@ -541,10 +530,9 @@ def add_identation(x):
         >>> from ee_extra import add_identation
         >>> add_identation("if(i==10){\ni}")
     """
-    regex = _check_regex()
     pattern = "\n"
     # identation in the body
-    body_id = regex.sub(pattern, r"\n    ", x)
+    body_id = _get_pattern(pattern).sub(r"\n    ", x)
     # identation in the header
     return "\n    " + body_id
 
@@ -578,19 +566,17 @@ def remove_extra_spaces(x):
 def dictionary_keys(x):
     regex = _check_regex()
     pattern = r"{(.*?)}"  # Get the data inside curly brackets
-    dicts = regex.findall(pattern, x, regex.DOTALL)
-    if len(dicts) > 0:
-        for dic in dicts:
-            items = dic.split(",")
-            for item in items:
-                pattern = r"(.*?):(.*)"
-                item = regex.findall(pattern, item)
-                if len(item) > 0:
-                    for i in item:
-                        i = list(i)
-                        j = i[0].replace('"', "").replace("'", "").replace(" ", "")
-                        x = x.replace(f"{i[0]}:{i[1]}", f"'{j}':{i[1]}")
-    return x
+    buffer = tutils.EditBuffer(x)
+    for dic in _get_pattern(pattern, regex.DOTALL).finditer(x):
+        # quote the key of each item, where the item is
+        start = dic.start(1)
+        for item in dic.group(1).split(","):
+            pattern = r"(.*?):(.*)"
+            for key in _get_pattern(pattern).finditer(item):
+                j = key.group(1).replace('"', "").replace("'", "").replace(" ", "")
+                buffer.replace(start + key.start(1), start + key.end(1), f"'{j}'")
+            start += len(item) + 1
+    return buffer.apply()
 
 
 def is_float(x):
@@ -605,12 +591,10 @@ def is_float(x):
 def dict_replace(x, match, word, new_word):
     """Replace name.name only if they are not inside quotation marks"""
 
-    regex = _check_regex()
-
     def inside_quoation_marks(x, word):
         pattern = r"([\"'])(?:(?=(\\?))\2.)*?\1"
-        if regex.search(pattern, x):
-            qm_word = regex.search(pattern, x).group(0)
+        if _get_pattern(pattern).search(x):
+            qm_word = _get_pattern(pattern).search(x).group(0)
             return word in qm_word
         else:
             return False
@@ -627,10 +611,11 @@ def dictionary_object_access(x):
 
     # Search in all lines .. it matchs <name>.<name>
     pattern = r"^(?=.*[\x00-\x7F][^\s]+\.[\x00-\x7F][^\s]+)(?!.*http).*$"
-    matches = regex.findall(pattern, x, regex.MULTILINE)
-    matches.sort(reverse=True)
+    matches = _get_pattern(pattern, regex.MULTILINE).findall(x)
 
-    # match = matches[7]
+    # A word found in any line is rewritten everywhere in the script. The new words
+    # are collected first and replaced in a single pass (see _replace_dotted_words).
+    new_words = {}
     for match in matches:
         if len(match) > 0:
             if match[0] == "#":
@@ -645,8 +630,8 @@ def dictionary_object_access(x):
         # This bunch of code take a decision based on the next letter. However, if the
         # next letter is a \n it could cause problems. When this happens we add a ')' to
         # the end of the line.
-        matches_at_line1 = regex.findall(pattern1, match)
-        matches_at_line2 = regex.findall(pattern2, match)
+        matches_at_line1 = _get_pattern(pattern1).findall(match)
+        matches_at_line2 = _get_pattern(pattern2).findall(match)
 
         matches_at_line = list()
         for m1, m2 in zip(matches_at_line1, matches_at_line2):
@@ -672,38 +657,67 @@ def dictionary_object_access(x):
 
             # If is a math
             if "Math." in match_line:
+                word = match_line
                 new_word = match_line.lower()
-                x = dict_replace(x, match, match_line, new_word)
             else:
                 nlist = match_line[:-1].split(".")
-                arg_nospace = regex.sub(r"\s", "", nlist[1])
+                arg_nospace = _get_pattern(r"\s").sub("", nlist[1])
+                word = match_line[:-1]
                 new_word = '%s["%s"]' % (nlist[0], arg_nospace)
-                x = dict_replace(x, match, match_line[:-1], new_word)
-    return x
+
+            # words inside quotation marks are left as they are
+            if not inside_quoation_marks(match, word):
+                new_words.setdefault(word, new_word)
+
+    return _replace_dotted_words(x, new_words)
+
+
+def _replace_dotted_words(x, new_words):
+    """Replaces <name01>.<name02> words in a single pass over the script.
+
+    Each chain of dotted names (e.g. a.b.c) is split in its names and every pair of
+    consecutive names is looked up in new_words, from left to right. A word can also
+    include the character that follows it (e.g. Math.PI) for Math.* words), which is
+    tried first.
+    """
+    if not new_words:
+        return x
+    pattern = r"[A-Za-z0-9Α-Ωα-ωίϊΐόάέύϋΰήώ_]+(?:\.[A-Za-z0-9Α-Ωα-ωίϊΐόάέύϋΰήώ_]+)+"
+    buffer = tutils.EditBuffer(x)
+    for chain in _get_pattern(pattern).finditer(x):
+        names = chain.group(0).split(".")
+        start = chain.start()
+        i = 0
+        while i < len(names) - 1:
+            word = names[i] + "." + names[i + 1]
+            end = start + len(word)
+            if x[end : end + 1] and word + x[end] in new_words:
+                buffer.replace(start, end + 1, new_words[word + x[end]])
+            elif word in new_words:
+                buffer.replace(start, end, new_words[word])
+            else:
+                start += len(names[i]) + 1
+                i += 1
+                continue
+            # the next word starts after the replaced one
+            start = end + 1
+            i += 2
+    return buffer.apply()
 
 
 # Change "f({x = 1})" por "f(**{x = 1})"
 def keyword_arguments_object(x):
     regex = _check_regex()
     pattern = r"(\w+)\({(.*?)}\)"
-    matches = regex.findall(pattern, x, regex.DOTALL)
-
-    # eliminate is the method is getThumbURL|getDownloadURL|getThumbId.
-    matches = [
-        params
-        for fname, params in matches
-        if fname not in ["getThumbURL", "getDownloadURL", "getThumbId"]
-    ]
-
-    matches = list(
-        set(matches)
-    )  # Remove duplicate matches (See Test:test_line_breaks01)
+    buffer = tutils.EditBuffer(x)
+    for match in _get_pattern(pattern, regex.DOTALL).finditer(x):
+        # eliminate is the method is getThumbURL|getDownloadURL|getThumbId.
+        if match.group(1) not in ["getThumbURL", "getDownloadURL", "getThumbId"]:
+            buffer.replace(match.start(2) - 1, match.start(2) - 1, "**")
+    x = buffer.apply()
 
-    if len(matches) > 0:
-        for match in matches:
-            x = x.replace("{" + match + "}", "**{" + match + "}")
     pattern = r"ee\.Dictionary\(\*\*{"
-    matches = regex.findall(pattern, x, regex.DOTALL)
+    matches = _get_pattern(pattern, regex.DOTALL).findall(x)
     matches = list(
         set(matches)
     )  # Remove duplicate matches (See Test:test_line_breaks01)
@@ -715,48 +729,28 @@ def keyword_arguments_object(x):
 
 # Change "if(x){" por "if x:"
 def if_statement(x):
-    regex = _check_regex()
-    pattern = r"}(.*?)else(.*?)if(.*?){"
-    matches = regex.findall(pattern, x)
-    if len(matches) > 0:
-        for match in matches:
-            match = list(match)
-            x = x.replace(
-                "}" + match[0] + "else" + match[1] + "if" + match[2] + "{",
-                f"elif {match[2]}:",
-            )
-    pattern = r"if(.*?)\((.*)\)(.*){"
-    matches = regex.findall(pattern, x)
-    if len(matches) > 0:
-        for match in matches:
-            match = list(match)
-            x = x.replace(
-                "if" + match[0] + "(" + match[1] + ")" + match[2] + "{",
-                f"if {match[1]}:",
-            )
-    pattern = r"}(.*?)else(.*?){"
-    matches = regex.findall(pattern, x)
-    if len(matches) > 0:
-        for match in matches:
-            match = list(match)
-            x = x.replace("}" + match[0] + "else" + match[1] + "{", "else:")
+    x = _rewrite_matches(x, r"}(.*?)else(.*?)if(.*?){", "elif {2}:")
+    x = _rewrite_matches(x, r"if(.*?)\((.*)\)(.*){", "if {1}:")
+    x = _rewrite_matches(x, r"}(.*?)else(.*?){", "else:")
     return tgnrl.delete_brackets(x)
 
 
+def _rewrite_matches(x, pattern, template):
+    """Replaces each match of a pattern, where it is, by a template of its groups."""
+    buffer = tutils.EditBuffer(x)
+    for match in _get_pattern(pattern).finditer(x):
+        buffer.replace(match.start(), match.end(), template.format(*match.groups()))
+    return buffer.apply()
+
+
 # Change "Array.isArray(x)" por "isinstance(x,list)"
 def array_isArray(x):
-    regex = _check_regex()
     pattern = r"Array\.isArray\((.*?)\)"
-    matches = regex.findall(pattern, x)
-    if len(matches) > 0:
-        for match in matches:
-            x = x.replace(f"Array.isArray({match})", f"isinstance({match},list)")
-    return x
+    return _rewrite_matches(x, pattern, "isinstance({1},list)")
 
 
 def add_exports(x):
-    regex = _check_regex()
-    if regex.search("exports|eeExtraExports", x):
+    if _get_pattern("exports|eeExtraExports").search(x):
         header = """
         class AttrDict(dict):
             def __init__(self, *args, **kwargs):
@@ -777,24 +771,29 @@ def add_header(x, header_list=""):
 
 
 def remove_single_declarations(x):
-    regex = _check_regex()
     condition = "var\s[A-Za-z0-9Α-Ωα-ωίϊΐόάέύϋΰήώ\[\]_]+;*\n"
-    x = regex.sub(condition, "", x)
+    x = _get_pattern(condition).sub("", x)
     return x
 
 def remove_documentation(x):
-    regex = _check_regex()
     # remove // only if it is not in a string
-    condition = "\/\/(?=(?:[^\"']*\"[^\"']*\")*[^\"']*$).*"
-    newx = regex.sub(condition, "", x, flags=regex.MULTILINE)
-    return newx
+    return tokenizer.remove_line_comments(x)
 
 
-def translate(x: str, black: bool = False, quiet: bool = True) -> str:
+def translate(
+    x: str,
+    black: bool = False,
+    quiet: bool = True,
+    hook: Optional[Callable[[PassRecord], None]] = None,
+) -> str:
     """Translates a JavaScript script to a Python script.
 
     Args:
         x : A JavaScript script.
+        black : Whether to format the Python script with black.
+        hook : Function called after every pass with its PassRecord (name, wall
+            time, sizes and number of rewritten lines), e.g. a
+            profiling.TranslationProfile. Nothing is measured without a hook.
 
     Returns:
         A Python script.
@@ -804,75 +803,139 @@ def translate(x: str, black: bool = False, quiet: bool = True) -> str:
         >>> from ee_extra import translate
         >>> translate("var x = ee.ImageCollection('COPERNICUS/S2_SR')")
     """
-    regex = _check_regex()
+    x, helpers = _translate_body(x, hook)
+    return _add_headers(x, helpers, black, hook)
+
+
+def _translate_body(
+    x: str, hook: Optional[Callable[[PassRecord], None]] = None
+) -> tuple:
+    """Translates JavaScript code to Python code without the script headers.
+
+    Args:
+        x : JavaScript code.
+        hook : Function called after every pass with its PassRecord.
+
+    Returns:
+        The Python code and the helpers it needs: the typeof header and the names
+        of the translated JavaScript methods.
+    """
     beautify, default_options = _check_jsbeautifier()
 
     opts = default_options()
     opts.keep_array_indentation = True
 
-    header_list = list()
-    # 1. reformat and re-indent ugly JavaScript
-    x = remove_documentation(x)  # remove documentation
-    x = remove_single_declarations(x)  # remove declarations
-    x = beautify(x, opts)
+    # 1. reformat and re-indent ugly JavaScript. The two first passes share one lex.
+    tokens = tokenizer.tokenize(x)
+    tokens = run_pass(
+        hook, "remove_documentation", tokenizer.drop_line_comments, tokens
+    )
+    tokens = run_pass(
+        hook,
+        "remove_single_declarations",
+        tokenizer.map_tokens,
+        tokens,
+        remove_single_declarations,
+    )
+    x = run_pass(hook, "beautify", beautify, tokenizer.untokenize(tokens), opts)
 
     # 2. Fix typeof change typeof x to typeof(x)
-    x, header = fix_typeof(x)
-    header_list.append(header)
+    x, typeof_header = run_pass(hook, "fix_typeof", fix_typeof, x)
 
     # 3. Fix JavaScript methods
-    x, header = tjsm.translate_jsmethods(x)
-    header_list.append(header)
+    x, jsmethods = tjsm._translate_jsmethods(x, hook)
 
     # 4. reformat Js function definition style (from var fun = function(bla, bla) -> function fun(bla, bla)).
-    x = normalize_fn_name(x)
+    x = run_pass(hook, "normalize_fn_name", normalize_fn_name, x)
     # 5. Remove var keyword.
-    x = tgnrl.var_remove(x)
+    x = run_pass(hook, "var_remove", tgnrl.var_remove, x)
     # 6. Change logical operators, boolean, null, comments and others.
-    x = change_operators(x)
-    # 7. Change multiline jscript comments to just '#'.
-    x = fix_multiline_comments(x)
+    tokens = tokenizer.tokenize(x)
+    tokens = run_pass(
+        hook, "change_operators", tokenizer.map_tokens, tokens, _change_operators_code
+    )
+    # 7. Change multiline jscript comments to just '#' (on the tokens of step 6).
+    tokens = run_pass(
+        hook,
+        "fix_multiline_comments",
+        tokenizer.map_tokens,
+        tokens,
+        _fix_block_comment,
+        tokenizer.COMMENT,
+    )
+    x = tokenizer.untokenize(tokens)
     # 8. If line starts with ".", then merge it with the previous one.
-    x = line_starts_with_dot(x)
+    x = run_pass(hook, "line_starts_with_dot", line_starts_with_dot, x)
     # 9. If a line ends with "+", then merge it with the next one.
-    x = ends_with_plus(x)
+    x = run_pass(hook, "ends_with_plus", ends_with_plus, x)
     # 10. If a line ends with "=", then merge it with the next one.
-    x = ends_with_equal(x)
+    x = run_pass(hook, "ends_with_equal", ends_with_equal, x)
 
     x = x.replace("\nfunction ", "\n\nfunction ")
-    x = tfunc.func_translate(x)
+    x = run_pass(hook, "func_translate", tfunc.func_translate, x)
 
     # 11. Change e.g. "for(var i = 0;i < x.length;i++)" to "for i in range(0,len(x),1):"
-    x = tloops.fix_for_loop(x)
+    x = run_pass(hook, "fix_for_loop", tloops.fix_for_loop, x)
     # 12. Change e.g. "while (i > 10)" to "while i>10:"
-    x = tloops.fix_while_loop(x)
+    x = run_pass(hook, "fix_while_loop", tloops.fix_while_loop, x)
     # 13. Change lines like var i++ to var i = i + 1.
-    x = tloops.fix_inline_iterators(x)
+    x = run_pass(hook, "fix_inline_iterators", tloops.fix_inline_iterators, x)
 
-    x = if_statement(x)
+    x = run_pass(hook, "if_statement", if_statement, x)
     
     # 14. Delete extra brackets.
-    x = tgnrl.delete_brackets(x)    
+    x = run_pass(hook, "delete_brackets", tgnrl.delete_brackets, x)
 
     # 15. Change [if (condition) ? true_value : false_value] to [true_value if condition else false_value]
     # OBS: fix_sugar_if must always to if_statement to avoid conflicts.
-    x = fix_sugar_if(x)
+    x = run_pass(hook, "fix_sugar_if", fix_sugar_if, x)
 
-    x = dictionary_keys(x)
-    x = dictionary_object_access(x)
-    x = keyword_arguments_object(x)
-    x = array_isArray(x)
-    header_list.append(add_exports(x))
+    x = run_pass(hook, "dictionary_keys", dictionary_keys, x)
+    x = run_pass(hook, "dictionary_object_access", dictionary_object_access, x)
+    x = run_pass(hook, "keyword_arguments_object", keyword_arguments_object, x)
+    x = run_pass(hook, "array_isArray", array_isArray, x)
     x = x.replace(";", "")
+    return x, {"typeof": typeof_header, "jsmethods": jsmethods}
+
+
+def _add_headers(
+    x: str,
+    helpers: dict,
+    black: bool = False,
+    hook: Optional[Callable[[PassRecord], None]] = None,
+) -> str:
+    """Formats a translated script and adds the imports and helpers it needs.
+
+    Args:
+        x : Python code returned by _translate_body.
+        helpers : Helpers used by the code, as returned by _translate_body. The
+            helpers of several pieces of code are merged with _merge_helpers.
+        black : Whether to format the Python script with black.
+        hook : Function called after every pass with its PassRecord.
+
+    Returns:
+        A Python script.
+    """
+    header_list = [
+        helpers["typeof"],
+        tjsm.jsmethods_header(helpers["jsmethods"]),
+        add_exports(x),
+    ]
     if black:
-        try:
-            from black import FileMode, format_str
-            x = format_str(x, mode=FileMode())
-        except ImportError:
-            raise ImportError(
-                '"black" is not installed. Please install "black" when using "black=True" -> "pip install black"'
-            )    
-    x, header = fix_str_plus_int(x)
+        format_str, FileMode = _check_black()
+        x = run_pass(hook, "black", format_str, x, mode=FileMode())
+    x, header = run_pass(hook, "fix_str_plus_int", fix_str_plus_int, x)
     header_list.append(header)
     x = add_header(x, header_list)
-    return x
\ No newline at end of file
+    return x
+
+
+def _merge_helpers(helpers_list: list) -> dict:
+    """Merges the helpers used by several translated pieces of code."""
+    helpers = {"typeof": "", "jsmethods": []}
+    for item in helpers_list:
+        helpers["typeof"] = helpers["typeof"] or item["typeof"]
+        helpers["jsmethods"] += [
+            name for name in item["jsmethods"] if name not in helpers["jsmethods"]
+        ]
+    return helpers
@@ -1,4 +1,4 @@
-from ee_extra.JavaScript.utils import _check_regex
+from ee_extra.JavaScript.utils import _check_regex, _get_pattern
 
 
 # Wrapper functions to translate all functions --------------------------------
@@ -19,7 +19,7 @@ def functextin(x, fname="parseInt"):
     regex = _check_regex()
     
     search = "(?<![\w\.])%s\(" % fname
-    matches = regex.finditer(search, x, regex.MULTILINE)
+    matches = _get_pattern(search, regex.MULTILINE).finditer(x)
     paranthesis_index = list()
     for _, match in enumerate(matches):
         search_parenthesis = match.end()
@@ -1,4 +1,5 @@
-from ee_extra.JavaScript.utils import _check_regex
+from ee_extra.JavaScript import tokenizer
+from ee_extra.JavaScript.utils import _get_pattern
 
 
 def search_open_square_bracket(word):
@@ -81,7 +82,6 @@ def search_after_attribute(position, text):
     """
     Search for the parameter before the given position in the given text.
     """
-    regex = _check_regex()
     # Find the first open parenthesis before the given position.
     seed_search = position + 1
     get_paranthesis_body = ""
@@ -96,7 +96,7 @@ def search_after_attribute(position, text):
         seed_search += 1
 
     toexport = "".join(get_paranthesis_body)
-    toexport = regex.sub(";|,|", "", toexport)
+    toexport = _get_pattern(";|,|").sub("", toexport)
     return toexport
 
 
@@ -112,38 +112,79 @@ def replace_multiple(source, replacements):  # a convenience multi-replacement f
 
 
 def replace_non_quoted(source, replacements):
-    QUOTE_STRINGS = ("'", "\\'", '"', '\\"')
-    result = []  # a store for the result pieces
-    head = 0  # a search head reference
-    eos = len(source)  # a convenience string length reference
-    quote = None  # last quote match literal
-    quote_len = 0  # a convenience reference to the current quote substring length
-    while True:
-        if quote:  # we already have a matching quote stored
-            index = source.find(quote, head + quote_len)  # find the closing quote
-            if index == -1:  # EOS reached
-                break
-            result.append(
-                source[head : index + quote_len]
-            )  # add the quoted string verbatim
-            head = index + quote_len  # move the search head after the quoted match
-            quote = None  # blank out the quote literal
-        else:  # the current position is not in a quoted substring
-            index = eos
-            # find the first quoted substring from the current head position
-            for entry in QUOTE_STRINGS:  # loop through all quote substrings
-                candidate = source.find(entry, head)
-                if head < candidate < index:
-                    index = candidate
-                    quote = entry
-                    quote_len = len(entry)
-            if not quote:  # EOS reached, no quote found
-                break
-            result.append(replace_multiple(source[head:index], replacements))
-            head = index  # move the search head to the start of the quoted match
-    if head < eos:  # if the search head is not at the end of the string
-        result.append(replace_multiple(source[head:], replacements))
-    return "".join(result)  # join back the result pieces and return them
+    # strings, comments and regex literals are found in a single pass
+    return tokenizer.map_code(
+        source, lambda code: replace_multiple(code, replacements)
+    )
+
+
+class EditBuffer:
+    """Collects (start, end, replacement) edits of a text and applies them at once.
+
+    Rewriting with ``str.replace`` copies the whole text for every edit and also
+    rewrites identical snippets that were never matched. The buffer splices the
+    edits in a single left-to-right pass instead, and only at their own positions.
+
+    Args:
+        text (str): Text to edit.
+
+    Examples:
+        >>> from ee_extra.JavaScript.translate_utils import EditBuffer
+        >>> buffer = EditBuffer("a.trim() + 'a.trim()'")
+        >>> buffer.replace(0, 8, "a.strip()")
+        >>> buffer.apply()
+        >>> # a.strip() + 'a.trim()'
+    """
+
+    def __init__(self, text):
+        self.text = text
+        self.edits = []
+
+    def __len__(self):
+        return len(self.edits)
+
+    def replace(self, start, end, replacement):
+        """Replaces text[start:end] by replacement."""
+        self.edits.append((start, end, replacement))
+
+    def apply(self):
+        """Applies the edits. An edit overlapping a previous one is skipped."""
+        if not self.edits:
+            return self.text
+        pieces = []
+        cursor = 0
+        for start, end, replacement in sorted(self.edits, key=lambda e: e[:2]):
+            if start < cursor:
+                continue
+            pieces.append(self.text[cursor:start])
+            pieces.append(replacement)
+            cursor = end
+        pieces.append(self.text[cursor:])
+        return "".join(pieces)
+
+
+def replace_in_order(source, replacements):
+    """Replaces each (old, new) pair at the next occurrence of old.
+
+    The pairs are expected in the order in which they were matched in the source,
+    so the search for each one starts where the previous one ended.
+
+    Args:
+        source (str): Text to edit.
+        replacements (iterable): (old, new) pairs.
+
+    Returns:
+        str: Edited text.
+    """
+    buffer = EditBuffer(source)
+    cursor = 0
+    for old, new in replacements:
+        start = source.find(old, cursor)
+        if start == -1:
+            continue
+        buffer.replace(start, start + len(old), new)
+        cursor = start + len(old)
+    return buffer.apply()
 
 
 # -----------------------------------------------------------------------------
@@ -1,6 +1,12 @@
+import functools
+
+
+@functools.lru_cache(maxsize=None)
 def _check_regex():
     """Checks if regex is installed and returns it as a module.
 
+    The check is done once; later calls return the same module.
+
     Returns:
         module: regex module.
     """
@@ -13,9 +19,13 @@ def _check_regex():
             '"regex" is not installed. Please install "regex" -> "pip install regex"'
         )
 
+
+@functools.lru_cache(maxsize=None)
 def _check_jsbeautifier():
     """Checks if jsbeautifier is installed and returns it as a module.
 
+    The check is done once; later calls return the same functions.
+
     Returns:
         module: jsbeautifier module.
     """
@@ -26,4 +36,44 @@ def _check_jsbeautifier():
     except ImportError:
         raise ImportError(
             '"jsbeautifier" is not installed. Please install "jsbeautifier" -> "pip install jsbeautifier"'
-        )
\ No newline at end of file
+        )
+
+
+@functools.lru_cache(maxsize=None)
+def _check_black():
+    """Checks if black is installed and returns its formatter.
+
+    The check is done once; later calls return the same functions.
+
+    Returns:
+        tuple: black format_str and FileMode.
+    """
+    try:
+        from black import FileMode, format_str
+
+        return format_str, FileMode
+    except ImportError:
+        raise ImportError(
+            '"black" is not installed. Please install "black" when using "black=True" -> "pip install black"'
+        )
+
+
+@functools.lru_cache(maxsize=512)
+def _get_pattern(pattern, flags=0):
+    """Compiles a regex pattern once and keeps it in a bounded cache.
+
+    The translation passes apply their patterns line by line. Calling the functions
+    of the regex module with a pattern string looks the pattern up in its small
+    internal cache every time, which is slower than the match itself for short lines
+    and is flushed when more than a few hundred patterns are used. The translator uses
+    fewer than 512 fixed patterns; patterns built from the translated code must not be
+    compiled here.
+
+    Args:
+        pattern (str): Regular expression.
+        flags (int, optional): regex flags. Defaults to 0.
+
+    Returns:
+        Pattern: Compiled pattern.
+    """
+    return _check_regex().compile(pattern, flags)
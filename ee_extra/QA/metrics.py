@@ -1,9 +1,10 @@
+import functools
 from abc import ABC, abstractmethod
 from typing import Any, Dict, List, Type, Union
 
 import ee
 
-from ee_extra.utils import _get_case_insensitive_close_matches
+from ee_extra.utils import _TrigramMatcher
 
 
 def listMetrics() -> Dict[str, Type["Metric"]]:
@@ -17,6 +18,12 @@ def listMetrics() -> Dict[str, Type["Metric"]]:
     return {metric.__name__: metric for metric in metrics}
 
 
+@functools.lru_cache(maxsize=None)
+def _get_metrics_matcher() -> _TrigramMatcher:
+    """Gets the close matcher of the names of the QA metrics, built once."""
+    return _TrigramMatcher(listMetrics().keys())
+
+
 def getMetrics(names: Union[str, List[str]]) -> List[Type["Metric"]]:
     """Take one or more metric names and return a list of matching QA metrics.
 
@@ -40,7 +47,7 @@ def getMetrics(names: Union[str, List[str]]) -> List[Type["Metric"]]:
         try:
             selected.append(options[name])
         except KeyError:
-            close_matches = _get_case_insensitive_close_matches(name, keys, n=3)
+            close_matches = _get_metrics_matcher().get_close_matches(name, n=3)
             hint = " Close matches: {}.".format(close_matches) if close_matches else ""
 
             raise AttributeError(
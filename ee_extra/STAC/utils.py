@@ -1,3 +1,4 @@
+import functools
 import json
 import os
 import re
@@ -6,7 +7,13 @@ from typing import Optional, Union
 
 import ee
 
-from ee_extra.utils import _load_JSON
+from ee_extra.utils import _load_JSON, _TrigramMatcher
+
+
+@functools.lru_cache(maxsize=None)
+def _get_platform_matcher() -> _TrigramMatcher:
+    """Gets the close matcher of the supported platforms, built once."""
+    return _TrigramMatcher(_load_JSON().keys())
 
 
 def _get_platform_STAC(args: Union[ee.Image, ee.ImageCollection]) -> dict:
@@ -47,6 +54,14 @@ def _get_platform_STAC(args: Union[ee.Image, ee.ImageCollection]) -> dict:
             platformDict = {"platform": plt, "sr": False}
 
     if plt is None:
-        raise Exception("Sorry, satellite platform not supported!")
+        # the scene suffix of an image ID would skew the matches, so the ID of its
+        # collection is matched instead
+        if isinstance(args, ee.image.Image):
+            pltID = "/".join(ID.split("/")[:-1])
+        else:
+            pltID = ID
+        close_matches = _get_platform_matcher().get_close_matches(pltID, n=3)
+        hint = f" Close matches: {close_matches}." if close_matches else ""
+        raise Exception(f"Sorry, satellite platform not supported!{hint}")
 
     return platformDict
@@ -9,6 +9,7 @@ import ee
 from ee_extra.Spectral.utils import (
     _get_expression_map,
     _get_indices,
+    _get_indices_matcher,
     _get_kernel_image,
     _get_kernel_parameters,
     _get_tc_coefficients,
@@ -163,8 +164,10 @@ def spectralIndices(
 
     for idx in index:
         if idx not in list(spectralIndices.keys()):
+            close_matches = _get_indices_matcher(online).get_close_matches(idx, n=3)
+            hint = f" Close matches: {close_matches}." if close_matches else ""
             warnings.warn(
-                f"Index {idx} is not a built-in index and it won't be computed!"
+                f"Index {idx} is not a built-in index and it won't be computed!{hint}"
             )
         else:
 
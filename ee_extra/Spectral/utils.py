@@ -1,3 +1,4 @@
+import functools
 import json
 import os
 import re
@@ -8,7 +9,7 @@ from typing import Optional, Union, Tuple, Dict
 import ee
 
 from ee_extra.STAC.utils import _get_platform_STAC
-from ee_extra.utils import _load_JSON
+from ee_extra.utils import _load_JSON, _TrigramMatcher
 
 
 def _get_expression_map(img: ee.Image, platformDict: dict) -> dict:
@@ -269,6 +270,19 @@ def _get_indices(online: bool) -> dict:
     return indices["SpectralIndices"]
 
 
+@functools.lru_cache(maxsize=None)
+def _get_indices_matcher(online: bool) -> _TrigramMatcher:
+    """Gets the close matcher of the names of the indices, built once.
+
+    Args:
+        online : Wheter to match the indices of the GitHub repository and not of the local copy.
+
+    Returns:
+        Close matcher of the names of the indices.
+    """
+    return _TrigramMatcher(_get_indices(online).keys())
+
+
 def _get_kernel_image(
     img: ee.Image, lookup: dict, kernel: str, sigma: Union[str, float], a: str, b: str
 ) -> ee.Image:
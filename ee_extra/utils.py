@@ -1,6 +1,7 @@
 import difflib
 import json
-from typing import Any, Optional, List, Sequence
+from collections import Counter, defaultdict
+from typing import Any, Dict, Iterable, Optional, List, Sequence, Set
 
 from importlib.resources import files
 
@@ -21,10 +22,121 @@ def _load_JSON(x: Optional[str] = "ee-catalog-ids.json") -> Any:
         return json.load(f)
 
 
+def _check_numpy() -> Any:
+    """Checks if numpy is installed and returns it as a module.
+
+    Returns:
+        numpy module.
+    """
+    try:
+        import numpy
+
+        return numpy
+    except ImportError:
+        raise ImportError(
+            '"numpy" is not installed. Please install "numpy" -> "pip install numpy"'
+        )
+
+
+def _check_scipy() -> Any:
+    """Checks if scipy is installed and returns its ndimage module.
+
+    Returns:
+        scipy.ndimage module.
+    """
+    try:
+        from scipy import ndimage
+
+        return ndimage
+    except ImportError:
+        raise ImportError(
+            '"scipy" is not installed. Please install "scipy" -> "pip install scipy"'
+        )
+
+
+def _get_trigrams(word: str) -> Set[str]:
+    """Gets the set of trigrams of a (padded) string.
+
+    Args:
+        word : String to split in trigrams.
+
+    Returns:
+        Trigrams of the string.
+    """
+    padded = "  {} ".format(word)
+    return {padded[i : i + 3] for i in range(len(padded) - 2)}
+
+
+class _TrigramMatcher:
+    """A case-insensitive close matcher backed by a precomputed trigram index.
+
+    The lowercase forms of the possibilities and their trigrams are computed once.
+    Each query only ranks (with difflib) the possibilities that share the most
+    trigrams with the word, instead of every possibility.
+
+    Args:
+        possibilities : A list of strings against which to match words.
+        shortlist : Maximum number of candidates that are ranked with difflib.
+
+    Examples:
+        >>> from ee_extra.utils import _TrigramMatcher
+        >>> matcher = _TrigramMatcher(["MSE", "RMSE", "ERGAS"])
+        >>> matcher.get_close_matches("mse")
+        ['MSE', 'RMSE']
+    """
+
+    def __init__(self, possibilities: Iterable[str], shortlist: int = 50) -> None:
+        self.possibilities = list(dict.fromkeys(possibilities))
+        self.shortlist = shortlist
+        self._lower = [p.lower() for p in self.possibilities]
+        self._index: Dict[str, List[int]] = defaultdict(list)
+
+        for i, possibility in enumerate(self._lower):
+            for trigram in _get_trigrams(possibility):
+                self._index[trigram].append(i)
+
+    def get_close_matches(
+        self, word: str, n: int = 3, cutoff: float = 0.6
+    ) -> List[str]:
+        """Gets the best close matches of a word among the possibilities.
+
+        Args:
+            word : A string for which close matches are desired.
+            n : the maximum number of close matches to return. n must be > 0.
+            cutoff : Possibilities that don't score at least that similar to word are ignored.
+
+        Returns:
+            The best (no more than n) matches among the possibilities are returned in a list,
+            sorted by similarity score, most similar first.
+        """
+        word = word.lower()
+        shared = Counter(
+            i for trigram in _get_trigrams(word) for i in self._index.get(trigram, ())
+        )
+
+        matcher = difflib.SequenceMatcher()
+        matcher.set_seq2(word)
+        scores = []
+
+        for i, _ in shared.most_common(max(self.shortlist, n)):
+            matcher.set_seq1(self._lower[i])
+            if matcher.real_quick_ratio() < cutoff or matcher.quick_ratio() < cutoff:
+                continue
+            ratio = matcher.ratio()
+            if ratio >= cutoff:
+                scores.append((-ratio, i))
+
+        return [self.possibilities[i] for _, i in sorted(scores)[:n]]
+
+
 def _get_case_insensitive_close_matches(
     word: str, possibilities: List[str], n: int = 3, cutoff: float = 0.6
 ) -> List[str]:
-    """A case-insensitive wrapper around difflib.get_close_matches.
+    """A case-insensitive version of difflib.get_close_matches.
+
+    A new _TrigramMatcher is built for the possibilities on each call: callers that
+    look words up in the same long list of possibilities (e.g. dataset IDs or
+    spectral indices) should build the matcher once and keep it instead.
 
     Args:
         word : A string for which close matches are desired.
@@ -41,10 +153,7 @@ def _get_case_insensitive_close_matches(
         >>> _get_case_insensitive_close_matches("mse", ["MSE", "ERGAS"])
         ["MSE"]
     """
-    lower_matches = difflib.get_close_matches(
-        word.lower(), [p.lower() for p in possibilities], n, cutoff
-    )
-    return [p for p in possibilities if p.lower() in lower_matches]
+    return _TrigramMatcher(possibilities).get_close_matches(word, n, cutoff)
 
 
 def _filter_image_bands(img: ee.Image, keep_bands: Sequence[str]) -> ee.Image:
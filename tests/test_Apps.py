@@ -2,7 +2,7 @@ import unittest
 
 import ee
 
-from ee_extra.Apps.core import apps
+from ee_extra.Apps.core import apps, searchApps
 
 ee.Initialize()
 
@@ -15,6 +15,14 @@ class Test(unittest.TestCase):
         self.assertIsInstance(apps(), dict)
         self.assertIsInstance(apps(True), dict)
 
+    def test_searchApps(self):
+        """Test the searchApps() method"""
+        url = "https://jstnbraaten.users.earthengine.app/view/conus-cover-vis"
+        self.assertIn(url, searchApps("conus-cover-vis", "exact"))
+        self.assertIn(url, searchApps("jstnbraaten cov"))
+        self.assertIn(url, searchApps("jstnbraten conus", "fuzzy"))
+        self.assertEqual(searchApps("zzzzzzzz"), [])
+
 
 if __name__ == "__main__":
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,165 @@
+import unittest
+
+import ee
+
+from ee_extra.Image.basic import *
+from ee_extra.Image.basic import _get_center
+
+ee.Initialize()
+
+x = ee.Image("LANDSAT/LC08/C01/T1_TOA/LC08_047027_20160819").select(["B4", "B5"])
+rcl = [[i / 20, (i + 1) / 20, i] for i in range(20)]
+
+
+def graph_size(obj):
+    """Size of the serialized expression graph of an EE object."""
+    return len(obj.serialize())
+
+
+def naive_reclassify(img, rcl):
+    """Reclassification with chained where calls."""
+    result = img
+    for lower, upper, becomes in rcl:
+        result = result.where(img.gt(lower).And(img.lte(upper)), becomes)
+    return result
+
+
+def naive_unstack(ic):
+    """Unstacking that computes the size of the collection in every graph."""
+    return [ee.Image(ic.toList(ic.size()).get(i)) for i in range(ic.size().getInfo())]
+
+
+def naive_displace(img, dx, dy):
+    """Moves the pixels of an image by per-pixel offsets in degrees."""
+    offsets = ee.Image.cat([dx, dy]).multiply(111320).rename(["dx", "dy"])
+    return img.displace(offsets)
+
+
+def naive_flip(img, direction):
+    """Flip with a per-pixel displacement."""
+    lonlat = ee.Image.pixelLonLat()
+    cx, cy = _get_center(img)
+    if direction == "y":
+        lat = lonlat.select("latitude")
+        return naive_displace(img, ee.Image(0), lat.multiply(-2).add(cy.multiply(2)))
+    lon = lonlat.select("longitude")
+    return naive_displace(img, lon.multiply(-2).add(cx.multiply(2)), ee.Image(0))
+
+
+def naive_rotate(img):
+    """Rotation that masks and displaces the western half per pixel."""
+    lon = ee.Image.pixelLonLat().select("longitude")
+    east = img.updateMask(lon.lte(180))
+    west = naive_displace(img.updateMask(lon.gt(180)), ee.Image(-360), ee.Image(0))
+    return ee.ImageCollection([east, west]).mosaic()
+
+
+def naive_transpose(img):
+    """Transposition with a per-pixel displacement."""
+    lonlat = ee.Image.pixelLonLat()
+    lon, lat = lonlat.select("longitude"), lonlat.select("latitude")
+    return naive_displace(img, lat.subtract(lon), lon.subtract(lat))
+
+
+def naive_distanceFromPoints(img, points):
+    """Distance from a painted raster of the points."""
+    painted = ee.Image().paint(ee.FeatureCollection(points), 1)
+    pixels = painted.fastDistanceTransform().sqrt()
+    return (
+        pixels.multiply(ee.Image.pixelArea().sqrt())
+        .rename("distance")
+        .reproject(img.projection())
+    )
+
+
+def naive_area(img):
+    """Cell area from the latitude of each pixel."""
+    lat = ee.Image.pixelLonLat().select("latitude")
+    scale = img.projection().nominalScale()
+    return (
+        lat.multiply(3.141592653589793 / 180)
+        .cos()
+        .multiply(scale.pow(2))
+        .divide(1e6)
+        .rename("area")
+        .setDefaultProjection(img.projection())
+    )
+
+
+class Test(unittest.TestCase):
+    """Tests for ee_extra package."""
+
+    def test_minvalue(self):
+        """Test the minvalue() method"""
+        test = minvalue(x, 1000)
+        self.assertIsInstance(test, dict)
+
+    def test_maxvalue(self):
+        """Test the maxvalue() method"""
+        test = maxvalue(x, 1000)
+        self.assertIsInstance(test, dict)
+
+    def test_summary(self):
+        """Test the summary() method"""
+        test = summary(x, 1000)
+        self.assertEqual(sorted(test.keys()), ["B4", "B5"])
+        self.assertLessEqual(test["B4"]["min"], test["B4"]["max"])
+
+    def test_cellStats(self):
+        """Test the cellStats() method"""
+        test = cellStats(x, "sd", 1000)
+        self.assertEqual(sorted(test.keys()), ["B4", "B5"])
+
+    def test_unstack(self):
+        """Test the unstack() method"""
+        test = unstack(ee.ImageCollection([x, x]))
+        self.assertEqual(len(test), 2)
+        self.assertIsInstance(test[0], ee.image.Image)
+        naive = naive_unstack(ee.ImageCollection([x, x]))
+        self.assertLess(sum(map(graph_size, test)), sum(map(graph_size, naive)))
+
+    def test_flip(self):
+        """Test the flip() method"""
+        for direction in ["x", "y"]:
+            test = flip(x, direction)
+            self.assertIsInstance(test, ee.image.Image)
+            self.assertLess(graph_size(test), graph_size(naive_flip(x, direction)))
+
+    def test_rotate(self):
+        """Test the rotate() method"""
+        test = rotate(x)
+        self.assertIsInstance(test, ee.image.Image)
+        self.assertIn("Image.clip", test.serialize())
+        self.assertLess(graph_size(test), graph_size(naive_rotate(x)))
+
+    def test_transpose(self):
+        """Test the transpose() method"""
+        test = transpose(x)
+        self.assertIsInstance(test, ee.image.Image)
+        self.assertLess(graph_size(test), graph_size(naive_transpose(x)))
+
+    def test_reclassify(self):
+        """Test the reclassify() method"""
+        img = x.select("B4")
+        test = reclassify(img, rcl)
+        self.assertIsInstance(test, ee.image.Image)
+        self.assertIsInstance(reclassify(img, [[1, 10], [2, 20]]), ee.image.Image)
+        self.assertLess(graph_size(test), graph_size(naive_reclassify(img, rcl)))
+
+    def test_distanceFromPoints(self):
+        """Test the distanceFromPoints() method"""
+        point = ee.Geometry.Point([-122.3, 47.6])
+        test = distanceFromPoints(x, point)
+        self.assertIsInstance(test, ee.image.Image)
+        naive = naive_distanceFromPoints(x, point)
+        self.assertLess(graph_size(test), graph_size(naive))
+
+    def test_area(self):
+        """Test the area() method"""
+        test = area(x)
+        self.assertIsInstance(test, ee.image.Image)
+        self.assertLess(graph_size(test), graph_size(naive_area(x)))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -18,6 +18,27 @@ class Test(unittest.TestCase):
         test = closest(x, "2020-01-01")
         self.assertIsInstance(test, ee.imagecollection.ImageCollection)
 
+    def test_closestBatch(self):
+        """Test the closestBatch() method"""
+        test = closestBatch(x, ["2020-01-01", "2020-06-15"], point, 10, "day")
+        self.assertIsInstance(test, ee.imagecollection.ImageCollection)
+        self.assertEqual(test.size().getInfo(), 2)
+
+    def test_closestBatch_mixed_geometries(self):
+        """Test that closestBatch() rejects geometries mixed with None"""
+        with self.assertRaises(ValueError):
+            closestBatch(x, ["2020-01-01", "2020-06-15"], [point, None], 10, "day")
+
+    def test_closestBatch_single_date(self):
+        """Test that closestBatch() takes a single date as one target"""
+        test = closestBatch(x, "2020-01-01", point, 10, "day")
+        self.assertEqual(test.size().getInfo(), 1)
+
+    def test_closestBatch_no_dates(self):
+        """Test that closestBatch() rejects an empty list of dates"""
+        with self.assertRaises(ValueError):
+            closestBatch(x, [], point, 10, "day")
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -56,6 +56,11 @@ class Test(unittest.TestCase):
         mse = getMetrics(["MSE"])[0]
         self.assertIs(mse, MSE)
 
+    def test_get_metrics_close_matches(self):
+        """Test that getMetrics suggests close matches for invalid names"""
+        with self.assertRaisesRegex(AttributeError, "Close matches: \\['MSE'"):
+            getMetrics(["mse"])
+
     def test_all_metrics(self):
         """Test that all metrics run"""
         metrics = listMetrics().values()
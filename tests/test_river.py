@@ -0,0 +1,344 @@
+import json
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from ee_extra.Algorithms import river, tasks
+from ee_extra.Algorithms.river import (
+    CORNER_KERNELS,
+    ENDPOINT_KERNELS,
+    THINNING_KERNELS,
+    parse_landsat_id,
+    splitKernel,
+)
+from ee_extra.Algorithms.tasks import TaskScheduler
+
+
+class FakeBackend:
+    """Task backend that finishes each task after a number of polls."""
+
+    def __init__(self, polls=2, fail=(), hidden=0):
+        self.polls = polls
+        self.fail = fail
+        self.hidden = hidden
+        self.submitted = []
+        self.remaining = {}
+        self.unlisted = {}
+        self.max_in_flight = 0
+
+    def submit(self, make_task):
+        key = make_task()
+        if key in self.fail:
+            raise RuntimeError("submission failed")
+        self.submitted.append(key)
+        self.remaining[key] = self.polls
+        self.unlisted[key] = self.hidden
+        return key
+
+    def states(self, ids):
+        self.max_in_flight = max(self.max_in_flight, len(ids))
+        states = {}
+        for id in ids:
+            if self.unlisted.get(id, 0) > 0:
+                # submitted tasks take some polls to be listed
+                self.unlisted[id] -= 1
+                states[id] = "UNKNOWN"
+                continue
+            self.remaining[id] -= 1
+            states[id] = "COMPLETED" if self.remaining[id] <= 0 else "RUNNING"
+        return states
+
+
+class FakeImageCollection:
+    """ee.ImageCollection built from a list of images, whose map is recorded."""
+
+    def __init__(self, images):
+        self.images = images
+
+    def map(self, func):
+        return ("map", self.images, func)
+
+
+def make_jobs(n):
+    return {f"scene_{i}": (lambda i=i: f"scene_{i}") for i in range(n)}
+
+
+class Test(unittest.TestCase):
+    """Tests for the river batch task scheduler."""
+
+    def test_max_active(self):
+        """Test that no more than max_active tasks are in flight"""
+        backend = FakeBackend()
+        scheduler = TaskScheduler(backend, max_active=3, sleep=lambda s: None)
+        states = scheduler.run(make_jobs(10))
+        self.assertEqual(set(states.values()), {"COMPLETED"})
+        self.assertEqual(len(backend.submitted), 10)
+        self.assertLessEqual(backend.max_in_flight, 3)
+
+    def test_backoff(self):
+        """Test that the time between polls grows while nothing changes"""
+        waits = []
+        backend = FakeBackend(polls=5)
+        scheduler = TaskScheduler(
+            backend, poll_interval=1, max_poll_interval=4, sleep=waits.append
+        )
+        scheduler.run(make_jobs(1))
+        self.assertEqual(waits, [1, 1, 2, 4, 4])
+
+    def test_failed_submission(self):
+        """Test that failed submissions are recorded"""
+        backend = FakeBackend(fail=["scene_1"])
+        scheduler = TaskScheduler(backend, sleep=lambda s: None)
+        states = scheduler.run(make_jobs(3))
+        self.assertEqual(states["scene_1"], "FAILED")
+        self.assertEqual(states["scene_2"], "COMPLETED")
+
+    def test_unknown_tasks(self):
+        """Test that tasks are polled until they are listed by the backend"""
+        backend = FakeBackend(hidden=3)
+        scheduler = TaskScheduler(backend, sleep=lambda s: None)
+        self.assertEqual(
+            scheduler.run(make_jobs(2)), dict.fromkeys(make_jobs(2), "COMPLETED")
+        )
+
+        backend = FakeBackend(hidden=5)
+        scheduler = TaskScheduler(backend, max_unknown_polls=5, sleep=lambda s: None)
+        states = scheduler.run(make_jobs(2))
+        self.assertEqual(set(states.values()), {"FAILED"})
+        self.assertEqual(
+            scheduler.jobs["scene_0"]["error"], "Task not found after 5 polls."
+        )
+
+    def test_checkpoint(self):
+        """Test that a scheduler resumes from a checkpoint"""
+        with tempfile.TemporaryDirectory() as tmp:
+            checkpoint = os.path.join(tmp, "tasks.json")
+            with open(checkpoint, "w") as f:
+                json.dump(
+                    {
+                        "scene_0": {"id": "scene_0", "state": "COMPLETED", "error": None},
+                        "scene_1": {"id": "scene_1", "state": "RUNNING", "error": None},
+                    },
+                    f,
+                )
+            backend = FakeBackend()
+            backend.remaining["scene_1"] = 1
+            scheduler = TaskScheduler(
+                backend, checkpoint=checkpoint, sleep=lambda s: None
+            )
+            states = scheduler.run(make_jobs(3))
+            self.assertEqual(set(states.values()), {"COMPLETED"})
+            self.assertEqual(backend.submitted, ["scene_2"])
+            with open(checkpoint) as f:
+                self.assertEqual(json.load(f)["scene_2"]["state"], "COMPLETED")
+
+    def test_checkpoint_over_max_active(self):
+        """Test that no job is submitted while resumed jobs exceed max_active"""
+        with tempfile.TemporaryDirectory() as tmp:
+            checkpoint = os.path.join(tmp, "tasks.json")
+            running = {
+                f"scene_{i}": {"id": f"scene_{i}", "state": "RUNNING", "error": None}
+                for i in range(6)
+            }
+            with open(checkpoint, "w") as f:
+                json.dump(running, f)
+            backend = FakeBackend()
+            for key in running:
+                backend.remaining[key] = 1
+            scheduler = TaskScheduler(
+                backend, max_active=2, checkpoint=checkpoint, sleep=lambda s: None
+            )
+            states = scheduler.run(make_jobs(12))
+            self.assertEqual(set(states.values()), {"COMPLETED"})
+            self.assertEqual(len(backend.submitted), 6)
+            self.assertEqual(backend.max_in_flight, 6)
+
+    def test_failed_submission_resume(self):
+        """Test that failed submissions are only resubmitted with retry_failed"""
+        with tempfile.TemporaryDirectory() as tmp:
+            checkpoint = os.path.join(tmp, "tasks.json")
+            backend = FakeBackend(fail=["scene_1"])
+            TaskScheduler(backend, checkpoint=checkpoint, sleep=lambda s: None).run(
+                make_jobs(2)
+            )
+
+            backend = FakeBackend()
+            scheduler = TaskScheduler(
+                backend, checkpoint=checkpoint, sleep=lambda s: None
+            )
+            self.assertEqual(scheduler.run(make_jobs(2))["scene_1"], "FAILED")
+            self.assertEqual(backend.submitted, [])
+
+            scheduler = TaskScheduler(
+                backend, checkpoint=checkpoint, retry_failed=True, sleep=lambda s: None
+            )
+            self.assertEqual(scheduler.run(make_jobs(2))["scene_1"], "COMPLETED")
+            self.assertEqual(backend.submitted, ["scene_1"])
+
+    def test_ee_backend_states(self):
+        """Test that only the given tasks are requested with getTaskStatus"""
+        statuses = [
+            {"id": "A", "state": "COMPLETED"},
+            {"id": "B", "state": "READY"},
+            {"id": "D", "state": "UNKNOWN"},
+        ]
+        with mock.patch.object(
+            tasks.ee.data, "getTaskStatus", return_value=statuses
+        ) as getTaskStatus:
+            backend = tasks.EETaskBackend()
+            self.assertEqual(
+                backend.states(["A", "B", "D"]),
+                {"A": "COMPLETED", "B": "READY", "D": "UNKNOWN"},
+            )
+            getTaskStatus.assert_called_once_with(["A", "B", "D"])
+            self.assertEqual(backend.states([]), {})
+            self.assertEqual(getTaskStatus.call_count, 1)
+
+    def test_maximum_no_of_tasks(self):
+        """Test that the deprecated wrapper waits until a slot is free"""
+        waits = []
+        with mock.patch.object(
+            river, "count_active_tasks", side_effect=[3, 3, 1]
+        ), mock.patch.object(river.time, "sleep", waits.append):
+            with self.assertWarns(DeprecationWarning):
+                river.maximum_no_of_tasks(2, 60)
+        self.assertEqual(waits, [10, 60, 60])
+
+    def test_parse_landsat_id(self):
+        """Test that Landsat ids are parsed client-side"""
+        expected = ("LC08", "LANDSAT/LC08/C01/T1_SR/LC08_022034_20130422")
+        self.assertEqual(
+            parse_landsat_id("LC08_L1TP_022034_20130422_20170310_01_T1"), expected
+        )
+        self.assertEqual(parse_landsat_id(expected[1]), expected)
+        with self.assertRaises(Exception):
+            parse_landsat_id("LE07_L1TP_022034_20130422_20170310_01_T1")
+
+    def test_split_shards(self):
+        """Test that scenes are split into consecutive shards of even size"""
+        ids = [f"scene_{i}" for i in range(7)]
+        self.assertEqual(
+            [len(shard) for shard in river._split_shards(ids, 3)], [3, 3, 1]
+        )
+        self.assertEqual(sum(river._split_shards(ids, 3), []), ids)
+        self.assertEqual(len(river._split_shards(ids, 20)), 7)
+        self.assertEqual(river._split_shards(ids, 0), [ids])
+        self.assertEqual(river._split_shards([], 3), [])
+
+    def test_rwc_collection(self):
+        """Test that each shard of ids loads, maps and flattens its own scenes"""
+        ids = [f"scene_{i}" for i in range(5)]
+        with mock.patch.object(
+            river, "merge_collections_std_bandnames_collection1tier1_sr"
+        ) as merge, mock.patch.object(river, "rwGenSR") as rwGenSR, mock.patch.object(
+            river, "str_to_ee", side_effect=lambda id: f"image_{id}"
+        ), mock.patch(
+            "ee.ImageCollection", FakeImageCollection
+        ), mock.patch(
+            "ee.FeatureCollection"
+        ) as FeatureCollection, mock.patch(
+            "ee.batch.Export.table.toDrive"
+        ) as toDrive:
+            fcs = river.rwc_collection(ids, shards=2, return_fc=True)
+
+            merge.assert_not_called()
+            self.assertEqual(rwGenSR.call_count, 1)
+            self.assertEqual(
+                [call.args[0] for call in FeatureCollection.call_args_list],
+                [
+                    ("map", [f"image_{id}" for id in ids[:3]], rwGenSR.return_value),
+                    ("map", [f"image_{id}" for id in ids[3:]], rwGenSR.return_value),
+                ],
+            )
+            self.assertEqual(
+                fcs, [FeatureCollection.return_value.flatten.return_value] * 2
+            )
+            toDrive.assert_not_called()
+
+            tasks = river.rwc_collection(ids, "widths", shards=2, start_task=False)
+            self.assertEqual(len(tasks), 2)
+            self.assertEqual(
+                [call.kwargs["description"] for call in toDrive.call_args_list],
+                ["widths_0", "widths_1"],
+            )
+            toDrive.return_value.start.assert_not_called()
+
+            river.rwc_collection(ids, "widths", start_task=False)
+            self.assertEqual(toDrive.call_args.kwargs["description"], "widths")
+
+    def test_rwc_collection_unknown_id(self):
+        """Test that an unrecognized id raises instead of being dropped"""
+        with mock.patch.object(river, "rwGenSR"), mock.patch("ee.Image"):
+            with self.assertRaisesRegex(Exception, "Landsat 7"):
+                river.rwc_collection(
+                    [
+                        "LC08_L1TP_022034_20130422_20170310_01_T1",
+                        "LE07_L1TP_022034_20130422_20170310_01_T1",
+                    ],
+                    return_fc=True,
+                )
+
+    def test_rwc_collection_image_collection(self):
+        """Test that a collection is mapped without listing its scenes"""
+        images = mock.MagicMock(spec=river.ee.ImageCollection)
+        standardized = images.map.return_value
+        with mock.patch.object(river, "rwGenSR") as rwGenSR, mock.patch(
+            "ee.Filter"
+        ) as Filter, mock.patch("ee.FeatureCollection") as FeatureCollection:
+            fcs = river.rwc_collection(images, return_fc=True)
+            images.aggregate_array.assert_not_called()
+            images.map.assert_called_once_with(river.std_bandnames)
+            standardized.map.assert_called_once_with(rwGenSR.return_value)
+            self.assertEqual(len(fcs), 1)
+
+            fcs = river.rwc_collection(images, shards=3, return_fc=True)
+            standardized.randomColumn.assert_called_once_with("rwc_shard", 0)
+            self.assertEqual(
+                Filter.gte.call_args_list,
+                [mock.call("rwc_shard", i / 3) for i in range(3)],
+            )
+            self.assertEqual(
+                Filter.lt.call_args_list,
+                [mock.call("rwc_shard", (i + 1) / 3) for i in range(3)],
+            )
+            self.assertEqual(len(fcs), 3)
+            self.assertEqual(FeatureCollection.call_count, 4)
+
+    def test_thinning_kernels(self):
+        """Test that the thinning kernels are four rotations of two pairs"""
+        for method, pairs in THINNING_KERNELS.items():
+            self.assertEqual(len(pairs), 8)
+            self.assertEqual(pairs[2][0], tuple(zip(*pairs[0][0][::-1])))
+
+    def test_centerline_thinning(self):
+        """Test that the centerline is thinned with the iterate-based Thinning"""
+        img = mock.MagicMock()
+        with mock.patch("ee.Image") as Image, mock.patch.object(
+            river, "Thinning"
+        ) as Thinning:
+            cl1px = river.CalcOnePixelWidthCenterline(img, "GM", 0.9)
+        cl = Image.return_value.mask.return_value.lte.return_value.And.return_value
+        Thinning.assert_called_once_with(cl, 2, 1)
+        self.assertIs(cl1px, Thinning.return_value)
+
+    def test_splitKernel(self):
+        """Test that splitting a kernel does not modify it"""
+        kernel = [[2, 2, 2], [0, 1, 0], [1, 1, 1]]
+        self.assertEqual(splitKernel(kernel, 1), [[0, 0, 0], [0, 1, 0], [1, 1, 1]])
+        self.assertEqual(splitKernel(kernel, 2), [[1, 1, 1], [0, 0, 0], [0, 0, 0]])
+        self.assertEqual(kernel, [[2, 2, 2], [0, 1, 0], [1, 1, 1]])
+
+    def test_cached_kernels(self):
+        """Test that the cached kernels are immutable and have disjoint hit/miss cells"""
+        for pairs in [ENDPOINT_KERNELS, CORNER_KERNELS, *THINNING_KERNELS.values()]:
+            self.assertIsInstance(pairs, tuple)
+            hash(pairs)
+            for hit, miss in pairs:
+                self.assertFalse(
+                    any(h and m for r1, r2 in zip(hit, miss) for h, m in zip(r1, r2))
+                )
+
+
+if __name__ == "__main__":
+    unittest.main()
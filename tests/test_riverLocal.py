@@ -0,0 +1,77 @@
+import os
+import tempfile
+import unittest
+
+import pytest
+
+np = pytest.importorskip("numpy")
+pytest.importorskip("scipy")
+
+from ee_extra.Algorithms import riverLocal  # noqa: E402
+from ee_extra.Algorithms.riverLocal import riverWidths, thinning  # noqa: E402
+
+
+class Test(unittest.TestCase):
+    """Tests for the local (NumPy) river centerline and width engine."""
+
+    def test_thinning(self):
+        """Test that thinning converges to a one pixel wide line"""
+        image = np.zeros((20, 40), np.uint8)
+        image[5:14, 3:37] = 1
+        skeleton, iterations = thinning(image)
+        self.assertLess(iterations, 10)
+        self.assertEqual(skeleton[5:14, 10:30].sum(axis=0).tolist(), [1] * 20)
+        self.assertEqual(thinning(skeleton)[1], 0)
+        self.assertEqual(thinning(image, maxIterations=1)[1], 1)
+
+    def test_riverWidths(self):
+        """Test the widths of a straight channel"""
+        mask = np.zeros((200, 400), np.uint8)
+        mask[80:120, :] = 1
+        widths = riverWidths(mask, scale=30)
+        self.assertEqual(set(widths["row"].tolist()), {100})
+        self.assertAlmostEqual(np.median(widths["width"]) / 1200, 1, delta=0.05)
+        self.assertFalse(widths["endsInWater"].any())
+
+    def test_riverWidths_tiles(self):
+        """Test that tiled and untiled widths match"""
+        rows, cols = np.mgrid[:300, :600]
+        mask = (np.abs(rows - 150 - 60 * np.sin(cols / 50)) < 12).astype(np.uint8)
+        untiled = riverWidths(mask, tileSize=1024)
+        tiled = riverWidths(mask, tileSize=128, halo=64)
+        parallel = riverWidths(mask, tileSize=128, halo=64, processes=2)
+        for column in untiled:
+            np.testing.assert_allclose(tiled[column], untiled[column])
+            np.testing.assert_allclose(parallel[column], untiled[column])
+
+    def test_riverWidths_memmap(self):
+        """Test that workers read their windows of a memmap from its file"""
+        rows, cols = np.mgrid[:300, :600]
+        mask = (np.abs(rows - 150 - 60 * np.sin(cols / 50)) < 12).astype(np.uint8)
+        expected = riverWidths(mask, tileSize=128, halo=64)
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "mask.npy")
+            np.save(path, mask * 255)
+            memmap = np.load(path, mmap_mode="r")
+            window = (slice(0, 10), slice(0, 10))
+            self.assertIsInstance(
+                riverLocal._tileInput(memmap, window), riverLocal._MemmapReader
+            )
+            self.assertIsInstance(
+                riverLocal._tileInput(memmap[::2], window), np.ndarray
+            )
+            parallel = riverWidths(memmap, tileSize=128, halo=64, processes=2)
+            del memmap
+        for column in expected:
+            np.testing.assert_allclose(parallel[column], expected[column])
+
+    def test_riverWidths_small_halo(self):
+        """Test that a halo smaller than the cross-sections raises a warning"""
+        mask = np.zeros((200, 400), np.uint8)
+        mask[80:120, :] = 1
+        with self.assertWarns(UserWarning):
+            riverWidths(mask, tileSize=100, halo=4)
+
+
+if __name__ == "__main__":
+    unittest.main()
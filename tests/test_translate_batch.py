@@ -0,0 +1,84 @@
+import json
+import os
+import pathlib
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+from ee_extra.JavaScript import batch
+from ee_extra.JavaScript.batch import ee_js_to_py_batch
+
+FIXTURES = pathlib.Path(__file__).parent.joinpath("onefile")
+
+
+class Test(unittest.TestCase):
+    """Tests the batch translation of JavaScript files"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.src = pathlib.Path(self.tmp.name, "src")
+        self.out = pathlib.Path(self.tmp.name, "out")
+        self.src.joinpath("lib").mkdir(parents=True)
+        self.src.joinpath("a.js").write_text("var a = 1;\nexports.a = a;\n")
+        self.src.joinpath("lib", "b.js").write_text("var b = [1, 2].length;\n")
+        # test_03.js is a known failure of the translator
+        shutil.copy(FIXTURES.joinpath("test_03.js"), self.src.joinpath("broken.js"))
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def run_batch(self, **kwargs):
+        results = ee_js_to_py_batch(
+            [str(self.src)], out_dir=str(self.out), black=False, max_workers=2, **kwargs
+        )
+        return {
+            pathlib.Path(entry["source"]).name: entry["status"] for entry in results
+        }
+
+    def test_batch(self):
+        """Test that files are translated, skipped when up to date and reported"""
+        self.assertEqual(
+            self.run_batch(), {"a.js": "ok", "b.js": "ok", "broken.js": "error"}
+        )
+        self.assertTrue(self.out.joinpath("lib", "b.py").exists())
+        with open(self.out.joinpath("ee_js_to_py_report.json")) as f:
+            report = json.load(f)
+        self.assertEqual(report["summary"]["error"], 1)
+
+        # touching a file does not change its hash
+        os.utime(self.src.joinpath("a.js"))
+        self.src.joinpath("lib", "b.js").write_text("var b = [1, 2, 3].length;\n")
+        self.assertEqual(
+            self.run_batch(), {"a.js": "skipped", "b.js": "ok", "broken.js": "error"}
+        )
+        self.assertEqual(
+            self.run_batch(force=True)["a.js"],
+            "ok",
+        )
+
+    def test_report_next_to_inputs(self):
+        """Test that without out_dir the report is written next to the inputs"""
+        cwd = os.getcwd()
+        os.chdir(self.tmp.name)
+        try:
+            ee_js_to_py_batch([str(self.src.joinpath("**", "*.js"))], black=False)
+        finally:
+            os.chdir(cwd)
+        self.assertTrue(self.src.joinpath("ee_js_to_py_report.json").exists())
+        self.assertFalse(
+            pathlib.Path(self.tmp.name, "ee_js_to_py_report.json").exists()
+        )
+        self.assertTrue(self.src.joinpath("lib", "b.py").exists())
+
+    def test_missing_black(self):
+        """Test that a missing black fails before any file is translated"""
+        error = ImportError('"black" is not installed.')
+        with mock.patch.object(batch, "_check_black", side_effect=error):
+            with self.assertRaisesRegex(ImportError, "black"):
+                ee_js_to_py_batch([str(self.src)], out_dir=str(self.out))
+        self.assertFalse(self.out.exists())
+
+
+if __name__ == "__main__":
+    unittest.main()
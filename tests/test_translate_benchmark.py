@@ -0,0 +1,101 @@
+import json
+import os
+import platform
+import unittest
+
+from benchmarks.corpus import synthetic_script
+from benchmarks.translate_regression import (
+    BASELINES,
+    calibrate,
+    compare,
+    compare_baselines,
+    machine,
+    measure,
+    scaling,
+)
+from ee_extra.JavaScript.translate_main import translate
+
+
+class Test(unittest.TestCase):
+    """Tests the corpus and the regression check of the translator benchmark"""
+
+    def test_synthetic_script(self):
+        """Test that the corpus is reproducible and translates to valid Python"""
+        script = synthetic_script(300, seed=1)
+        self.assertEqual(script, synthetic_script(300, seed=1))
+        self.assertNotEqual(script, synthetic_script(300, seed=2))
+        self.assertGreaterEqual(script.count("\n"), 300)
+        compile(translate(script), "synthetic.py", "exec")
+
+    @unittest.skipUnless(
+        os.environ.get("EE_EXTRA_BENCHMARKS"), "set EE_EXTRA_BENCHMARKS to time"
+    )
+    def test_measure(self):
+        """Test the throughput and memory of a translation"""
+        result = measure(synthetic_script(100), repeat=1, speed=calibrate(repeat=1))
+        self.assertGreater(result["lines_per_second"], 0)
+        self.assertGreater(result["lines_per_calibration"], 0)
+        self.assertGreater(result["peak_mb"], 0)
+
+    def test_compare(self):
+        """Test that sizes that scale superlinearly are flagged"""
+        results = {
+            "1000": {"lines": 1000, "lines_per_second": 1000.0, "peak_mb": 2.0},
+            "10000": {"lines": 10000, "lines_per_second": 900.0, "peak_mb": 21.0},
+            "100000": {"lines": 100000, "lines_per_second": 100.0, "peak_mb": 400.0},
+        }
+        ratios = scaling(results, "1000")
+        self.assertEqual(ratios["1000"], {"throughput": 1.0, "memory": 1.0})
+        self.assertAlmostEqual(ratios["100000"]["memory"], 2.0)
+
+        regressions = compare(results, "1000")
+        self.assertEqual(len(regressions), 2)
+        self.assertTrue(all(r.startswith("100000 lines") for r in regressions))
+
+    def test_compare_baselines(self):
+        """Test that sizes slower or larger than their baseline are flagged"""
+        baseline = {"lines_per_calibration": 10.0, "peak_mb": 10.0}
+        results = {
+            "100": {"lines_per_calibration": 9.0, "peak_mb": 10.0},
+            "1000": {"lines_per_calibration": 5.0, "peak_mb": 20.0},
+            "10000": {"lines_per_calibration": 1.0, "peak_mb": 1.0},
+        }
+        regressions = compare_baselines(results, {"100": baseline, "1000": baseline})
+        self.assertEqual(len(regressions), 2)
+        self.assertTrue(all(r.startswith("1000 lines") for r in regressions))
+
+    def test_uniform_slowdown(self):
+        """Test that a slowdown of every size is only caught by the baselines"""
+        baselines = {
+            size: {
+                "lines": int(size),
+                "lines_per_second": 1000.0,
+                "lines_per_calibration": 10.0,
+                "peak_mb": 1.0,
+            }
+            for size in ("100", "1000")
+        }
+        results = {
+            size: {**baseline, "lines_per_second": 500.0, "lines_per_calibration": 5.0}
+            for size, baseline in baselines.items()
+        }
+        self.assertEqual(compare(results, "100"), [])
+        self.assertEqual(len(compare_baselines(results, baselines)), 2)
+
+    def test_stored_baselines(self):
+        """Test that the committed baselines cover every size under a stable key"""
+        self.assertNotIn(platform.node(), machine().split("-"))
+        with open(BASELINES, "r", encoding="utf-8") as f:
+            stored = json.load(f)
+        self.assertIn("x86_64-py3.11", stored)
+        for key, baselines in stored.items():
+            self.assertRegex(key, r"^\w+-py3\.\d+$")
+            self.assertEqual(set(baselines), {"100", "1000", "10000", "100000"})
+            for baseline in baselines.values():
+                self.assertGreater(baseline["lines_per_calibration"], 0)
+                self.assertGreater(baseline["peak_mb"], 0)
+            self.assertEqual(compare_baselines(baselines, baselines), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
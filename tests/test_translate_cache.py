@@ -0,0 +1,107 @@
+import os
+import pathlib
+import tempfile
+import unittest
+from unittest import mock
+
+from ee_extra.JavaScript import cache
+from ee_extra.JavaScript.merge import require
+
+MODULE = """
+var addOne = function(x) {
+  return x + 1;
+};
+exports.addOne = addOne;
+"""
+
+
+class Test(unittest.TestCase):
+    """Tests the translation cache"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        sources = pathlib.Path(self.tmp.name)
+        sources.joinpath("users", "test").mkdir(parents=True)
+        sources.joinpath("users", "test", "module.js").write_text(MODULE)
+        self.patch = mock.patch(
+            "ee_extra.JavaScript.install._get_ee_sources_path",
+            return_value=self.tmp.name,
+        )
+        self.cache_patch = mock.patch.dict(
+            os.environ, {"EE_EXTRA_CACHE_DIR": str(sources.joinpath(".cache"))}
+        )
+        self.patch.start()
+        self.cache_patch.start()
+
+    def tearDown(self):
+        self.cache_patch.stop()
+        self.patch.stop()
+        self.tmp.cleanup()
+
+    def test_translate_cached(self):
+        """Test that an unchanged source is translated only once"""
+        with mock.patch.object(cache, "translate", wraps=cache.translate) as translate:
+            first = cache.translate_cached(MODULE)
+            second = cache.translate_cached(MODULE)
+            self.assertEqual(first, second)
+            self.assertEqual(translate.call_count, 1)
+            cache.translate_cached(MODULE, black=True)
+            self.assertEqual(translate.call_count, 2)
+
+    def test_translate_incremental(self):
+        """Test that only the edited units are translated again"""
+        edited = MODULE.replace("x + 1", "x + 2")
+        extra = "var double = function(x) {\n  return x * 2;\n};\n"
+        with mock.patch.object(
+            cache, "_translate_body", wraps=cache._translate_body
+        ) as translate:
+            cache.translate_incremental(MODULE)
+            self.assertEqual(translate.call_count, 2)
+            cache.translate_incremental(MODULE)
+            self.assertEqual(translate.call_count, 2)
+            module = cache.translate_incremental(extra + edited)
+            self.assertEqual(translate.call_count, 4)
+
+        namespace = {}
+        exec(module, namespace)
+        self.assertEqual(namespace["exports"].addOne(1), 3)
+        self.assertEqual(namespace["double"](2), 4)
+
+    def test_require_cached(self):
+        """Test that a repeated require loads the cached bytecode"""
+        with mock.patch.object(cache, "translate", wraps=cache.translate) as translate:
+            module = require("users/test:module")
+            self.assertEqual(module.addOne(1), 2)
+            module = require("users/test:module")
+            self.assertEqual(module.addOne(2), 3)
+            self.assertEqual(translate.call_count, 1)
+        self.assertEqual(len(list(cache._get_cache_path().glob("*.pyc"))), 1)
+
+        cache.clear_cache()
+        self.assertEqual(list(cache._get_cache_path().iterdir()), [])
+
+    def test_cache_path(self):
+        """Test that the cache lives in a per-user folder that can be overridden"""
+        self.assertEqual(cache._get_cache_path("/tmp/ee"), pathlib.Path("/tmp/ee"))
+        with mock.patch.dict(os.environ, {"EE_EXTRA_CACHE_DIR": "/tmp/env"}):
+            self.assertEqual(cache._get_cache_path(), pathlib.Path("/tmp/env"))
+        with mock.patch.dict(os.environ, {"XDG_CACHE_HOME": "/tmp/xdg"}):
+            del os.environ["EE_EXTRA_CACHE_DIR"]
+            self.assertEqual(
+                cache._get_cache_path(), pathlib.Path("/tmp/xdg/ee_extra/translate")
+            )
+            del os.environ["XDG_CACHE_HOME"]
+            self.assertEqual(
+                cache._get_cache_path(),
+                pathlib.Path.home().joinpath(".cache", "ee_extra", "translate"),
+            )
+
+        other = pathlib.Path(self.tmp.name, "other")
+        cache.translate_cached(MODULE, cache_dir=str(other))
+        self.assertEqual(len(list(other.glob("*.py"))), 1)
+        cache.clear_cache(str(other))
+        self.assertEqual(list(other.iterdir()), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
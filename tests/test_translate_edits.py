@@ -0,0 +1,55 @@
+import unittest
+
+from ee_extra.JavaScript.translate_functions import func_translate_case03
+from ee_extra.JavaScript.translate_jsm_wrappers import translate_trim
+from ee_extra.JavaScript.translate_main import fix_typeof, normalize_fn_name
+from ee_extra.JavaScript.translate_utils import EditBuffer, replace_in_order
+from ee_extra.JavaScript.utils import _get_pattern
+
+
+class Test(unittest.TestCase):
+    """Tests the position-aware rewriting of the translator passes"""
+
+    def test_edit_buffer(self):
+        """Test that edits are applied by position and overlaps are skipped"""
+        buffer = EditBuffer("abcdef")
+        buffer.replace(4, 6, "EF")
+        buffer.replace(0, 1, "A")
+        buffer.replace(0, 2, "XX")
+        self.assertEqual(buffer.apply(), "AbcdEF")
+        self.assertEqual(EditBuffer("abc").apply(), "abc")
+
+    def test_replace_in_order(self):
+        """Test that each pair rewrites only its own occurrence"""
+        self.assertEqual(
+            replace_in_order("a + a + b", [("a", "x"), ("b", "y")]), "x + a + y"
+        )
+
+    def test_unmatched_snippets(self):
+        """Test that text that only contains a match is not rewritten"""
+        self.assertEqual(
+            fix_typeof("typeof xy + typeof x")[0], "typeof(xy) + typeof(x)"
+        )
+        self.assertEqual(
+            normalize_fn_name("var f = function(x){}\nvar g = function(y){}"),
+            "function f(x){}\nfunction g(y){}",
+        )
+        self.assertEqual(
+            translate_trim("var s = a.trim() + b.trim();")[0],
+            "var s =__ee_extra_trim( a) +__ee_extra_trim( b);",
+        )
+
+    def test_export_names(self):
+        """Test that export names are matched literally and not kept compiled"""
+        x = func_translate_case03('exports["a.b"] = function(x) {\n  return x;\n};')
+        self.assertTrue(x.startswith("function "))
+        self.assertIn('exports["a.b"]  = ', x)
+
+        size = _get_pattern.cache_info().currsize
+        for i in range(20):
+            func_translate_case03(f"exports.f{i} = function(x) {{\n  return x;\n}};")
+        self.assertEqual(_get_pattern.cache_info().currsize, size)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,146 @@
+import json
+import os
+import pathlib
+import tempfile
+import threading
+import unittest
+import urllib.parse
+from functools import partial
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+from unittest import mock
+
+from ee_extra.JavaScript import install as jsinstall
+
+MODULES = {
+    "users/test/lib/main": "var a = require('users/test/lib:a');\n"
+    "var b = require('users/test/lib:b');\nexports.x = 1;",
+    "users/test/lib/a": "var b = require('users/test/lib:b');\nexports.a = 1;",
+    "users/test/lib/b": "exports.b = 1;",
+}
+
+
+class Handler(SimpleHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    requests = []
+
+    def do_GET(self):
+        Handler.requests.append(self.path)
+        # requests sent through a proxy have an absolute URL
+        self.path = urllib.parse.urlsplit(self.path).path
+        if self.path.startswith("/moved/"):
+            self.send_response(301)
+            self.send_header("Location", self.path[len("/moved") :])
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        super().do_GET()
+
+    def log_message(self, *args):
+        pass
+
+
+class Test(unittest.TestCase):
+    """Tests the installation of JavaScript modules from a local ee-sources bucket"""
+
+    def setUp(self):
+        self.bucket = tempfile.TemporaryDirectory()
+        self.sources = tempfile.TemporaryDirectory()
+        for name, content in MODULES.items():
+            path = pathlib.Path(self.bucket.name, name)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(content)
+
+        handler = partial(Handler, directory=self.bucket.name)
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        Handler.requests = []
+
+        self.patches = [
+            mock.patch.object(
+                jsinstall,
+                "EE_SOURCES_URL",
+                f"http://127.0.0.1:{self.server.server_address[1]}",
+            ),
+            mock.patch.object(
+                jsinstall, "_get_ee_sources_path", return_value=self.sources.name
+            ),
+        ]
+        for patch in self.patches:
+            patch.start()
+
+    def tearDown(self):
+        for patch in self.patches:
+            patch.stop()
+        self.server.shutdown()
+        self.server.server_close()
+        self.bucket.cleanup()
+        self.sources.cleanup()
+
+    def test_install(self):
+        """Test that each module of the graph is downloaded once and locked"""
+        installed = jsinstall.install("users/test/lib:main", quiet=True)
+        self.assertEqual(
+            installed, ["users/test/lib:main", "users/test/lib:a", "users/test/lib:b"]
+        )
+        self.assertEqual(len(Handler.requests), 3)
+        self.assertEqual(
+            jsinstall._open_module_as_str("users/test/lib:b"), "exports.b = 1;"
+        )
+
+        with open(jsinstall._get_lockfile_path()) as f:
+            lock = json.load(f)
+        self.assertEqual(
+            lock["users/test/lib:main"]["dependencies"],
+            ["users/test/lib:a", "users/test/lib:b"],
+        )
+
+    def test_install_offline(self):
+        """Test that installed modules need no network unless updated"""
+        jsinstall.install("users/test/lib:main", quiet=True)
+        self.server.shutdown()
+        installed = jsinstall.install("users/test/lib:main", quiet=True)
+        self.assertEqual(len(installed), 3)
+        self.assertEqual(len(Handler.requests), 3)
+
+    def test_update(self):
+        """Test that update downloads the modules again"""
+        jsinstall.install("users/test/lib:main", quiet=True)
+        jsinstall.install("users/test/lib:main", update=True, quiet=True)
+        self.assertEqual(len(Handler.requests), 6)
+
+    def test_modified_module(self):
+        """Test that a module edited after its installation is kept with a warning"""
+        jsinstall.install("users/test/lib:main", quiet=True)
+        path = jsinstall._convert_path_to_ee_extra("users/test/lib:b")
+        path.write_text("exports.b = 2;")
+        with self.assertWarnsRegex(UserWarning, "users/test/lib:b"):
+            jsinstall.install("users/test/lib:main", quiet=True)
+        self.assertEqual(len(Handler.requests), 3)
+        self.assertEqual(path.read_text(), "exports.b = 2;")
+
+    def test_redirect(self):
+        """Test that redirects are followed"""
+        url = jsinstall.EE_SOURCES_URL + "/moved/users/test/lib/b"
+        opener = jsinstall.urllib.request.build_opener()
+        self.assertEqual(jsinstall._download(opener, url), b"exports.b = 1;")
+        self.assertEqual(
+            Handler.requests, ["/moved/users/test/lib/b", "/users/test/lib/b"]
+        )
+
+    def test_proxy(self):
+        """Test that the proxy of the environment is used"""
+        proxy = {"http_proxy": jsinstall.EE_SOURCES_URL, "no_proxy": ""}
+        with mock.patch.dict(os.environ, proxy):
+            opener = jsinstall.urllib.request.build_opener()
+        url = "http://ee-sources.invalid/users/test/lib/b"
+        self.assertEqual(jsinstall._download(opener, url), b"exports.b = 1;")
+        self.assertEqual(Handler.requests, [url])
+
+    def test_missing_module(self):
+        """Test that a missing module raises an HTTP error"""
+        with self.assertRaises(jsinstall.urllib.error.HTTPError):
+            jsinstall.install("users/test/lib:missing", quiet=True)
+
+
+if __name__ == "__main__":
+    unittest.main()
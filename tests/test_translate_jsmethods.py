@@ -0,0 +1,72 @@
+import unittest
+from unittest import mock
+
+from ee_extra.JavaScript import translate_jsm_main as tjsm
+
+
+class Test(unittest.TestCase):
+    """Tests the dispatch of the JavaScript method translators"""
+
+    def test_find_jsmethods(self):
+        """Test that methods and functions are found in a single scan"""
+        self.assertEqual(
+            tjsm.find_jsmethods("var y = parseInt(x.substring(1).trim()) + a.length"),
+            {"parseInt", "substring", "trim", "length"},
+        )
+        self.assertEqual(tjsm.find_jsmethods("var y = myparseInt(x.trimAll)"), {"trim"})
+
+    def test_dispatch(self):
+        """Test that only the translators of the methods found are called"""
+        translators = {
+            name: mock.Mock(wraps=translator) for name, translator, _ in tjsm.JSMETHODS
+        }
+        table = [
+            (name, translators[name], header) for name, _, header in tjsm.JSMETHODS
+        ]
+        with mock.patch.object(tjsm, "JSMETHODS", table):
+            x, header = tjsm.translate_jsmethods("var y = x.trim();")
+        called = [name for name, translator in translators.items() if translator.called]
+        self.assertEqual(called, ["trim"])
+        self.assertIn("__ee_extra_trim", x)
+        self.assertIn("def __ee_extra_trim", header)
+
+    def test_nested_methods(self):
+        """Test that nested and chained methods translate as with every translator"""
+        for text in [
+            "var n = x.trim().length;",
+            "var n = parseInt(s.substr(1));",
+            "var a = String(x).slice(1).toUpperCase();",
+            "var t = s.charAt(0).concat(s.slice(1)).length;",
+        ]:
+            expected = text
+            for _, translator, _ in tjsm.JSMETHODS + tjsm.JSFUNCTIONS:
+                expected, _ = translator(expected)
+            self.assertEqual(tjsm.translate_jsmethods(text)[0], expected)
+
+    def test_rescan(self):
+        """Test that a method emitted by a translator is translated afterwards"""
+
+        def trim(x, cases=None):
+            return x.replace(".trim()", ".length"), False
+
+        table = [
+            (name, trim if name == "trim" else translator, header)
+            for name, translator, header in tjsm.JSMETHODS
+        ]
+        with mock.patch.object(tjsm, "JSMETHODS", table):
+            x, _ = tjsm.translate_jsmethods("var n = x.trim();")
+        self.assertEqual(x, "var n = __ee_extra_length(x);")
+
+    def test_shared_scans(self):
+        """Test that the scans of a text are shared within one translation only"""
+        finditer = mock.Mock(wraps=tjsm.jsmwrappers._finditer_cases)
+        with mock.patch.object(tjsm.jsmwrappers, "_finditer_cases", finditer):
+            x, _ = tjsm.translate_jsmethods("var y = x.charAt(0);")
+            self.assertEqual(x, "var y = __ee_extra_charAt(x, 0);")
+            self.assertEqual(finditer.call_count, 1)
+            tjsm.translate_jsmethods("var y = x.charAt(0);")
+            self.assertEqual(finditer.call_count, 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,35 @@
+import unittest
+
+from ee_extra import translate
+from ee_extra.JavaScript.translate_general import group_lines, line_runs
+from ee_extra.JavaScript.translate_main import ends_with_plus, line_starts_with_dot
+
+
+class Test(unittest.TestCase):
+    """Tests the line grouping of the translator"""
+
+    def test_line_runs(self):
+        """Test the run-length encoding of flagged lines"""
+        flags = [0, 0, 1, 1, 1, 0, 1, 0, 1]
+        self.assertEqual(line_runs(flags), [(2, 5), (6, 7), (8, 9)])
+        self.assertEqual(line_runs(flags, before=True), [(1, 5), (5, 7), (7, 9)])
+        self.assertEqual(line_runs(flags, after=True), [(2, 6), (6, 8), (8, 9)])
+        self.assertEqual(group_lines(flags), [0, 1, [2, 3, 4], 5, [6], 7, [8]])
+
+    def test_merge_lines(self):
+        """Test merging lines at the start and end of a file"""
+        self.assertEqual(ends_with_plus("'a' +\n'b'\nc"), "'a' +'b'\nc")
+        self.assertEqual(ends_with_plus("a\n'b' +"), "a\n'b' +")
+        self.assertEqual(
+            line_starts_with_dot("x = ee.Image(0)\n    .add(1)\n\n  .add(2)"),
+            "x = ee.Image(0).add(1).add(2)",
+        )
+
+    def test_large_module(self):
+        """Test a module with more lines than the int conversion limit (4300 digits)"""
+        text = "var x = ee.Image(0)\n    .add(1);\n" * 2500
+        self.assertEqual(translate(text).count("x = ee.Image(0).add(1)"), 2500)
+
+
+if __name__ == "__main__":
+    unittest.main()
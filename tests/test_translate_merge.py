@@ -0,0 +1,80 @@
+import pathlib
+import tempfile
+import unittest
+from unittest import mock
+
+from ee_extra.JavaScript import merge
+
+MODULES = {
+    "main": "var a = require('users/test:a');\nvar b = require('users/test:b');\n"
+    "exports.total = a.value + b.value;\n",
+    "a": "// uses c\nvar c = require('users/test:c');\nexports.value = c.base + 1;\n",
+    "b": "/* uses c */\nvar c = require('users/test:c');\nexports.value = c.base + 2;\n",
+    "c": "exports.base = 10;\n",
+}
+
+
+class Test(unittest.TestCase):
+    """Tests the merge of a module with its dependencies"""
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        folder = pathlib.Path(self.tmp.name, "users", "test")
+        folder.mkdir(parents=True)
+        for name, source in MODULES.items():
+            folder.joinpath(f"{name}.js").write_text(source)
+        self.patch = mock.patch(
+            "ee_extra.JavaScript.install._get_ee_sources_path",
+            return_value=self.tmp.name,
+        )
+        self.patch.start()
+
+    def tearDown(self):
+        self.patch.stop()
+        self.tmp.cleanup()
+
+    def test_junction(self):
+        """Test that a diamond dependency is loaded and inlined once"""
+        with mock.patch.object(
+            merge, "_open_module_as_str", wraps=merge._open_module_as_str
+        ) as load:
+            merged = merge.junction("users/test:main")
+        self.assertEqual(load.call_count, 4)
+        self.assertEqual(merged.count("exports.base = 10"), 0)
+        self.assertEqual(merged.count(".base = 10"), 1)
+        self.assertNotIn("require(", merged)
+        self.assertNotIn("uses c", merged)
+        self.assertLess(merged.index(".base = 10"), merged.index(".base + 1"))
+
+    def test_require(self):
+        """Test that the merged module evaluates the shared dependency"""
+        module = merge.require("users/test:main", cache=False)
+        self.assertEqual(module.total, 23)
+
+    def test_require_lazy(self):
+        """Test that only the definitions an export needs are evaluated"""
+        folder = pathlib.Path(self.tmp.name, "users", "test")
+        folder.joinpath("lazy.js").write_text(
+            "var c = require('users/test:c');\n"
+            "var broken = missing(1);\n"
+            "var scale = function(x) {\n  return x * c.base;\n};\n"
+            "exports.scale = scale;\n"
+            "exports.broken = broken;\n"
+        )
+        module = merge.require("users/test:lazy", cache=False, lazy=True)
+        self.assertEqual(dir(module), ["broken", "scale"])
+        self.assertEqual(module.scale(2), 20)
+        self.assertIn("scale", vars(module))
+        with self.assertRaises(NameError):
+            module.broken
+
+    def test_circular(self):
+        """Test that a circular require raises an error"""
+        folder = pathlib.Path(self.tmp.name, "users", "test")
+        folder.joinpath("c.js").write_text("var m = require('users/test:main');\n")
+        with self.assertRaises(ValueError):
+            merge.junction("users/test:main")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,53 @@
+import unittest
+
+from ee_extra.JavaScript.profiling import PassRecord, TranslationProfile, run_pass
+from ee_extra.JavaScript.translate_main import translate
+
+SCRIPT = """
+var name = ' image '.trim();
+var size = name.length;
+if (size == null) {
+  size = 1;
+}
+"""
+
+
+class Test(unittest.TestCase):
+    """Tests the profiling hooks of the translator"""
+
+    def test_translate_hook(self):
+        """Test that every pass is reported and the translation is unchanged"""
+        profile = TranslationProfile()
+        self.assertEqual(translate(SCRIPT, hook=profile), translate(SCRIPT))
+
+        records = {record.name: record for record in profile.records}
+        self.assertIn("beautify", records)
+        self.assertIn("jsmethods.trim", records)
+        self.assertNotIn("jsmethods.split", records)
+        self.assertEqual(records["change_operators"].rewrites, 1)
+        self.assertGreater(
+            records["jsmethods.trim"].output_size, records["jsmethods.trim"].input_size
+        )
+        self.assertEqual(records["fix_while_loop"].rewrites, 0)
+        self.assertIn("jsmethods.trim", profile.report())
+
+    def test_totals(self):
+        """Test that the runs of a pass are added"""
+        profile = TranslationProfile()
+        translate(SCRIPT, hook=profile)
+        translate(SCRIPT, hook=profile)
+        totals = {record.name: record for record in profile.totals()}
+        self.assertEqual(totals["change_operators"].rewrites, 2)
+        self.assertEqual(len(totals), len(profile.records) // 2)
+
+    def test_run_pass(self):
+        """Test that tuple results are measured by their code"""
+        records = []
+        result = run_pass(records.append, "upper", lambda x: (x.upper(), 1), "a\nb")
+        self.assertEqual(result, ("A\nB", 1))
+        self.assertEqual(records, [PassRecord("upper", records[0].seconds, 3, 3, 2)])
+        self.assertEqual(run_pass(None, "upper", str.upper, "a"), "A")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,105 @@
+import unittest
+from unittest import mock
+
+from ee_extra import translate
+from ee_extra.JavaScript import tokenizer
+from ee_extra.JavaScript.tokenizer import (
+    drop_line_comments,
+    map_code,
+    map_tokens,
+    remove_line_comments,
+    split_units,
+    tokenize,
+)
+from ee_extra.JavaScript.translate_main import fix_multiline_comments
+
+
+class Test(unittest.TestCase):
+    """Tests the JavaScript tokenizer"""
+
+    def test_tokenize(self):
+        """Test that strings, comments and regex literals are single tokens"""
+        text = (
+            "var x = 'a//b' + \"it's\"; // note\nvar r = /a\\/b/g.test(x) / 2 /* c */"
+        )
+        tokens = tokenize(text)
+        self.assertEqual("".join(token.text for token in tokens), text)
+        self.assertEqual(
+            [(token.kind, token.text) for token in tokens if token.kind != "code"],
+            [
+                ("string", "'a//b'"),
+                ("string", '"it\'s"'),
+                ("comment", "// note"),
+                ("regex", "/a\\/b/g"),
+                ("comment", "/* c */"),
+            ],
+        )
+
+    def test_map_code(self):
+        """Test that rewrites skip strings"""
+        text = "x = true || 'true'"
+        self.assertEqual(
+            map_code(text, lambda code: code.replace("true", "True")),
+            "x = True || 'true'",
+        )
+
+    def test_map_tokens(self):
+        """Test that consecutive rewrites share the tokens of one lex"""
+        text = "var a = true; // 'x'\nvar b = 'true' /* true */ || a;"
+        tokens = drop_line_comments(tokenize(text))
+        tokens = map_tokens(tokens, lambda code: code.replace("true", "True"))
+        tokens = map_tokens(tokens, str.upper, "comment")
+        self.assertEqual(
+            "".join(token.text for token in tokens),
+            "var a = True; \nvar b = 'true' /* TRUE */ || a;",
+        )
+        self.assertEqual(
+            tokens, tokenize("var a = True; \nvar b = 'true' /* TRUE */ || a;")
+        )
+
+    def test_fix_multiline_comments(self):
+        """Test that only block comments are changed to # lines"""
+        text = "/* a\nb */\nvar s = '/* not a comment */';"
+        self.assertEqual(
+            fix_multiline_comments(text), "# a\n#b */\nvar s = '/* not a comment */';"
+        )
+
+    def test_remove_line_comments(self):
+        """Test that URLs inside strings are not taken as comments"""
+        text = "var uri = 'gs://bucket/file.tif'; // a comment\nvar y = 1;"
+        self.assertEqual(
+            remove_line_comments(text), "var uri = 'gs://bucket/file.tif'; \nvar y = 1;"
+        )
+        self.assertIn("'gs://bucket/file.tif'", translate(text))
+
+    def test_split_units(self):
+        """Test that the source is split into its top-level statements"""
+        text = (
+            "var a = {b: 1};\n"
+            "// doc\nfunction f(x) {\n  if (x) {\n    return ';';\n  }\n}\n"
+            "if (a) {\n  f(a);\n}\nelse {\n  f(1);\n}\n"
+            "var c = a\n  .b;\n"
+        )
+        units = split_units(text)
+        self.assertEqual("".join(units), text)
+        self.assertEqual(len(units), 4)
+        self.assertTrue(units[1].startswith("// doc\nfunction f"))
+        self.assertTrue(units[2].endswith("f(1);\n}\n"))
+
+    def test_lexed_once_per_group(self):
+        """Test that consecutive quote-sensitive stages share one lex"""
+        text = (
+            "// doc\nvar a = 'true' + 1;\nvar b = a || null; // c\n"
+            "var c = ee.Image(0).add(a).multiply(2);\nprint(c);\n"
+        )
+        with mock.patch.object(
+            tokenizer, "tokenize", wraps=tokenizer.tokenize
+        ) as tokenize:
+            translate(text)
+        # remove_documentation and remove_single_declarations, change_operators and
+        # fix_multiline_comments, and fix_str_plus_int
+        self.assertEqual(tokenize.call_count, 3)
+
+
+if __name__ == "__main__":
+    unittest.main()